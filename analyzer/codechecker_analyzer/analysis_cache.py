@@ -0,0 +1,187 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Persistent cache for the results of the analyzer invocations.
+
+A cache entry belongs to one analyzer invocation. The key of the entry is
+calculated from the analyzer command (which contains the build action and the
+checker configuration), the version of the analyzer binary and the report hash
+type. Next to the cached result file the list of the files constituting the
+translation unit is stored with their content hashes, so an entry is reused
+only if none of these files has changed since the entry was created.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from codechecker_common.logger import get_logger
+from codechecker_common.util import get_file_content_hash
+
+LOG = get_logger('analyzer')
+
+
+def get_tu_dependencies(action):
+    """
+    Return the set of files constituting the translation unit of the given
+    build action or None if the dependencies could not be collected.
+    """
+    from tu_collector import tu_collector
+
+    dependencies, error = tu_collector.get_dependent_headers(
+        action.original_command, action.directory)
+
+    if error:
+        LOG.debug("Failed to collect the dependencies of %s: %s",
+                  action.source, error)
+        return None
+
+    return set(os.path.normpath(os.path.join(action.directory, dep))
+               for dep in dependencies)
+
+
+def hash_files(file_paths):
+    """
+    Return a dict which maps the given file paths to their content hash or
+    None if any of the files can not be read.
+    """
+    hashes = {}
+    for file_path in file_paths:
+        content_hash = get_file_content_hash(file_path)
+        if content_hash is None:
+            return None
+        hashes[file_path] = content_hash
+
+    return hashes
+
+
+def is_unchanged(file_hashes):
+    """
+    Returns True if none of the files in the given path -> content hash dict
+    has changed.
+    """
+    for file_path, content_hash in file_hashes.items():
+        if get_file_content_hash(file_path) != content_hash:
+            LOG.debug("'%s' has changed since the cache entry was created.",
+                      file_path)
+            return False
+
+    return True
+
+
+class AnalysisCache(object):
+    """
+    Analysis results cache stored in the given directory. The cache directory
+    can be shared between multiple report directories and analysis runs.
+    """
+
+    def __init__(self, cache_dir, analyzer_versions=None):
+        self.__cache_dir = os.path.abspath(cache_dir)
+        self.__analyzer_versions = analyzer_versions or {}
+
+    @property
+    def cache_dir(self):
+        return self.__cache_dir
+
+    def get_key(self, analyzer_cmd, result_file, analyzer_binary,
+                report_hash_type=None):
+        """
+        Return the cache key of an analyzer invocation. The result file
+        is left out from the key because it depends on the output directory.
+        """
+        cmd = ['<result_file>' if arg == result_file else arg
+               for arg in analyzer_cmd]
+
+        key_content = [self.__analyzer_versions.get(analyzer_binary, ''),
+                       str(report_hash_type)]
+        key_content.extend(cmd)
+
+        key_str = '\0'.join(key_content)
+        return hashlib.sha256(key_str.encode(errors='ignore')).hexdigest()
+
+    def __entry_paths(self, key):
+        """
+        Return the path of the metadata and the result file of an entry.
+        """
+        entry_dir = os.path.join(self.__cache_dir, key[:2])
+        return os.path.join(entry_dir, key + '.json'), \
+            os.path.join(entry_dir, key + '.plist')
+
+    def restore(self, key, result_file):
+        """
+        Copy the cached result of the given key to the result file if there
+        is a valid entry in the cache. Returns True on cache hit.
+        """
+        meta_file, plist_file = self.__entry_paths(key)
+        if not os.path.exists(meta_file) or not os.path.exists(plist_file):
+            return False
+
+        try:
+            with open(meta_file, 'r') as meta:
+                entry = json.load(meta)
+        except (IOError, ValueError) as ex:
+            LOG.debug("Invalid cache entry '%s': %s", meta_file, ex)
+            return False
+
+        if not is_unchanged(entry.get('files', {})):
+            return False
+
+        try:
+            shutil.copyfile(plist_file, result_file)
+        except (IOError, OSError) as ex:
+            LOG.debug("Failed to restore cache entry '%s': %s",
+                      plist_file, ex)
+            return False
+
+        return True
+
+    def store(self, key, action, result_file):
+        """
+        Store the result file of the given build action in the cache.
+        """
+        if not os.path.exists(result_file):
+            return
+
+        dependencies = get_tu_dependencies(action)
+        if not dependencies:
+            return
+
+        file_hashes = hash_files(dependencies)
+        if file_hashes is None:
+            return
+
+        meta_file, plist_file = self.__entry_paths(key)
+        entry_dir = os.path.dirname(meta_file)
+
+        try:
+            if not os.path.isdir(entry_dir):
+                os.makedirs(entry_dir)
+        except OSError:
+            # The directory may be created by another worker.
+            pass
+
+        try:
+            # Write to temporary files and rename them afterwards so the
+            # parallel workers never see half-written entries.
+            fd, tmp_plist = tempfile.mkstemp(dir=entry_dir)
+            os.close(fd)
+            shutil.copyfile(result_file, tmp_plist)
+            os.rename(tmp_plist, plist_file)
+
+            fd, tmp_meta = tempfile.mkstemp(dir=entry_dir)
+            with os.fdopen(fd, 'w') as meta:
+                json.dump({'source': action.source,
+                           'analyzer_type': action.analyzer_type,
+                           'files': file_hashes}, meta)
+            os.rename(tmp_meta, meta_file)
+        except (IOError, OSError) as ex:
+            LOG.debug("Failed to store cache entry for '%s': %s",
+                      action.source, ex)
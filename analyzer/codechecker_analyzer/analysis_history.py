@@ -0,0 +1,195 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Measurements of the previous analysis runs stored in the report directory.
+
+The history is used to schedule the build actions: the actions which ran the
+longest in the previous runs are started first so a few big translation units
+started at the end of the analysis do not extend the runtime of the whole job.
+The peak memory usage of the actions is used to keep the memory usage of the
+parallel analyzer processes within the budget given by the user.
+
+The durations of the last few runs are used to set an adaptive timeout for
+every action, and the actions killed by the timeout are retried at the end of
+the next analysis.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import heapq
+import json
+import math
+import os
+
+from codechecker_common.logger import get_logger
+from codechecker_common.util import load_json_or_empty
+
+from .buildlog.build_action import get_action_key
+
+LOG = get_logger('analyzer')
+
+# Number of the last analysis durations of a build action which are kept.
+DURATION_HISTORY_LENGTH = 5
+
+# The adaptive timeout of an analysis is never shorter than this (in seconds),
+# so the noise of the short analyses does not cause timeouts.
+MIN_ADAPTIVE_TIMEOUT = 60
+
+
+def get_source_size(action):
+    """
+    Return the size of the analyzed source file of the given action which is
+    used to estimate the analysis time of the actions without history.
+    """
+    try:
+        return os.path.getsize(action.source)
+    except OSError:
+        return 0
+
+
+class AnalysisHistory(object):
+    """
+    Per build action measurements of the previous analysis runs.
+    """
+
+    FILE_NAME = 'analysis_history.json'
+
+    def __init__(self, output_path):
+        self.__history_file = os.path.join(output_path, self.FILE_NAME)
+
+        self.__history = {}
+        if os.path.exists(self.__history_file):
+            self.__history = load_json_or_empty(self.__history_file, {},
+                                                'analysis history')
+
+    def get(self, action, attr):
+        """
+        Return the value of the given attribute measured for the build action
+        in the previous runs or None if there is no such measurement.
+        """
+        return self.__history.get(get_action_key(action), {}).get(attr)
+
+    def update(self, action, **values):
+        """
+        Update the measurements of the given build action.
+        """
+        self.__history.setdefault(get_action_key(action), {}).update(values)
+
+    def add_duration(self, action, duration, timed_out=False):
+        """
+        Record the duration of the last analysis of the given build action.
+        The duration of an analysis killed by the timeout is not a real
+        analysis time, so it is used only for scheduling.
+        """
+        self.update(action, duration=duration, timed_out=timed_out)
+        if timed_out:
+            return
+
+        durations = self.get(action, 'durations') or []
+        durations = durations[-(DURATION_HISTORY_LENGTH - 1):] + [duration]
+        self.update(action, durations=durations)
+
+    def write(self):
+        """
+        Write the history to the report directory.
+        """
+        try:
+            with open(self.__history_file, 'w') as history:
+                json.dump(self.__history, history)
+        except IOError as ex:
+            LOG.debug("Failed to write analysis history: %s", ex)
+
+    def estimate_durations(self, actions):
+        """
+        Return the expected analysis time of the given build actions in
+        seconds. The duration of the actions without history is estimated
+        from the size of their source file.
+
+        If no duration is known at all, then the returned values are the
+        sizes of the source files and can be used only for ordering.
+        """
+        durations = [self.get(action, 'duration') for action in actions]
+        sizes = [get_source_size(action) for action in actions]
+
+        known = [(duration, size) for duration, size in zip(durations, sizes)
+                 if duration is not None]
+
+        # Analysis time of one byte of source code.
+        rate = 1.0
+        if known:
+            known_size = sum(size for _, size in known)
+            if known_size:
+                rate = sum(duration for duration, _ in known) / known_size
+
+        return [duration if duration is not None else size * rate
+                for duration, size in zip(durations, sizes)], bool(known)
+
+    def estimate_peak_memory(self, actions):
+        """
+        Return the expected peak memory usage of the given build actions in
+        bytes. The memory usage of the actions without history is estimated
+        with the average of the known ones.
+        """
+        peaks = [self.get(action, 'peak_memory') for action in actions]
+
+        known = [peak for peak in peaks if peak]
+        average = sum(known) // len(known) if known else 0
+
+        return [peak if peak else average for peak in peaks]
+
+    def estimate_timeouts(self, actions, multiplier, timeout=None):
+        """
+        Return the timeout of the analysis of the given build actions in
+        seconds or None if the analysis has no time limit.
+
+        The timeout of an action is the multiple of its longest analysis in
+        the previous runs, but at most the given timeout. The actions without
+        history and the actions killed by the timeout in the previous run get
+        the given timeout.
+        """
+        timeouts = []
+        for action in actions:
+            durations = self.get(action, 'durations')
+            if not durations or self.get(action, 'timed_out'):
+                timeouts.append(timeout)
+                continue
+
+            adaptive_timeout = max(MIN_ADAPTIVE_TIMEOUT,
+                                   int(math.ceil(max(durations) *
+                                                 multiplier)))
+            timeouts.append(min(adaptive_timeout, timeout) if timeout
+                            else adaptive_timeout)
+
+        return timeouts
+
+
+def schedule_longest_first(actions, durations, history=None):
+    """
+    Order the build actions by their expected duration, the longest first.
+    If the analysis history is given, the actions killed by the timeout in
+    the previous run are retried at the end.
+    """
+    def sort_key(item):
+        duration, action = item
+        timed_out = bool(history and history.get(action, 'timed_out'))
+        return not timed_out, duration
+
+    return [action for _, action in
+            sorted(zip(durations, actions), key=sort_key, reverse=True)]
+
+
+def predict_makespan(durations, jobs):
+    """
+    Return the time needed to analyze the build actions with the given
+    expected durations on the given number of workers if the actions are
+    started in longest-first order.
+    """
+    workers = [0.0] * max(jobs, 1)
+    for duration in sorted(durations, reverse=True):
+        heapq.heappush(workers, heapq.heappop(workers) + duration)
+
+    return max(workers)
@@ -0,0 +1,118 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Progress journal of the analysis stored in the report directory.
+
+Every completed build action is appended to the journal as a JSON line as
+soon as its results are written, and the journal is synced to the disk. If
+the analysis is interrupted (e.g. killed or the machine is shut down), the
+next analysis started with --resume analyzes only the build actions which
+are not in the journal. The journal is removed when the analysis finishes.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import json
+import os
+
+from codechecker_common.logger import get_logger
+
+from .buildlog.build_action import get_action_key
+
+LOG = get_logger('analyzer')
+
+
+class AnalysisJournal(object):
+    """
+    Append-only journal of the build actions completed by the analysis.
+    """
+
+    FILE_NAME = 'analysis_journal.jsonl'
+
+    def __init__(self, output_path):
+        self.__journal_file = os.path.join(output_path, self.FILE_NAME)
+        self.__journal = None
+
+    def load(self):
+        """
+        Return the records of the completed build actions by their key. A
+        record which was not written completely is ignored.
+        """
+        records = {}
+        if not os.path.exists(self.__journal_file):
+            return records
+
+        with open(self.__journal_file, 'r') as journal:
+            for line in journal:
+                try:
+                    record = json.loads(line)
+                    records[record['key']] = record
+                except (ValueError, KeyError, TypeError):
+                    LOG.debug("Invalid analysis journal record: %s", line)
+
+        return records
+
+    def open(self, resume=False):
+        """
+        Open the journal for appending the records. The records of the
+        previous analysis are removed unless the analysis is resumed.
+        """
+        self.__journal = open(self.__journal_file, 'a' if resume else 'w')
+
+        # A record may have been written partially when the previous
+        # analysis was interrupted.
+        if resume and self.__journal.tell():
+            self.__journal.write('\n')
+
+    def record(self, action, result):
+        """
+        Append the check() result of the given build action to the journal.
+        """
+        return_code, _, _, analyzer_type, result_file, source, _, \
+            duration, peak_memory = result
+
+        self.__journal.write(json.dumps({
+            'key': get_action_key(action),
+            'return_code': return_code,
+            'analyzer_type': analyzer_type,
+            'result_file': result_file,
+            'source': source,
+            'duration': duration,
+            'peak_memory': peak_memory}) + '\n')
+
+        self.__journal.flush()
+        os.fsync(self.__journal.fileno())
+
+    def close(self):
+        if self.__journal:
+            self.__journal.close()
+            self.__journal = None
+
+    def remove(self):
+        """
+        Remove the journal after the analysis has finished.
+        """
+        self.close()
+        try:
+            os.remove(self.__journal_file)
+        except OSError:
+            pass
+
+
+def get_resumed_result(record):
+    """
+    Return the check() result of a build action restored from its journal
+    record or None if the results of the build action are missing.
+    """
+    result_file = record['result_file']
+    if record['return_code'] == 0 and \
+            not (result_file and os.path.exists(result_file)):
+        return None
+
+    return (record['return_code'], False, False, record['analyzer_type'],
+            result_file, record['source'], False, record['duration'],
+            record['peak_memory'])
@@ -9,6 +9,8 @@ from __future__ import print_function
 from __future__ import division
 from __future__ import absolute_import
 
+from collections import deque
+from functools import partial
 import glob
 import multiprocessing
 import os
@@ -16,26 +18,55 @@ import shlex
 import shutil
 import signal
 import sys
+import tempfile
 import time
 import traceback
-import zipfile
 
-from threading import Timer
+from threading import Event, Thread, Timer
 
 import psutil
 
 from codechecker_analyzer import env
 from codechecker_common import plist_parser
-from codechecker_common.logger import get_logger
+from codechecker_common.failure_store import FailureStore, \
+    should_collect_sources
+from codechecker_common.logger import DEBUG_ANALYZER, get_logger
+from codechecker_common.source_line_cache import source_line_cache
 
+from . import distributed
 from . import gcc_toolchain
+from . import pre_analysis_manager
+from .analysis_history import AnalysisHistory, predict_makespan, \
+    schedule_longest_first
+from .analysis_journal import AnalysisJournal, get_resumed_result
+from .changed_files import prioritize, report_changed_results
 
 from .analyzers import analyzer_types
 from .analyzers.clangsa.analyzer import ClangSA
 from .analyzers.clangsa.statistics_collector import SpecialReturnValueCollector
+from .buildlog.build_action import get_action_key
 
 LOG = get_logger('analyzer')
 
+# New analyzer processes are not started while the available memory is below
+# this ratio of the total memory.
+MIN_FREE_MEMORY_RATIO = 0.05
+
+# Seconds between sampling the memory usage of the analyzer processes.
+MEMORY_SAMPLING_INTERVAL = 0.5
+
+# Ratio of the number of the postprocessing and the analyzer processes.
+POSTPROCESS_JOBS_RATIO = 0.5
+
+# Return code of the analyses killed by the timeout.
+TIMEOUT_RETURN_CODE = -1
+
+# Timeout of waiting for the results of the process pools in seconds (one
+# year). In Python 2 the main process does not get the KeyboardInterrupt
+# while it waits for a pool result without a timeout, so the waits always
+# have a practically infinite timeout.
+POOL_RESULT_TIMEOUT = 31557600
+
 
 def print_analyzer_statistic_summary(statistics, status, msg=None):
     """
@@ -54,9 +85,16 @@ def print_analyzer_statistic_summary(statistics, status, msg=None):
             LOG.info("  %s: %s", analyzer_type, successful)
 
 
-def worker_result_handler(results, metadata, output_path, analyzer_binaries):
+def worker_result_handler(results, metadata, output_path, analyzer_binaries,
+                          predicted_makespan=None, start_time=None,
+                          pipeline_statistics=None):
     """
     Print the analysis summary.
+
+    If the predicted runtime of the analysis and the start time of the
+    workers are given, then the predicted and the actual runtime is printed
+    too. The statistics of the analysis and postprocessing stages are printed
+    if they are given.
     """
 
     if metadata is None:
@@ -64,15 +102,25 @@ def worker_result_handler(results, metadata, output_path, analyzer_binaries):
 
     skipped_num = 0
     reanalyzed_num = 0
+    cached_num = 0
     statistics = {}
 
-    for res, skipped, reanalyzed, analyzer_type, _, sources in results:
+    peak_memory = {}
+
+    for res, skipped, reanalyzed, analyzer_type, result_file, sources, \
+            cached, _, peak_rss in results:
         if skipped:
             skipped_num += 1
         else:
             if reanalyzed:
                 reanalyzed_num += 1
 
+            if cached:
+                cached_num += 1
+
+            if result_file and peak_rss:
+                peak_memory[result_file] = peak_rss
+
             if analyzer_type not in statistics:
                 analyzer_bin = analyzer_binaries[analyzer_type]
                 analyzer_version = \
@@ -102,10 +150,35 @@ def worker_result_handler(results, metadata, output_path, analyzer_binaries):
 
     if reanalyzed_num:
         LOG.info("Reanalyzed compilation commands: %d", reanalyzed_num)
+    if cached_num:
+        LOG.info("Results reused from the analysis cache: %d", cached_num)
+    if start_time is not None:
+        actual_makespan = time.time() - start_time
+        if predicted_makespan is not None:
+            LOG.info("Analysis runtime: %.2f sec (predicted: %.2f sec).",
+                     actual_makespan, predicted_makespan)
+        else:
+            LOG.info("Analysis runtime: %.2f sec.", actual_makespan)
+    if pipeline_statistics:
+        LOG.info("Analysis stage: %.2f sec on %d process(es).",
+                 pipeline_statistics['analysis_time'],
+                 pipeline_statistics['analysis_jobs'])
+        LOG.info("Postprocessing stage: %d task(s), %.2f sec on %d "
+                 "process(es), max queue depth: %d, waited for: %.2f sec.",
+                 pipeline_statistics['postprocess_tasks'],
+                 pipeline_statistics['postprocess_time'],
+                 pipeline_statistics['postprocess_jobs'],
+                 pipeline_statistics['postprocess_max_depth'],
+                 pipeline_statistics['postprocess_wait_time'])
     if skipped_num:
         LOG.info("Skipped compilation commands: %d", skipped_num)
 
+    if pipeline_statistics:
+        metadata['pipeline'] = pipeline_statistics
+
     metadata['skipped'] = skipped_num
+    metadata['cached'] = cached_num
+    metadata['peak_memory'] = peak_memory
     metadata['analyzer_statistics'] = statistics
 
     # check() created the result .plist files and additional, per-analysis
@@ -132,22 +205,258 @@ def worker_result_handler(results, metadata, output_path, analyzer_binaries):
 progress_checked_num = None
 progress_actions = None
 
+# Number of the failed analyses, used to sample the debug data.
+progress_failed_num = None
+
+# Admission control of the analyzer processes.
+memory_governor = None
 
-def init_worker(checked_num, action_num):
-    global progress_checked_num, progress_actions
+# Event which is set when the results of the pre-analysis (e.g. the CTU
+# function map) are available for the Clang Static Analyzer.
+pre_analysis_ready = None
+
+
+def init_worker(checked_num, action_num, governor=None, failed_num=None,
+                ready=None):
+    global progress_checked_num, progress_actions, memory_governor, \
+        progress_failed_num, pre_analysis_ready
     progress_checked_num = checked_num
     progress_actions = action_num
+    memory_governor = governor
+    progress_failed_num = failed_num
+    pre_analysis_ready = ready
+
+
+class MemoryGovernor(object):
+    """
+    Admission control of the analyzer processes based on their memory usage.
+    The object is shared by the worker processes of the pool.
+
+    A new analyzer process is started only if the available memory of the
+    system is above a threshold and the memory expected to be used by the
+    running analyzer processes does not exceed the memory budget. An analyzer
+    process is always started if no other one is running.
+    """
+
+    def __init__(self, max_memory=None,
+                 min_free_ratio=MIN_FREE_MEMORY_RATIO):
+        self.__max_memory = max_memory
+        self.__min_free = psutil.virtual_memory().total * min_free_ratio
+
+        self.__cond = multiprocessing.Condition()
+
+        # These values are accessed only while holding the lock of the
+        # condition.
+        self.__running = multiprocessing.RawValue('i', 0)
+        self.__reserved = multiprocessing.RawValue('d', 0)
+
+    def __can_start(self, expected_memory):
+        if self.__max_memory and \
+                self.__reserved.value + expected_memory > self.__max_memory:
+            return False
+
+        return psutil.virtual_memory().available >= self.__min_free
+
+    def acquire(self, expected_memory):
+        """
+        Wait until an analyzer process which is expected to use the given
+        amount of memory (in bytes) can be started.
+        """
+        with self.__cond:
+            while self.__running.value and \
+                    not self.__can_start(expected_memory):
+                self.__cond.wait(1)
+
+            self.__running.value += 1
+            self.__reserved.value += expected_memory
+
+    def release(self, expected_memory):
+        """
+        An analyzer process started by acquire() has finished.
+        """
+        with self.__cond:
+            self.__running.value -= 1
+            self.__reserved.value -= expected_memory
+            self.__cond.notify_all()
+
+
+class PostprocessPipeline(object):
+    """
+    Run the postprocessing tasks of the analysis results on a separate
+    process pool, so the analyzer processes do not wait for the Python side
+    processing of the results. At most max_pending tasks are queued in the
+    pool at once.
+    """
+
+    def __init__(self, pool, jobs, max_pending=None):
+        self.__pool = pool
+        self.__jobs = jobs
+        self.__max_pending = max_pending or 2 * jobs
+        self.__pending = deque()
+
+        self.__task_num = 0
+        self.__busy_time = 0.0
+        self.__wait_time = 0.0
+        self.__max_depth = 0
+
+    def put(self, tasks, callback=None):
+        """
+        Queue the given postprocessing tasks. Blocks while the queue is
+        full.
+
+        The callback is called in this process without arguments when every
+        given task has finished.
+        """
+        # Collect the finished tasks so the queue depth is up to date.
+        while self.__pending and self.__pending[0][0].ready():
+            self.__finish_oldest()
+
+        if not tasks:
+            if callback:
+                callback()
+            return
+
+        for i, task in enumerate(tasks):
+            while len(self.__pending) >= self.__max_pending:
+                self.__finish_oldest()
+
+            # The tasks are finished in the order of queueing, so the
+            # callback belongs to the last one.
+            self.__pending.append(
+                (self.__pool.apply_async(run_postprocess, (task,)),
+                 callback if i == len(tasks) - 1 else None))
+            self.__task_num += 1
+            self.__max_depth = max(self.__max_depth, len(self.__pending))
+
+    def join(self):
+        """
+        Wait for every queued task.
+        """
+        while self.__pending:
+            self.__finish_oldest()
+
+    def __finish_oldest(self):
+        start_time = time.time()
+        async_result, callback = self.__pending.popleft()
+        self.__busy_time += async_result.get(POOL_RESULT_TIMEOUT)
+        self.__wait_time += time.time() - start_time
+
+        if callback:
+            callback()
+
+    def get_statistics(self):
+        return {'postprocess_jobs': self.__jobs,
+                'postprocess_tasks': self.__task_num,
+                'postprocess_time': self.__busy_time,
+                'postprocess_wait_time': self.__wait_time,
+                'postprocess_max_depth': self.__max_depth}
+
+
+def init_pool_worker(pre_checked_num, pre_action_num, checked_num, action_num,
+                     governor, failed_num, ready):
+    """
+    Initialize a worker of the WorkerPool for both the pre-analysis and the
+    analysis.
+    """
+    pre_analysis_manager.init_worker(pre_checked_num, pre_action_num)
+    init_worker(checked_num, action_num, governor, failed_num, ready)
+
+
+class WorkerPool(object):
+    """
+    Process pools shared by the pre-analysis, the analysis and the
+    postprocessing of a CodeChecker command, so the worker processes are
+    started only once.
+
+    The pre-analysis jobs are queued on the pool before the analyses, so the
+    analyses which do not depend on the pre-analysis (e.g. the clang-tidy
+    analyses) can run while the results of the pre-analysis are merged on
+    the postprocessing pool. The Clang Static Analyzer analyses wait for
+    the pre_analysis_ready event.
+    """
+
+    def __init__(self, jobs, max_memory=None):
+        self.jobs = jobs
+        self.postprocess_jobs = max(1, int(jobs * POSTPROCESS_JOBS_RATIO))
+
+        # Progress reporting of the pre-analysis and the analysis.
+        self.pre_checked_num = multiprocessing.Value('i', 0)
+        self.pre_actions_num = multiprocessing.Value('i', 0)
+        self.checked_num = multiprocessing.Value('i', 1)
+        self.actions_num = multiprocessing.Value('i', 0)
+        self.failed_num = multiprocessing.Value('i', 0)
+
+        self.governor = MemoryGovernor(max_memory)
+
+        self.pre_analysis_ready = multiprocessing.Event()
+        self.pre_analysis_ready.set()
+
+        self.__pool = None
+        self.__postprocess_pool = None
+
+    @property
+    def pool(self):
+        """
+        Process pool of the pre-analysis and the analyzer processes.
+        """
+        if self.__pool is None:
+            self.__pool = multiprocessing.Pool(
+                self.jobs,
+                initializer=init_pool_worker,
+                initargs=(self.pre_checked_num,
+                          self.pre_actions_num,
+                          self.checked_num,
+                          self.actions_num,
+                          self.governor,
+                          self.failed_num,
+                          self.pre_analysis_ready))
+        return self.__pool
+
+    @property
+    def postprocess_pool(self):
+        """
+        Process pool of the postprocessing tasks.
+        """
+        if self.__postprocess_pool is None:
+            self.__postprocess_pool = \
+                multiprocessing.Pool(self.postprocess_jobs)
+        return self.__postprocess_pool
+
+    def __pools(self):
+        return [pool for pool in (self.__pool, self.__postprocess_pool)
+                if pool is not None]
+
+    def close(self):
+        """
+        Wait for the queued jobs and stop the worker processes.
+        """
+        for pool in self.__pools():
+            pool.close()
+        for pool in self.__pools():
+            pool.join()
+        self.__pool = self.__postprocess_pool = None
+
+    def terminate(self):
+        """
+        Stop the worker processes without waiting for the queued jobs.
+        """
+        for pool in self.__pools():
+            pool.terminate()
+        for pool in self.__pools():
+            pool.join()
+        self.__pool = self.__postprocess_pool = None
 
 
 def save_output(base_file_name, out, err):
+    """
+    Save the given output spools of the analyzer next to each other.
+    """
     try:
-        if out:
-            with open(base_file_name + ".stdout.txt", 'w') as outf:
-                outf.write(out)
+        if out and out.size():
+            out.save(base_file_name + ".stdout.txt")
 
-        if err:
-            with open(base_file_name + ".stderr.txt", 'w') as outf:
-                outf.write(err)
+        if err and err.size():
+            err.save(base_file_name + ".stderr.txt")
     except IOError as ioerr:
         LOG.debug("Failed to save analyzer output")
         LOG.debug(ioerr)
@@ -239,23 +548,35 @@ def prepare_check(action, analyzer_config_map, output_dir,
 
 
 def handle_success(rh, result_file, result_base, skip_handler,
-                   capture_analysis_output, success_dir):
+                   capture_analysis_output, success_dir,
+                   analysis_cache=None, cache_key=None):
     """
     Result postprocessing is required if the analysis was
     successful (mainly clang tidy output conversion is done).
 
-    Skipping reports for header files is done here too.
+    If an analysis cache is given the postprocessed result is stored in the
+    cache before the reports are filtered by the skip handler.
+
+    Skipping reports for header files is done here too. The spooled outputs
+    of the analyzer are removed.
     """
-    if capture_analysis_output:
-        save_output(os.path.join(success_dir, result_base),
-                    rh.analyzer_stdout, rh.analyzer_stderr)
+    try:
+        if capture_analysis_output:
+            save_output(os.path.join(success_dir, result_base),
+                        rh.analyzer_stdout_spool, rh.analyzer_stderr_spool)
+
+        rh.postprocess_result()
+    finally:
+        rh.remove_output()
 
-    rh.postprocess_result()
     # Generated reports will be handled separately at store.
 
     save_metadata(result_file, rh.analyzer_result_file,
                   rh.analyzed_source_file)
 
+    if analysis_cache and cache_key:
+        analysis_cache.store(cache_key, rh.buildaction, result_file)
+
     if skip_handler:
         # We need to check the plist content because skipping
         # reports in headers can be done only this way.
@@ -263,11 +584,19 @@ def handle_success(rh, result_file, result_base, skip_handler,
                                             skip_handler)
 
 
-def handle_failure(source_analyzer, rh, zip_file, result_base, actions_map):
+def handle_failure(source_analyzer, rh, zip_file, result_base, actions_map,
+                   output_dir):
     """
     If the analysis fails a debug zip is packed together which contains
     build, analysis information and source files to be able to
     reproduce the failed analysis.
+
+    The build actions of the files mentioned by the analyzer are collected
+    here, the rest is done by the returned postprocessing task which records
+    the content of the zip in a manifest of the failure store. The zip is
+    written from the manifest only on demand, by 'CodeChecker store' or by
+    scripts/debug_tools/write_failure_zips.py. If a lot of analyses fail,
+    the source files are collected only for a sample of them.
     """
     other_files = set()
     action = rh.buildaction
@@ -275,13 +604,11 @@ def handle_failure(source_analyzer, rh, zip_file, result_base, actions_map):
     try:
         LOG.debug("Fetching other dependent files from analyzer "
                   "output...")
-        other_files.update(
-            source_analyzer.get_analyzer_mentioned_files(
-                rh.analyzer_stdout))
-
-        other_files.update(
-            source_analyzer.get_analyzer_mentioned_files(
-                rh.analyzer_stderr))
+        for spool in [rh.analyzer_stdout_spool, rh.analyzer_stderr_spool]:
+            if spool:
+                other_files.update(
+                    source_analyzer.get_analyzer_mentioned_files(
+                        spool.lines()))
     except Exception as ex:
         LOG.debug("Couldn't generate list of other files "
                   "from analyzer output:")
@@ -306,33 +633,78 @@ def handle_failure(source_analyzer, rh, zip_file, result_base, actions_map):
         else:
             LOG.debug("Could not find %s in build actions.", key)
 
-    from tu_collector import tu_collector
+    # TODO: What about the dependencies of the other_files?
+    other_files = [os.path.join(action.directory, path)
+                   for path in other_files]
 
-    tu_collector.zip_tu_files(zip_file, buildactions)
+    texts = {"build-action": action.original_command,
+             "analyzer-command": ' '.join(rh.analyzer_cmd),
+             "return-code": str(rh.analyzer_returncode)}
 
-    # TODO: What about the dependencies of the other_files?
-    tu_collector.add_sources_to_zip(
-        zip_file,
-        map(lambda path: os.path.join(action.directory, path), other_files))
+    toolchain = gcc_toolchain.toolchain_in_args(
+        shlex.split(action.original_command))
+    if toolchain:
+        texts["gcc-toolchain-path"] = toolchain
+
+    collect_sources = True
+    if progress_failed_num is not None:
+        with progress_failed_num.get_lock():
+            failure_index = progress_failed_num.value
+            progress_failed_num.value += 1
+        collect_sources = should_collect_sources(failure_index)
+
+    if not collect_sources:
+        LOG.debug("Too many analyses have failed, the source files of %s "
+                  "are not collected.", action.source)
+
+    return (record_failure, (rh, zip_file, result_base, output_dir,
+                             buildactions, other_files, texts,
+                             collect_sources))
+
+
+def record_failure(rh, zip_file, result_base, output_dir, buildactions,
+                   other_files, texts, collect_sources):
+    """
+    Record the content of the debug zip of a failed analysis in the failure
+    store: the files constituting the translation units of the given build
+    actions, the other given files and the outputs of the analyzer. The
+    spooled outputs of the analyzer are removed.
+    """
+    files = {}
+    try:
+        if collect_sources:
+            from tu_collector import tu_collector
+
+            error_messages = ''
+            for buildaction in buildactions:
+                tu_files, err = tu_collector.get_dependent_headers(
+                    buildaction['command'], buildaction['directory'])
+                other_files.extend(tu_files)
 
-    with zipfile.ZipFile(zip_file, 'w') as archive:
-        LOG.debug("[ZIP] Writing analyzer STDOUT to /stdout")
-        archive.writestr("stdout", rh.analyzer_stdout)
+                if err:
+                    error_messages += buildaction['file'] + '\n' \
+                        + '-' * len(buildaction['file']) + '\n' + err + '\n'
 
-        LOG.debug("[ZIP] Writing analyzer STDERR to /stderr")
-        archive.writestr("stderr", rh.analyzer_stderr)
+            if error_messages:
+                texts['no-sources'] = error_messages
 
-        LOG.debug("[ZIP] Writing extra information...")
-        archive.writestr("build-action", action.original_command)
-        archive.writestr("analyzer-command", ' '.join(rh.analyzer_cmd))
-        archive.writestr("return-code", str(rh.analyzer_returncode))
+            for source_file in other_files:
+                files[os.path.join('sources-root',
+                                   source_file.lstrip(os.sep))] = source_file
+        else:
+            texts['no-sources'] = "The source files are not collected, " \
+                                  "because too many analyses have failed.\n"
 
-        toolchain = gcc_toolchain.toolchain_in_args(
-            shlex.split(action.original_command))
-        if toolchain:
-            archive.writestr("gcc-toolchain-path", toolchain)
+        for name, spool in [("stdout", rh.analyzer_stdout_spool),
+                            ("stderr", rh.analyzer_stderr_spool)]:
+            if spool:
+                files[name] = spool.path
+            else:
+                texts[name] = ''
 
-    LOG.debug("ZIP file written at '%s'", zip_file)
+        FailureStore(output_dir).write_manifest(zip_file, texts, files)
+    finally:
+        rh.remove_output()
 
     # Remove files that successfully analyzed earlier on.
     plist_file = result_base + ".plist"
@@ -454,6 +826,77 @@ def setup_process_timeout(proc, timeout,
     return __cleanup_timeout
 
 
+def setup_process_memory_watch(proc, interval=MEMORY_SAMPLING_INTERVAL):
+    """
+    Sample the resident set size of a process and its child processes
+    periodically on a separate thread.
+
+    :param proc: The subprocess.Process object representing the process to
+      attach the watcher to.
+    :param interval: The time between the samples, in seconds.
+
+    :return: A function is returned which should be called when the process
+      has terminated. It stops the sampling and returns the peak memory
+      usage of the process in bytes.
+    """
+    watch = {'peak': 0}
+    stop = Event()
+
+    def __sample():
+        try:
+            process = psutil.Process(proc.pid)
+        except psutil.Error:
+            return
+
+        while not stop.is_set():
+            try:
+                rss = process.memory_info().rss
+            except psutil.Error:
+                # The process has already terminated.
+                return
+
+            try:
+                for child in process.children(True):
+                    rss += child.memory_info().rss
+            except psutil.Error:
+                pass
+
+            watch['peak'] = max(watch['peak'], rss)
+            stop.wait(interval)
+
+    sampler = Thread(target=__sample)
+    sampler.daemon = True
+    sampler.start()
+
+    def __stop_watch():
+        stop.set()
+        sampler.join()
+        return watch['peak']
+
+    return __stop_watch
+
+
+def run_postprocess(task):
+    """
+    Run a postprocessing task returned by _check(). A task is a
+    (function, arguments) tuple. Returns the time spent on the task.
+    """
+    start_time = time.time()
+
+    func, args = task
+    try:
+        func(*args)
+    except Exception as ex:
+        LOG.debug_analyzer(str(ex))
+        traceback.print_exc(file=sys.stdout)
+    finally:
+        # The workers live for the whole analysis, so the source files read
+        # for the report hashes are not kept mapped between the tasks.
+        source_line_cache.clear()
+
+    return time.time() - start_time
+
+
 def check(check_data):
     """
     Invoke clang with an action which called by processes.
@@ -461,15 +904,56 @@ def check(check_data):
 
     skiplist handler is None if no skip file was configured.
     """
+    result, postprocess_tasks = _check(check_data)
+
+    for task in postprocess_tasks:
+        run_postprocess(task)
+
+    return result
+
+
+def check_deferred(indexed_check_data):
+    """
+    Same as check() but the postprocessing of the analysis results is not
+    done, so the worker can start the next analysis immediately. The
+    postprocessing tasks are returned with the index of the check data and
+    the result of the check.
+    """
+    index, check_data = indexed_check_data
+
+    # The analysis of the Clang Static Analyzer uses the CTU and statistics
+    # data collected by the pre-analysis.
+    if pre_analysis_ready and \
+            check_data[1].analyzer_type == ClangSA.ANALYZER_NAME:
+        pre_analysis_ready.wait()
+
+    result, postprocess_tasks = _check(check_data)
+
+    return index, result, postprocess_tasks
+
+
+def _check(check_data):
+    """
+    Run the analysis of the given check data. Returns the result of the check
+    and the list of tasks which postprocess the results of the analyzer, see
+    run_postprocess().
+    """
     actions_map, action, context, analyzer_config_map, \
         output_dir, skip_handler, quiet_output_on_stdout, \
         capture_analysis_output, analysis_timeout, \
         analyzer_environment, ctu_reanalyze_on_failure, \
-        output_dirs, statistics_data = check_data
+        output_dirs, statistics_data, analysis_cache, \
+        expected_memory = check_data
 
     failed_dir = output_dirs["failed"]
     success_dir = output_dirs["success"]
 
+    start_time = time.time()
+    admitted = False
+    postprocess_tasks = []
+    rh = None
+    failed_rh = None
+
     try:
         # If one analysis fails the check fails.
         return_codes = 0
@@ -482,47 +966,91 @@ def check(check_data):
                           output_dir, context.severity_map,
                           skip_handler, statistics_data)
 
-        # The analyzer invocation calls __create_timeout as a callback
+        # The results of CTU and statistics based analysis depend on other
+        # translation units too, so these are never taken from the cache.
+        cache_key = None
+        if analysis_cache and not statistics_data and \
+                not is_ctu_active(source_analyzer):
+            cache_key = analysis_cache.get_key(
+                analyzer_cmd, rh.analyzer_result_file,
+                context.analyzer_binaries.get(action.analyzer_type),
+                rh.report_hash_type)
+
+            if analysis_cache.restore(cache_key, rh.analyzer_result_file):
+                result_file = rh.analyzer_result_file.replace(r'\ ', ' ')
+                save_metadata(result_file, rh.analyzer_result_file,
+                              rh.analyzed_source_file)
+
+                if skip_handler:
+                    postprocess_tasks.append(
+                        (plist_parser.skip_report_from_plist,
+                         (result_file, skip_handler)))
+
+                LOG.info("[%d/%d] %s analysis result of %s is reused from "
+                         "the cache.",
+                         progress_checked_num.value, progress_actions.value,
+                         action.analyzer_type,
+                         os.path.basename(action.source))
+
+                progress_checked_num.value += 1
+
+                return (0, False, reanalyzed, action.analyzer_type,
+                        result_file, action.source, True,
+                        time.time() - start_time, 0), postprocess_tasks
+
+        # The analyzer invocation calls __create_watchers as a callback
         # when the analyzer starts. This callback creates the timeout
         # watcher over the analyzer process, which in turn returns a
         # function, that can later be used to check if the analyzer quit
-        # because we killed it due to a timeout.
+        # because we killed it due to a timeout. The memory watcher is
+        # created the same way.
         #
         # We need to capture the "function pointer" returned by
         # setup_process_timeout as reference, so that we may call it
         # later. To work around scoping issues, we use a list here so the
         # "function pointer" is captured by reference.
         timeout_cleanup = [lambda: False]
-
-        if analysis_timeout and analysis_timeout > 0:
-            def __create_timeout(analyzer_process):
-                """
-                Once the analyzer process is started, this method is
-                called. Set up a timeout for the analysis.
-                """
+        memory_cleanup = [lambda: 0]
+
+        def __create_watchers(analyzer_process):
+            """
+            Once the analyzer process is started, this method is
+            called. Set up a timeout for the analysis if it is given by the
+            client and sample the memory usage of the analyzer.
+            """
+            if analysis_timeout and analysis_timeout > 0:
                 timeout_cleanup[0] = setup_process_timeout(
                     analyzer_process, analysis_timeout)
-        else:
-            def __create_timeout(analyzer_process):
-                # If no timeout is given by the client, this callback
-                # shouldn't do anything.
-                pass
+
+            memory_cleanup[0] = setup_process_memory_watch(analyzer_process)
 
         result_file_exists = os.path.exists(rh.analyzer_result_file)
 
+        if memory_governor:
+            memory_governor.acquire(expected_memory)
+            admitted = True
+
+        # The duration is used for the scheduling and the adaptive timeouts
+        # of the next analysis, so the time of waiting for the memory is not
+        # part of it.
+        start_time = time.time()
+
         # Fills up the result handler with the analyzer information.
         source_analyzer.analyze(analyzer_cmd, rh, analyzer_environment,
-                                __create_timeout)
+                                __create_watchers)
 
         # If execution reaches this line, the analyzer process has quit.
+        peak_memory = memory_cleanup[0]()
+
         if timeout_cleanup[0]():
             LOG.warning("Analyzer ran too long, exceeding time limit "
                         "of %d seconds.", analysis_timeout)
             LOG.warning("Considering this analysis as failed...")
-            rh.analyzer_returncode = -1
-            rh.analyzer_stderr = (">>> CodeChecker: Analysis timed out "
-                                  "after {0} seconds. <<<\n{1}") \
-                .format(analysis_timeout, rh.analyzer_stderr)
+            rh.analyzer_returncode = TIMEOUT_RETURN_CODE
+            if rh.analyzer_stderr_spool:
+                rh.analyzer_stderr_spool.prepend(
+                    ">>> CodeChecker: Analysis timed out after {0} seconds. "
+                    "<<<\n".format(analysis_timeout))
 
         # If source file contains escaped spaces ("\ " tokens), then
         # clangSA writes the plist file with removing this escape
@@ -561,9 +1089,14 @@ def check(check_data):
             if os.path.exists(ctu_zip_file):
                 os.remove(ctu_zip_file)
 
-            handle_success(rh, result_file, result_base,
-                           skip_handler, capture_analysis_output,
-                           success_dir)
+            failure_store = FailureStore(output_dir)
+            failure_store.remove_manifest(zip_file)
+            failure_store.remove_manifest(ctu_zip_file)
+
+            postprocess_tasks.append(
+                (handle_success, (rh, result_file, result_base,
+                                  skip_handler, capture_analysis_output,
+                                  success_dir, analysis_cache, cache_key)))
             LOG.info("[%d/%d] %s analyzed %s successfully.",
                      progress_checked_num.value, progress_actions.value,
                      action.analyzer_type, source_file_name)
@@ -572,12 +1105,6 @@ def check(check_data):
                 LOG.warning("Previous analysis results in '%s' has been "
                             "overwritten.", rh.analyzer_result_file)
 
-            if skip_handler:
-                # We need to check the plist content because skipping
-                # reports in headers can be done only this way.
-                plist_parser.skip_report_from_plist(result_file,
-                                                    skip_handler)
-
         else:
             LOG.error("Analyzing %s with %s %s failed!",
                       source_file_name,
@@ -588,11 +1115,17 @@ def check(check_data):
                 LOG.error("\n%s", rh.analyzer_stdout)
                 LOG.error("\n%s", rh.analyzer_stderr)
 
-            handle_failure(source_analyzer, rh, zip_file, result_base,
-                           actions_map)
+            postprocess_tasks.append(
+                handle_failure(source_analyzer, rh, zip_file, result_base,
+                               actions_map, output_dir))
 
             if ctu_active and ctu_reanalyze_on_failure:
                 LOG.error("Try to reanalyze without CTU")
+
+                # The output of the failed analysis is removed by
+                # record_failure().
+                failed_rh = rh
+
                 # Try to reanalyze with CTU disabled.
                 source_analyzer, analyzer_cmd, rh, reanalyzed = \
                     prepare_check(action,
@@ -611,9 +1144,11 @@ def check(check_data):
 
                 return_codes = rh.analyzer_returncode
                 if rh.analyzer_returncode == 0:
-                    handle_success(rh, result_file, result_base,
-                                   skip_handler, capture_analysis_output,
-                                   success_dir)
+                    postprocess_tasks.append(
+                        (handle_success, (rh, result_file, result_base,
+                                          skip_handler,
+                                          capture_analysis_output,
+                                          success_dir)))
 
                     LOG.info("[%d/%d] %s analyzed %s without"
                              " CTU successfully.",
@@ -634,27 +1169,173 @@ def check(check_data):
 
                     zip_file = result_base + '.zip'
                     zip_file = os.path.join(failed_dir, zip_file)
-                    handle_failure(source_analyzer, rh, zip_file,
-                                   result_base, actions_map)
+                    postprocess_tasks.append(
+                        handle_failure(source_analyzer, rh, zip_file,
+                                       result_base, actions_map, output_dir))
 
         if not quiet_output_on_stdout:
             if rh.analyzer_returncode:
                 LOG.error('\n%s', rh.analyzer_stdout)
                 LOG.error('\n%s', rh.analyzer_stderr)
-            else:
+            elif LOG.isEnabledFor(DEBUG_ANALYZER):
                 LOG.debug_analyzer('\n%s', rh.analyzer_stdout)
                 LOG.debug_analyzer('\n%s', rh.analyzer_stderr)
 
+        # The output of the analysis is removed by handle_success() or
+        # record_failure().
         progress_checked_num.value += 1
 
-        return return_codes, False, reanalyzed, action.analyzer_type, \
-            result_file, action.source
+        return (return_codes, False, reanalyzed, action.analyzer_type,
+                result_file, action.source, False, time.time() - start_time,
+                peak_memory), postprocess_tasks
 
     except Exception as e:
         LOG.debug_analyzer(str(e))
         traceback.print_exc(file=sys.stdout)
-        return 1, False, reanalyzed, action.analyzer_type, None, \
-            action.source
+        for handler in [rh, failed_rh]:
+            if handler:
+                handler.remove_output()
+        return (1, False, reanalyzed, action.analyzer_type, None,
+                action.source, False, time.time() - start_time, 0), []
+    finally:
+        if admitted:
+            memory_governor.release(expected_memory)
+
+
+def check_remote(context, action, settings):
+    """
+    Analyze a build action given by the coordinator of a distributed
+    analysis. The analysis is done in a temporary output directory and the
+    created files are returned together with the result of the check so they
+    can be sent back to the coordinator.
+
+    The paths in the returned check result are relative to the output
+    directory.
+    """
+    if progress_checked_num is None:
+        init_worker(multiprocessing.Value('i', 1),
+                    multiprocessing.Value('i', settings['actions_num']))
+
+    output_path = tempfile.mkdtemp(prefix='codechecker_analysis_')
+    try:
+        output_dirs = {'success': os.path.join(output_path, 'success'),
+                       'failed': os.path.join(output_path, 'failed')}
+        for output_dir in output_dirs.values():
+            os.makedirs(output_dir)
+
+        analyzer_environment = env.extend(context.path_env_extra,
+                                          context.ld_lib_path_extra)
+
+        result = check(({},
+                        action,
+                        context,
+                        settings['analyzer_config_map'],
+                        output_path,
+                        settings['skip_handler'],
+                        settings['quiet'],
+                        settings['capture_analysis_output'],
+                        settings['timeout'],
+                        analyzer_environment,
+                        settings['ctu_reanalyze_on_failure'],
+                        output_dirs,
+                        settings['statistics_data'],
+                        None,
+                        0))
+
+        files = {}
+        for root, _, file_names in os.walk(output_path):
+            for file_name in file_names:
+                file_path = os.path.join(root, file_name)
+                with open(file_path, 'rb') as result_file:
+                    files[os.path.relpath(file_path, output_path)] = \
+                        result_file.read()
+
+        result_file = result[4]
+        if result_file:
+            result_file = os.path.relpath(result_file, output_path)
+
+        return result[:4] + (result_file,) + result[5:], files
+    finally:
+        shutil.rmtree(output_path, ignore_errors=True)
+
+
+def run_coordinator(coordinator, actions, settings, output_path,
+                    result_callback=None):
+    """
+    Serve the build actions to the analyze workers and collect the results
+    of the analysis into the output directory. The check results are
+    returned in the order of the build actions.
+
+    The result_callback is called with the build action and its check
+    result when the results of the build action are written.
+    """
+    address, authkey = coordinator
+    results = [None] * len(actions)
+    finished = [0]
+
+    def handle_result(task_id, result):
+        action = actions[task_id]
+        finished[0] += 1
+
+        if result is None:
+            LOG.error("[%d/%d] No worker could analyze %s with %s!",
+                      finished[0], len(actions), action.source,
+                      action.analyzer_type)
+            results[task_id] = (1, False, False, action.analyzer_type, None,
+                                action.source, False, 0, 0)
+            return
+
+        check_result, files = result
+        for rel_path, content in files.items():
+            file_path = os.path.join(output_path, rel_path)
+            file_dir = os.path.dirname(file_path)
+            if not os.path.isdir(file_dir):
+                os.makedirs(file_dir)
+
+            with open(file_path, 'wb') as result_file:
+                result_file.write(content)
+
+        result_file = check_result[4]
+        if result_file:
+            result_file = os.path.join(output_path, result_file)
+
+        results[task_id] = \
+            check_result[:4] + (result_file,) + check_result[5:]
+        if result_callback:
+            result_callback(action, results[task_id])
+
+        LOG.info("[%d/%d] %s analysis of %s has been finished by a worker.",
+                 finished[0], len(actions), action.analyzer_type,
+                 os.path.basename(action.source))
+
+    server = distributed.Coordinator(address, authkey, actions, settings)
+    server.start()
+    try:
+        server.wait(handle_result)
+    finally:
+        server.shutdown()
+
+    return results
+
+
+def update_history(history, actions, results):
+    """
+    Record the measurements of the analyzed build actions in the analysis
+    history and write it to the report directory.
+    """
+    for action, result in zip(actions, results):
+        return_code, _, _, _, _, _, cached, duration, peak_memory = result
+
+        # The results taken from the cache and the actions which could not
+        # be analyzed by any worker have no measured duration.
+        if cached or not duration:
+            continue
+
+        history.add_duration(action, duration,
+                             return_code == TIMEOUT_RETURN_CODE)
+        history.update(action, peak_memory=peak_memory)
+
+    history.write()
 
 
 def skip_cpp(compile_actions, skip_handler):
@@ -678,32 +1359,140 @@ def skip_cpp(compile_actions, skip_handler):
     return analyze, skip
 
 
+def defer_pre_analysis_waits(actions, affected_actions):
+    """
+    Move the analyses which wait for the pre-analysis behind the other
+    analyses, keeping the affected build actions of the changed files in
+    front of every other build action and the order of the build actions
+    otherwise.
+    """
+    return sorted(actions,
+                  key=lambda a: (a not in affected_actions,
+                                 a.analyzer_type == ClangSA.ANALYZER_NAME))
+
+
 def start_workers(actions_map, actions, context, analyzer_config_map,
                   jobs, output_path, skip_handler, metadata,
                   quiet_analyze, capture_analysis_output, timeout,
-                  ctu_reanalyze_on_failure, statistics_data, manager):
+                  ctu_reanalyze_on_failure, statistics_data, manager,
+                  analysis_cache=None, coordinator=None, max_memory=None,
+                  resume=False, timeout_multiplier=None, changed_files=None,
+                  worker_pool=None, pre_analysis=None):
     """
     Start the workers in the process pool.
     For every build action there is worker which makes the analysis.
+
+    If an analysis cache is given the results of the unchanged build actions
+    are taken from the cache instead of running the analyzers again.
+
+    The build actions are started in the order of their expected duration,
+    the longest first. The durations are measured in the previous runs and
+    stored in the report directory.
+
+    If a coordinator address and authentication key pair is given, then the
+    build actions are served to the analyze workers on that address instead
+    of analyzing them in a local process pool.
+
+    The analyzer processes are started only if there is enough free memory
+    and their expected peak memory usage, measured in the previous runs, fits
+    into the max_memory budget (in bytes) if it is given.
+
+    If a timeout multiplier is given, the timeout of every build action is
+    the multiple of its analysis time in the previous runs, limited by the
+    timeout. The build actions killed by the timeout in the previous run are
+    started last with the full timeout.
+
+    If the changed files are given, the build actions analyzing a changed
+    file or a file including a changed file are started first, and the
+    number of the reports in the changed files is logged as soon as their
+    analysis has finished.
+
+    The results of the analyzers are postprocessed (e.g. clang-tidy output
+    conversion, skipping reports in headers, collecting the debug data of
+    the failed analyses) on a separate process pool, so the analyzer
+    processes do not wait for the postprocessing. The debug data of the
+    failed analyses is recorded in the manifests of the failure store, the
+    debug zips are written from them only on demand, e.g. by 'CodeChecker
+    store'.
+
+    Every build action is recorded in the analysis journal of the output
+    directory when its results are written. If the analysis is resumed, the
+    build actions recorded by the previous, interrupted analysis are not
+    analyzed again, their results are merged into the metadata.
+
+    The analyses run on the given worker pool, which is left open, or on a
+    new one. If the pre-analysis has been started on the worker pool,
+    pre_analysis is the function which finishes it (see
+    pre_analysis_manager.start_pre_analysis()). In this case the analyses
+    of the other analyzers are started first and they run while the
+    pre-analysis is finished, the Clang Static Analyzer analyses wait for
+    it.
     """
+    own_worker_pool = worker_pool is None
+    if own_worker_pool:
+        worker_pool = WorkerPool(jobs, max_memory)
 
     # Handle SIGINT to stop this script running.
     def signal_handler(signum, frame):
         try:
-            pool.terminate()
+            worker_pool.terminate()
             manager.shutdown()
         finally:
             sys.exit(128 + signum)
 
     signal.signal(signal.SIGINT, signal_handler)
     actions, skipped_actions = skip_cpp(actions, skip_handler)
-    # Start checking parallel.
-    checked_var = multiprocessing.Value('i', 1)
-    actions_num = multiprocessing.Value('i', len(actions))
-    pool = multiprocessing.Pool(jobs,
-                                initializer=init_worker,
-                                initargs=(checked_var,
-                                          actions_num))
+
+    journal = AnalysisJournal(output_path)
+    resumed_results = []
+    if resume:
+        records = journal.load()
+        remaining_actions = []
+        for action in actions:
+            record = records.get(get_action_key(action))
+            result = get_resumed_result(record) if record else None
+            if result:
+                resumed_results.append(result)
+            else:
+                remaining_actions.append(action)
+        actions = remaining_actions
+
+        LOG.info("Resuming the analysis, results of %d compilation "
+                 "command(s) are kept from the interrupted analysis.",
+                 len(resumed_results))
+        metadata['resumed'] = len(resumed_results)
+    journal.open(resume)
+
+    history = AnalysisHistory(output_path)
+    durations, has_history = history.estimate_durations(actions)
+    actions = schedule_longest_first(actions, durations, history)
+
+    affected_actions = set()
+    if changed_files is not None:
+        affected_actions = changed_files.get_affected_actions(
+            actions, jobs, worker_pool.postprocess_pool)
+        actions = prioritize(actions, affected_actions)
+        LOG.info("%d compilation command(s) are affected by the %d changed "
+                 "file(s), these are analyzed first.",
+                 len(affected_actions), len(changed_files))
+
+    if pre_analysis:
+        # The analyses which do not wait for the pre-analysis are started
+        # first.
+        actions = defer_pre_analysis_waits(actions, affected_actions)
+
+    # Predicting the runtime makes sense only if the durations are measured
+    # in seconds, not estimated from the file sizes only.
+    predicted_makespan = predict_makespan(durations, jobs) \
+        if has_history and not coordinator else None
+
+    expected_memory = history.estimate_peak_memory(actions)
+
+    if timeout_multiplier:
+        timeouts = history.estimate_timeouts(actions, timeout_multiplier,
+                                             timeout)
+    else:
+        timeouts = [timeout] * len(actions)
 
     failed_dir = os.path.join(output_path, "failed")
     # If the analysis has failed, we help debugging.
@@ -719,6 +1508,14 @@ def start_workers(actions_map, actions, context, analyzer_config_map,
     output_dirs = {'success': success_dir,
                    'failed': failed_dir}
 
+    def finish_action(action, result):
+        """
+        Called when the results of the build action have been written.
+        """
+        journal.record(action, result)
+        if action in affected_actions:
+            report_changed_results(action, result, changed_files)
+
     # Construct analyzer env.
     analyzer_environment = env.extend(context.path_env_extra,
                                       context.ld_lib_path_extra)
@@ -731,37 +1528,112 @@ def start_workers(actions_map, actions, context, analyzer_config_map,
                          skip_handler,
                          quiet_analyze,
                          capture_analysis_output,
-                         timeout,
+                         build_action_timeout,
                          analyzer_environment,
                          ctu_reanalyze_on_failure,
                          output_dirs,
-                         statistics_data)
-                        for build_action in actions]
+                         statistics_data,
+                         analysis_cache,
+                         build_action_memory)
+                        for build_action, build_action_timeout,
+                        build_action_memory
+                        in zip(actions, timeouts, expected_memory)]
+
+    if analyzed_actions and coordinator:
+        settings = {
+            'analyzer_config_map': dict(analyzer_config_map.items()),
+            'skip_handler': skip_handler,
+            'quiet': quiet_analyze,
+            'capture_analysis_output': capture_analysis_output,
+            'timeout': timeout,
+            'ctu_reanalyze_on_failure': ctu_reanalyze_on_failure,
+            'statistics_data': dict(statistics_data.items())
+            if statistics_data else None,
+            'actions_num': len(actions)}
+
+        # The remote workers use the results of the pre-analysis.
+        if pre_analysis:
+            pre_analysis()
+
+        start_time = time.time()
+        results = run_coordinator(coordinator, actions, settings,
+                                  output_path, finish_action)
+        worker_result_handler(resumed_results + results, metadata,
+                              output_path, context.analyzer_binaries, None,
+                              start_time)
+
+        update_history(history, actions, results)
+    elif analyzed_actions:
+        # Start checking parallel.
+        worker_pool.checked_num.value = 1
+        worker_pool.actions_num.value = len(actions)
+        worker_pool.failed_num.value = 0
 
-    if analyzed_actions:
         try:
-
-            # Workaround, equivalent of map.
-            # The main script does not get signal
-            # while map or map_async function is running.
-            # It is a python bug, this does not happen if a timeout is
-            # specified, then receive the interrupt immediately.
-            pool.map_async(check,
-                           analyzed_actions,
-                           1,
-                           callback=lambda results: worker_result_handler(
-                               results, metadata, output_path,
-                               context.analyzer_binaries)
-                           ).get(31557600)
-
-            pool.close()
+            start_time = time.time()
+            pipeline = PostprocessPipeline(worker_pool.postprocess_pool,
+                                           worker_pool.postprocess_jobs)
+
+            # The analysis results are handed to the postprocessing stage
+            # in the order of their arrival.
+            results = [None] * len(analyzed_actions)
+            checks = worker_pool.pool.imap_unordered(
+                check_deferred, enumerate(analyzed_actions))
+
+            # The analyses queued after the pre-analysis jobs run while the
+            # pre-analysis results are merged.
+            if pre_analysis:
+                pre_analysis()
+
+            while True:
+                try:
+                    index, result, postprocess_tasks = \
+                        checks.next(POOL_RESULT_TIMEOUT)
+                except StopIteration:
+                    break
+
+                results[index] = result
+
+                # The build action is completed when its results are
+                # written by the postprocessing.
+                pipeline.put(postprocess_tasks,
+                             partial(finish_action, actions[index], result))
+
+            pipeline.join()
+
+            pipeline_statistics = pipeline.get_statistics()
+            pipeline_statistics['analysis_jobs'] = worker_pool.jobs
+            pipeline_statistics['analysis_time'] = \
+                sum(result[7] for result in results)
+
+            worker_result_handler(resumed_results + results, metadata,
+                                  output_path, context.analyzer_binaries,
+                                  predicted_makespan, start_time,
+                                  pipeline_statistics)
+
+            update_history(history, actions, results)
         except Exception:
-            pool.terminate()
+            worker_pool.terminate()
             raise
-        finally:
-            pool.join()
     else:
-        LOG.info("----==== Summary ====----")
+        if pre_analysis:
+            pre_analysis()
+
+        if resumed_results:
+            worker_result_handler(resumed_results, metadata, output_path,
+                                  context.analyzer_binaries)
+        else:
+            LOG.info("----==== Summary ====----")
+
+    if own_worker_pool:
+        worker_pool.close()
+
+    # Every build action has been completed.
+    journal.remove()
+
+    # The debug zips of the failed analyses are written on demand from the
+    # failure store, e.g. by 'CodeChecker store'.
+    FailureStore(output_path).remove_unused_blobs()
 
     for skp in skipped_actions:
         LOG.debug_analyzer("%s is skipped", skp.source)
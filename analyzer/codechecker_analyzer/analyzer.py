@@ -12,16 +12,17 @@ from __future__ import absolute_import
 
 from multiprocessing.managers import SyncManager
 import os
-import shlex
 import shutil
 import signal
-import subprocess
 import time
 
 from codechecker_common.logger import get_logger
 
 from . import analysis_manager, pre_analysis_manager, env, checkers
-from .analyzers import analyzer_types
+from . import distributed
+from .analysis_cache import AnalysisCache
+from .changed_files import ChangedFiles
+from .analyzers import analyzer_info_cache, analyzer_types
 from .analyzers.clangsa.analyzer import ClangSA
 from .analyzers.clangsa.statistics_collector import \
     SpecialReturnValueCollector
@@ -75,16 +76,12 @@ def __get_analyzer_version(context, analyzer_config_map):
     versions = {}
     for _, analyzer_cfg in analyzer_config_map.items():
         analyzer_bin = analyzer_cfg.analyzer_binary
-        version = [analyzer_bin, u' --version']
-        try:
-            output = subprocess.check_output(shlex.split(' '.join(version)),
-                                             env=check_env,
-                                             universal_newlines=True)
+        output = analyzer_info_cache.get_version(analyzer_bin, check_env)
+        if output is not None:
             versions[analyzer_bin] = output
-        except (subprocess.CalledProcessError, OSError) as oerr:
-            LOG.warning("Failed to get analyzer version: %s",
-                        ' '.join(version))
-            LOG.warning(oerr.strerror)
+        else:
+            LOG.warning("Failed to get analyzer version: %s --version",
+                        analyzer_bin)
 
     return versions
 
@@ -206,6 +203,28 @@ def perform_analysis(args, skip_handler, context, actions, metadata):
     versions = __get_analyzer_version(context, config_map)
     metadata['versions'].update(versions)
 
+    analysis_cache = None
+    if 'analysis_cache_dir' in args:
+        analysis_cache = AnalysisCache(args.analysis_cache_dir, versions)
+
+    max_memory = args.max_memory if 'max_memory' in args else None
+
+    timeout_multiplier = args.adaptive_timeout \
+        if 'adaptive_timeout' in args else None
+
+    changed_files = None
+    if 'changed_files' in args:
+        try:
+            changed_files = ChangedFiles.from_file(args.changed_files)
+        except IOError as ex:
+            LOG.error("Failed to read the changed files: %s", ex)
+            return
+
+    coordinator = None
+    if 'coordinator' in args:
+        coordinator = (distributed.parse_address(args.coordinator),
+                       distributed.get_authkey())
+
     metadata['checkers'] = {}
     for analyzer in analyzers:
         metadata['checkers'][analyzer] = {}
@@ -214,9 +233,9 @@ def perform_analysis(args, skip_handler, context, actions, metadata):
             enabled, _ = data
             metadata['checkers'][analyzer].update({check: enabled})
 
-    if ctu_collect:
-        shutil.rmtree(ctu_dir, ignore_errors=True)
-    elif ctu_analyze and not os.path.exists(ctu_dir):
+    # The CTU directory of the previous collect phase is kept, so the data of
+    # the unchanged translation units can be reused.
+    if not ctu_collect and ctu_analyze and not os.path.exists(ctu_dir):
         LOG.error("CTU directory: '%s' does not exist.", ctu_dir)
         return
 
@@ -233,6 +252,10 @@ def perform_analysis(args, skip_handler, context, actions, metadata):
     # Setting to not None value will enable statistical analysis features.
     statistics_data = __get_statistics_data(args, manager)
 
+    # The worker processes are shared by the pre-analysis and the analysis.
+    worker_pool = analysis_manager.WorkerPool(args.jobs, max_memory)
+
+    pre_analysis = None
     if ctu_collect or statistics_data:
         ctu_data = None
         if ctu_collect or ctu_analyze:
@@ -243,7 +266,7 @@ def perform_analysis(args, skip_handler, context, actions, metadata):
                                      'ctu_func_map_file':
                                      ctu_capability.mapping_file_name,
                                      'ctu_temp_fnmap_folder':
-                                     'tmpExternalFnMaps'})
+                                     'externalFnMaps'})
 
         pre_analyze = [a for a in actions
                        if a.analyzer_type == ClangSA.ANALYZER_NAME]
@@ -255,16 +278,19 @@ def perform_analysis(args, skip_handler, context, actions, metadata):
                 or ("stats_output" in args and args.stats_output)):
             pre_anal_skip_handler = skip_handler
 
-        pre_analysis_manager.run_pre_analysis(pre_analyze,
-                                              context,
-                                              config_map,
-                                              args.jobs,
-                                              pre_anal_skip_handler,
-                                              ctu_data,
-                                              statistics_data,
-                                              manager)
+        pre_analysis = pre_analysis_manager.start_pre_analysis(
+            pre_analyze,
+            context,
+            config_map,
+            pre_anal_skip_handler,
+            ctu_data,
+            statistics_data,
+            manager,
+            worker_pool)
 
     if 'stats_output' in args and args.stats_output:
+        pre_analysis()
+        worker_pool.close()
         return
 
     if 'stats_dir' in args and args.stats_dir:
@@ -287,7 +313,15 @@ def perform_analysis(args, skip_handler, context, actions, metadata):
                                        else None,
                                        ctu_reanalyze_on_failure,
                                        statistics_data,
-                                       manager)
+                                       manager,
+                                       analysis_cache,
+                                       coordinator,
+                                       max_memory,
+                                       'resume' in args,
+                                       timeout_multiplier,
+                                       changed_files,
+                                       worker_pool,
+                                       pre_analysis)
         LOG.info("Analysis finished.")
         LOG.info("To view results in the terminal use the "
                  "\"CodeChecker parse\" command.")
@@ -295,6 +329,10 @@ def perform_analysis(args, skip_handler, context, actions, metadata):
         LOG.info("See --help and the user guide for further options about"
                  " parsing and storing the reports.")
         LOG.info("----=================----")
+    elif pre_analysis:
+        pre_analysis()
+
+    worker_pool.close()
 
     end_time = time.time()
     LOG.info("Analysis length: %s sec.", end_time - start_time)
@@ -19,6 +19,8 @@ import sys
 
 from codechecker_common.logger import get_logger
 
+from .output_spool import OutputSpool
+
 LOG = get_logger('analyzer')
 
 
@@ -63,8 +65,9 @@ class SourceAnalyzer(object):
     def get_analyzer_mentioned_files(self, output):
         """
         Return a collection of files that were mentioned by the analyzer in
-        its standard outputs, which should be analyzer_stdout or
-        analyzer_stderr from a result handler.
+        its standard outputs. The output is an iterable of lines, e.g. the
+        lines of analyzer_stdout_spool or analyzer_stderr_spool of a result
+        handler.
         """
         raise NotImplementedError("Subclasses should implement this!")
 
@@ -92,10 +95,11 @@ class SourceAnalyzer(object):
                 = SourceAnalyzer.run_proc(analyzer_cmd,
                                           env,
                                           res_handler.buildaction.directory,
-                                          proc_callback)
+                                          proc_callback,
+                                          True)
             res_handler.analyzer_returncode = ret_code
-            res_handler.analyzer_stdout = stdout
-            res_handler.analyzer_stderr = stderr
+            res_handler.analyzer_stdout_spool = stdout
+            res_handler.analyzer_stderr_spool = stderr
             return res_handler
 
         except Exception as ex:
@@ -111,10 +115,15 @@ class SourceAnalyzer(object):
         raise NotImplementedError("Subclasses should implement this!")
 
     @staticmethod
-    def run_proc(command, env=None, cwd=None, proc_callback=None):
+    def run_proc(command, env=None, cwd=None, proc_callback=None,
+                 spool_output=False):
         """
         Just run the given command and return the return code
         and the stdout and stderr outputs of the process.
+
+        If spool_output is True the outputs are written into temporary files
+        instead of the memory and OutputSpool objects are returned which have
+        to be removed by the caller.
         """
 
         def signal_handler(signum, frame):
@@ -127,18 +136,35 @@ class SourceAnalyzer(object):
 
         signal.signal(signal.SIGINT, signal_handler)
 
-        proc = subprocess.Popen(command,
-                                bufsize=-1,
-                                env=env,
-                                preexec_fn=os.setsid,
-                                cwd=cwd,
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE,
-                                universal_newlines=True)
+        if spool_output:
+            stdout, stderr = OutputSpool(), OutputSpool()
+        else:
+            stdout, stderr = subprocess.PIPE, subprocess.PIPE
+
+        try:
+            proc = subprocess.Popen(command,
+                                    bufsize=-1,
+                                    env=env,
+                                    preexec_fn=os.setsid,
+                                    cwd=cwd,
+                                    stdout=stdout,
+                                    stderr=stderr,
+                                    universal_newlines=True)
+        except Exception:
+            if spool_output:
+                stdout.remove()
+                stderr.remove()
+            raise
 
         # Send the created analyzer process' object if somebody wanted it.
         if proc_callback:
             proc_callback(proc)
 
-        stdout, stderr = proc.communicate()
+        if spool_output:
+            proc.wait()
+            stdout.close()
+            stderr.close()
+        else:
+            stdout, stderr = proc.communicate()
+
         return proc.returncode, stdout, stderr
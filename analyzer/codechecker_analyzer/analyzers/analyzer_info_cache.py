@@ -0,0 +1,157 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+User level cache of the information queried from the analyzer binaries
+(versions, checker lists, supported options), so the analyzers don't have to
+be invoked every time CodeChecker is started.
+
+A cache entry is identified by the real path, the modification time, size
+and inode of the analyzer binary (and of the other files the information
+depends on, e.g. the analyzer plugins) and the name of the information, so
+an entry is not used after the analyzer has been reinstalled.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from distutils.spawn import find_executable
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+
+from codechecker_common.logger import get_logger
+from codechecker_common.util import load_json_or_empty
+
+LOG = get_logger('analyzer')
+
+# Environment variable which can be used to change the location of the
+# cache. The cache is disabled if it is set to an empty string.
+CACHE_DIR_ENV_VAR = 'CC_ANALYZER_INFO_CACHE_DIR'
+
+# Information read or computed by this process.
+_memory_cache = {}
+
+
+def get_default_cache_dir():
+    """
+    Return the directory of the cache or None if the cache is disabled.
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENV_VAR)
+    if cache_dir is not None:
+        return cache_dir or None
+
+    return os.path.join(os.path.expanduser('~'), '.codechecker',
+                        'analyzer_info')
+
+
+def __get_file_id(path):
+    """
+    Return the identity of the given file or None if it does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return [path, str(stat.st_mtime), str(stat.st_size), str(stat.st_ino)]
+
+
+def get_key(binary, name, dependencies=None):
+    """
+    Return the cache key of the given information of the binary or None if
+    the binary can not be found. The identity of the dependency files is
+    also part of the key.
+    """
+    binary_path = find_executable(binary) if binary else None
+    if not binary_path:
+        return None
+
+    binary_id = __get_file_id(os.path.realpath(binary_path))
+    if not binary_id:
+        return None
+
+    key_content = [name] + binary_id
+    for dependency in dependencies or []:
+        key_content.extend(__get_file_id(os.path.realpath(dependency)) or
+                           [dependency])
+
+    key_str = '\0'.join(key_content)
+    return hashlib.sha256(key_str.encode(errors='ignore')).hexdigest()
+
+
+def __load(cache_dir, key):
+    entry = os.path.join(cache_dir, key + '.json')
+    if not os.path.exists(entry):
+        return None
+
+    return load_json_or_empty(entry, {}, 'analyzer info cache').get('value')
+
+
+def __store(cache_dir, key, value):
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+    except OSError:
+        # The directory may be created by another process.
+        pass
+
+    try:
+        # Rename the written file so the concurrent CodeChecker processes
+        # never see half-written entries.
+        fd, tmp_entry = tempfile.mkstemp(dir=cache_dir)
+        with os.fdopen(fd, 'w') as entry:
+            json.dump({'value': value}, entry)
+        os.rename(tmp_entry, os.path.join(cache_dir, key + '.json'))
+    except (IOError, OSError) as ex:
+        LOG.debug("Failed to store analyzer info cache entry: %s", ex)
+
+
+def get(binary, name, compute, dependencies=None):
+    """
+    Return the information with the given name of the analyzer binary. The
+    information is computed by compute() if it is not found in the cache.
+    compute() should return a JSON serializable value or None if the
+    information can not be queried, which is not cached.
+
+    dependencies -- Files which affect the information besides the binary.
+    """
+    key = get_key(binary, name, dependencies)
+    if key is None:
+        return compute()
+
+    if key in _memory_cache:
+        return _memory_cache[key]
+
+    cache_dir = get_default_cache_dir()
+    value = __load(cache_dir, key) if cache_dir else None
+    if value is None:
+        value = compute()
+        if value is not None and cache_dir:
+            __store(cache_dir, key, value)
+
+    if value is not None:
+        _memory_cache[key] = value
+
+    return value
+
+
+def get_version(binary, environ=None):
+    """
+    Return the output of the binary called with --version or None if the
+    binary can not be executed.
+    """
+    def query_version():
+        try:
+            return subprocess.check_output([binary, '--version'],
+                                           env=environ,
+                                           universal_newlines=True)
+        except (subprocess.CalledProcessError, OSError) as err:
+            LOG.debug("Failed to get the version of %s: %s", binary, err)
+            return None
+
+    return get(binary, 'version', query_version)
@@ -22,6 +22,7 @@ from codechecker_analyzer import host_check
 from codechecker_analyzer import env
 
 from .. import analyzer_base
+from .. import analyzer_info_cache
 from ..flag import has_flag
 from ..flag import prepend_all
 
@@ -115,35 +116,40 @@ class ClangSA(analyzer_base.SourceAnalyzer):
         """Return the list of the supported checkers."""
         analyzer_binary = cfg_handler.analyzer_binary
 
-        try:
-            analyzer_version = subprocess.check_output(
-                [analyzer_binary, '--version'],
-                env=environ)
-
-        except subprocess.CalledProcessError as cerr:
-            LOG.error('Failed to get and parse clang version: %s',
-                      analyzer_binary)
-            LOG.error(cerr)
-            return []
+        def list_checkers():
+            analyzer_version = analyzer_info_cache.get_version(
+                analyzer_binary, environ)
 
-        version_parser = version.ClangVersionInfoParser()
-        version_info = version_parser.parse(analyzer_version)
+            if analyzer_version is None:
+                LOG.error('Failed to get and parse clang version: %s',
+                          analyzer_binary)
+                return None
 
-        command = [analyzer_binary, "-cc1"]
+            version_parser = version.ClangVersionInfoParser()
+            version_info = version_parser.parse(analyzer_version)
 
-        checkers_list_args = clang_options.get_analyzer_checkers_cmd(
-            version_info,
-            environ,
-            cfg_handler.analyzer_plugins,
-            alpha=True)
-        command.extend(checkers_list_args)
+            command = [analyzer_binary, "-cc1"]
 
-        try:
-            result = subprocess.check_output(command, env=environ,
-                                             universal_newlines=True)
-            return parse_checkers(result)
-        except (subprocess.CalledProcessError, OSError):
-            return []
+            checkers_list_args = clang_options.get_analyzer_checkers_cmd(
+                version_info,
+                environ,
+                cfg_handler.analyzer_plugins,
+                alpha=True)
+            command.extend(checkers_list_args)
+
+            try:
+                result = subprocess.check_output(command, env=environ,
+                                                 universal_newlines=True)
+                return parse_checkers(result)
+            except (subprocess.CalledProcessError, OSError):
+                return None
+
+        # The checkers of the plugins are listed too.
+        checkers = analyzer_info_cache.get(analyzer_binary, 'checkers',
+                                           list_checkers,
+                                           cfg_handler.analyzer_plugins)
+
+        return [tuple(checker) for checker in checkers or []]
 
     def construct_analyzer_cmd(self, result_handler):
         """
@@ -265,9 +271,9 @@ class ClangSA(analyzer_base.SourceAnalyzer):
         config = self.config_handler
         environ = env.extend(config.path_env_extra,
                              config.ld_lib_path_extra)
-        triple_arch = ctu_triple_arch.get_triple_arch(self.buildaction,
-                                                      self.source_file,
-                                                      config, environ)
+        triple_arch = ctu_triple_arch.get_triple_arch(
+            self.buildaction, self.source_file, config, environ,
+            ctu_triple_arch.load_triple_arch_cache(config.ctu_dir))
         ctu_dir = os.path.join(config.ctu_dir, triple_arch)
         return ctu_dir
 
@@ -277,9 +283,6 @@ class ClangSA(analyzer_base.SourceAnalyzer):
         in the standard output or standard error.
         """
 
-        if not output:
-            return set()
-
         regex_for_ctu_ast_load = re.compile(
             r"CTU loaded AST file: (.*).ast")
 
@@ -287,7 +290,7 @@ class ClangSA(analyzer_base.SourceAnalyzer):
 
         ctu_ast_dir = os.path.join(self.get_ctu_dir(), "ast")
 
-        for line in output.splitlines():
+        for line in output:
             match = re.match(regex_for_ctu_ast_load, line)
             if match:
                 path = match.group(1)
@@ -15,6 +15,7 @@ import subprocess
 
 from codechecker_common.logger import get_logger
 from codechecker_analyzer import host_check
+from codechecker_analyzer.analyzers import analyzer_info_cache
 from codechecker_analyzer.analyzers.clangsa import clang_options, version
 
 LOG = get_logger('analyzer.clangsa')
@@ -63,10 +64,10 @@ class CTUAutodetection(object):
                 'set!')
             return False
 
-        analyzer_version = invoke_binary_checked(
-            self.__analyzer_binary, ['--version'], self.environ)
+        analyzer_version = analyzer_info_cache.get_version(
+            self.__analyzer_binary, self.environ)
 
-        if analyzer_version is False:
+        if analyzer_version is None:
             LOG.debug('Failed to invoke command to get Clang version!')
             return False
 
@@ -164,5 +165,9 @@ class CTUAutodetection(object):
         if not tool_path:
             return False
 
-        return invoke_binary_checked(tool_path, ['-version'], self.environ) \
-            is not False
+        def check_mapping_tool():
+            return invoke_binary_checked(tool_path, ['-version'],
+                                         self.environ) is not False
+
+        return analyzer_info_cache.get(tool_path, 'ctu-mapping-tool',
+                                       check_mapping_tool)
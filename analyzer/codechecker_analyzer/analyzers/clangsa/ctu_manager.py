@@ -5,23 +5,53 @@
 # -------------------------------------------------------------------------
 """
 Arranges the 1st phase of 2 phase executions for CTU
+
+The files generated in the 1st phase are kept in the CTU directory between
+the analysis runs. A manifest is stored for every translation unit which
+identifies the commands and the input files the AST and the function map of
+the translation unit were generated from, so these are regenerated only if
+any of them changes.
 """
 from __future__ import print_function
 from __future__ import division
 from __future__ import absolute_import
 
+import bisect
 import glob
+import hashlib
+import heapq
+import json
+import multiprocessing
 import os
 import shutil
 import tempfile
+import zlib
 
 from codechecker_common.logger import get_logger
+from codechecker_common.util import load_json_or_empty
 
+from ... import analysis_cache
+from ...buildlog.build_action import get_action_key
 from .. import analyzer_base
 from . import ctu_triple_arch
 
 LOG = get_logger('analyzer')
 
+# Folder of the per translation unit manifests in the triple arch folders.
+MANIFEST_FOLDER = 'manifests'
+
+# Approximate size of the function map lines which are uniqued in memory at
+# once when the global function map is created.
+MERGE_PARTITION_SIZE = 16 * 1024 * 1024
+
+# Upper limit of the partition files open at once.
+MAX_MERGE_PARTITIONS = 256
+
+# Every INDEX_INTERVAL-th entry of the global function map is put into its
+# index file which has INDEX_SUFFIX after the name of the map.
+INDEX_INTERVAL = 64
+INDEX_SUFFIX = '.idx'
+
 
 def generate_func_map_lines(fnmap_dir):
     """ Iterate over all lines of input files in random order. """
@@ -37,37 +67,171 @@ def create_global_ctu_function_map(func_map_lines):
     """ Takes iterator of individual function maps and creates a global map
     keeping only unique names. We leave conflicting names out of CTU.
     A function map contains the id of a function (mangled name) and the
-    originating source (the corresponding AST file) name."""
+    originating source (the corresponding AST file) name. The returned
+    (mangled name, AST file) pairs are sorted by the mangled names."""
 
-    mangled_to_asts = {}
+    # Mangled name -> AST file or None if the name is defined in multiple
+    # AST files.
+    mangled_to_ast = {}
 
     for line in func_map_lines:
         mangled_name, ast_file = line.strip().split(' ', 1)
-        # We collect all occurences of a function name into a list
-        if mangled_name not in mangled_to_asts:
-            mangled_to_asts[mangled_name] = {ast_file}
-        else:
-            mangled_to_asts[mangled_name].add(ast_file)
+        if mangled_name not in mangled_to_ast:
+            mangled_to_ast[mangled_name] = ast_file
+        elif mangled_to_ast[mangled_name] != ast_file:
+            mangled_to_ast[mangled_name] = None
+
+    return sorted((mangled_name, ast_file)
+                  for mangled_name, ast_file in mangled_to_ast.items()
+                  if ast_file is not None)
 
-    mangled_ast_pairs = []
 
-    for mangled_name, ast_files in mangled_to_asts.items():
-        if len(ast_files) == 1:
-            mangled_ast_pairs.append((mangled_name, ast_files.pop()))
+def __open_atomic(file_path):
+    """ Open a temporary file next to the given path for writing. The file
+    has to be renamed to the given path after it has been written. """
 
-    return mangled_ast_pairs
+    return tempfile.NamedTemporaryFile(mode='w',
+                                       dir=os.path.dirname(file_path),
+                                       delete=False)
 
 
 def write_global_map(ctu_dir, arch, ctu_func_map_file, mangled_ast_pairs):
-    """ Write (mangled function name, ast file) pairs into final file. """
+    """ Write (mangled function name, ast file) pairs into final file.
+
+    If the pairs are sorted by the mangled names, then an index is written
+    next to the map, which contains the offset of every INDEX_INTERVAL-th
+    entry in the map. The index can be used by lookup_global_map() to find a
+    mangled name without reading the whole map."""
 
     extern_fns_map_file = os.path.join(ctu_dir, arch, ctu_func_map_file)
-    with open(extern_fns_map_file, 'w') as out_file:
-        for mangled_name, ast_file in mangled_ast_pairs:
+    index_file = extern_fns_map_file + INDEX_SUFFIX
+
+    is_sorted = True
+    prev_name = None
+    with __open_atomic(extern_fns_map_file) as out_file, \
+            __open_atomic(index_file) as index:
+        for i, (mangled_name, ast_file) in enumerate(mangled_ast_pairs):
+            if prev_name is not None and mangled_name < prev_name:
+                is_sorted = False
+            prev_name = mangled_name
+
+            if i % INDEX_INTERVAL == 0:
+                index.write('%s %d\n' % (mangled_name, out_file.tell()))
+
             out_file.write('%s %s\n' % (mangled_name, ast_file))
 
+    os.rename(out_file.name, extern_fns_map_file)
+    if is_sorted:
+        os.rename(index.name, index_file)
+    else:
+        os.remove(index.name)
+        if os.path.exists(index_file):
+            os.remove(index_file)
+
+
+def lookup_global_map(extern_fns_map_file, mangled_name):
+    """ Returns the AST file which defines the given mangled name according to
+    the given global function map or None if it is not in the map. Only a few
+    lines of the map are read if the map has an index. """
+
+    start = 0
+    indexed = False
+    index_file = extern_fns_map_file + INDEX_SUFFIX
+    if os.path.exists(index_file):
+        indexed = True
+        names = []
+        offsets = []
+        with open(index_file, 'r') as index:
+            for line in index:
+                name, offset = line.rstrip('\n').rsplit(' ', 1)
+                names.append(name)
+                offsets.append(int(offset))
+
+        pos = bisect.bisect_right(names, mangled_name) - 1
+        if pos < 0:
+            return None
+        start = offsets[pos]
+
+    with open(extern_fns_map_file, 'r') as func_map:
+        func_map.seek(start)
+        for line in func_map:
+            name, ast_file = line.rstrip('\n').split(' ', 1)
+            if name == mangled_name:
+                return ast_file
+            if indexed and name > mangled_name:
+                break
+
+    return None
+
+
+def __partition_func_map_lines(fnmap_dir, partition_dir):
+    """ Distribute the lines of the function maps in the given folder to
+    partition files by the hash of the mangled names, so every occurrence of
+    a mangled name is in the same partition. The number of the partitions is
+    chosen so that a partition fits into MERGE_PARTITION_SIZE. Returns the
+    paths of the partition files. """
+
+    files = glob.glob(os.path.join(fnmap_dir, '*'))
+    total_size = sum(os.path.getsize(f) for f in files)
+    num = min(MAX_MERGE_PARTITIONS,
+              total_size // MERGE_PARTITION_SIZE + 1)
+
+    partitions = [open(os.path.join(partition_dir, str(i)), 'w')
+                  for i in range(num)]
+    try:
+        for line in generate_func_map_lines(fnmap_dir):
+            mangled_name = line.split(' ', 1)[0]
+            part = (zlib.crc32(mangled_name) & 0xffffffff) % num
+            partitions[part].write(line)
+    finally:
+        for partition in partitions:
+            partition.close()
+
+    return [partition.name for partition in partitions]
+
+
+def merge_arch_func_maps(ctu_dir, triple_arch, ctu_func_map_file,
+                         ctu_temp_fnmap_folder):
+    """ Merge the function maps of the translation units of the given triple
+    arch into the global map.
+
+    Only one partition of the function map lines is kept in memory at once.
+    The uniqued partitions are sorted and merged into the global map, so
+    the global map is sorted by the mangled names."""
+
+    fnmap_dir = os.path.join(ctu_dir, triple_arch, ctu_temp_fnmap_folder)
+    partition_dir = tempfile.mkdtemp(dir=os.path.join(ctu_dir, triple_arch))
+    try:
+        partitions = __partition_func_map_lines(fnmap_dir, partition_dir)
+
+        for partition in partitions:
+            with open(partition, 'r') as in_file:
+                mangled_ast_pairs = create_global_ctu_function_map(in_file)
+
+            with open(partition, 'w') as out_file:
+                for mangled_name, ast_file in mangled_ast_pairs:
+                    out_file.write('%s %s\n' % (mangled_name, ast_file))
+
+        sorted_partitions = [open(partition, 'r')
+                             for partition in partitions]
+        try:
+            mangled_ast_pairs = (line.rstrip('\n').split(' ', 1) for line in
+                                 heapq.merge(*sorted_partitions))
+            write_global_map(ctu_dir, triple_arch, ctu_func_map_file,
+                             mangled_ast_pairs)
+        finally:
+            for partition in sorted_partitions:
+                partition.close()
+    finally:
+        shutil.rmtree(partition_dir, ignore_errors=True)
+
 
-def merge_ctu_func_maps(ctu_dir, ctu_func_map_file, ctu_temp_fnmap_folder):
+def _merge_arch_func_maps_worker(args):
+    merge_arch_func_maps(*args)
+
+
+def merge_ctu_func_maps(ctu_dir, ctu_func_map_file, ctu_temp_fnmap_folder,
+                        jobs=1, pool=None):
     """ Merge individual function maps into a global one.
 
     As the collect phase runs parallel on multiple threads, all compilation
@@ -75,30 +239,58 @@ def merge_ctu_func_maps(ctu_dir, ctu_func_map_file, ctu_temp_fnmap_folder):
     These function maps contain the mangled names of functions and the source
     (AST generated from the source) which had them.
     These files should be merged at the end into a global map file:
-    ctu_func_map_file."""
+    ctu_func_map_file. The function maps of the translation units are kept
+    for the later incremental collect phases.
 
-    triple_arches = glob.glob(os.path.join(ctu_dir, '*'))
-    for triple_path in triple_arches:
-        if os.path.isdir(triple_path):
-            triple_arch = os.path.basename(triple_path)
-            fnmap_dir = os.path.join(ctu_dir, triple_arch,
-                                     ctu_temp_fnmap_folder)
+    The function maps of the different triple arches are merged on the given
+    number of processes or on the given process pool in parallel."""
 
-            func_map_lines = generate_func_map_lines(fnmap_dir)
-            mangled_ast_pairs = create_global_ctu_function_map(func_map_lines)
-            write_global_map(ctu_dir, triple_arch, ctu_func_map_file,
-                             mangled_ast_pairs)
+    merge_args = [(ctu_dir, os.path.basename(triple_path), ctu_func_map_file,
+                   ctu_temp_fnmap_folder)
+                  for triple_path in glob.glob(os.path.join(ctu_dir, '*'))
+                  if os.path.isdir(triple_path)]
 
-            # Remove all temporary files
-            shutil.rmtree(fnmap_dir, ignore_errors=True)
+    if pool and len(merge_args) > 1:
+        pool.map(_merge_arch_func_maps_worker, merge_args)
+        return
+
+    if jobs <= 1 or len(merge_args) <= 1:
+        for args in merge_args:
+            merge_arch_func_maps(*args)
+        return
 
+    pool = multiprocessing.Pool(min(jobs, len(merge_args)))
+    try:
+        pool.map(_merge_arch_func_maps_worker, merge_args)
+        pool.close()
+    except Exception:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
 
-def generate_ast(triple_arch, action, source, config, env):
-    """ Generates ASTs for the current compilation command. """
 
-    ast_joined_path = os.path.join(config.ctu_dir, triple_arch, 'ast',
+def get_ast_path(ctu_dir, triple_arch, source):
+    """ Returns the path of the AST file of the given source file. """
+
+    ast_joined_path = os.path.join(ctu_dir, triple_arch, 'ast',
                                    os.path.realpath(source)[1:] + '.ast')
-    ast_path = os.path.abspath(ast_joined_path)
+    return os.path.abspath(ast_joined_path)
+
+
+def get_tu_id(action):
+    """ Returns the file name of the function map and the manifest of the
+    translation unit of the given build action. The same source file may be
+    compiled by multiple build actions, e.g. with different flags. """
+
+    return get_action_key(action)
+
+
+def generate_ast(triple_arch, action, source, config, env):
+    """ Generates ASTs for the current compilation command. Returns True on
+    success. """
+
+    ast_path = get_ast_path(config.ctu_dir, triple_arch, source)
     ast_dir = os.path.dirname(ast_path)
     if not os.path.isdir(ast_dir):
         try:
@@ -118,6 +310,9 @@ def generate_ast(triple_arch, action, source, config, env):
     if ret_code != 0:
         LOG.error("Error generating AST.\n\ncommand:\n\n%s\n\nstderr:\n\n%s",
                   cmdstr, err)
+        return False
+
+    return True
 
 
 def func_map_list_src_to_ast(func_src_list):
@@ -140,7 +335,8 @@ def func_map_list_src_to_ast(func_src_list):
 
 def map_functions(triple_arch, action, source, config, env,
                   func_map_cmd, temp_fnmap_folder):
-    """ Generate function map file for the current source. """
+    """ Generate function map file for the current source. Returns True on
+    success. """
 
     cmd = ctu_triple_arch.get_compile_command(action, config)
     cmd[0] = func_map_cmd
@@ -156,20 +352,164 @@ def map_functions(triple_arch, action, source, config, env,
     if ret_code != 0:
         LOG.error("Error generating function map."
                   "\n\ncommand:\n\n%s\n\nstderr:\n\n%s", cmdstr, err)
-        return
+        return False
 
     func_src_list = stdout.splitlines()
     func_ast_list = func_map_list_src_to_ast(func_src_list)
     extern_fns_map_folder = os.path.join(config.ctu_dir, triple_arch,
                                          temp_fnmap_folder)
-    if not os.path.isdir(extern_fns_map_folder):
+
+    # The function map is written even if it is empty so the later collect
+    # phases know that the source has already been mapped.
+    __write_atomic(os.path.join(extern_fns_map_folder, get_tu_id(action)),
+                   "".join(line + "\n" for line in func_ast_list))
+
+    return True
+
+
+def __write_atomic(file_path, content):
+    """ Write the given content to the file so the parallel workers never see
+    half-written files. """
+
+    folder = os.path.dirname(file_path)
+    if not os.path.isdir(folder):
         try:
-            os.makedirs(extern_fns_map_folder)
+            os.makedirs(folder)
         except OSError:
             pass
 
-    if func_ast_list:
-        with tempfile.NamedTemporaryFile(mode='w',
-                                         dir=extern_fns_map_folder,
-                                         delete=False) as out_file:
-            out_file.write("\n".join(func_ast_list) + "\n")
+    with tempfile.NamedTemporaryFile(mode='w',
+                                     dir=folder,
+                                     delete=False) as out_file:
+        out_file.write(content)
+    os.rename(out_file.name, file_path)
+
+
+def __get_file_id(file_path):
+    """ Returns a string identifying the version of the given file, e.g. of
+    the analyzer binary, because the AST files have to be regenerated if the
+    analyzer binary changes. """
+
+    try:
+        stat = os.stat(file_path)
+        return '{0}:{1}:{2}'.format(file_path, stat.st_mtime, stat.st_size)
+    except OSError:
+        return file_path
+
+
+def get_manifest_key(triple_arch, action, source, config, func_map_cmd):
+    """ Returns the key identifying the commands which generate the AST and
+    the function map of the given translation unit. """
+
+    key_content = [triple_arch,
+                   __get_file_id(config.analyzer_binary),
+                   __get_file_id(func_map_cmd)]
+    key_content.extend(ctu_triple_arch.get_compile_command(action, config,
+                                                           source))
+
+    key_str = '\0'.join(key_content)
+    return hashlib.sha256(key_str.encode(errors='ignore')).hexdigest()
+
+
+def __get_manifest_path(ctu_dir, triple_arch, action):
+    return os.path.join(ctu_dir, triple_arch, MANIFEST_FOLDER,
+                        get_tu_id(action) + '.json')
+
+
+def is_up_to_date(triple_arch, action, source, config, func_map_cmd,
+                  temp_fnmap_folder):
+    """ Returns True if the AST and the function map of the given translation
+    unit have been generated by a previous collect phase and neither the
+    commands nor the files of the translation unit have changed since. The
+    AST file of the source file is shared by the build actions compiling it,
+    so it must not have been regenerated by another build action since. """
+
+    manifest_path = __get_manifest_path(config.ctu_dir, triple_arch, action)
+    if not os.path.exists(manifest_path):
+        return False
+
+    manifest = load_json_or_empty(manifest_path, {}, 'CTU manifest')
+    if manifest.get('key') != get_manifest_key(triple_arch, action, source,
+                                               config, func_map_cmd):
+        return False
+
+    fnmap_file = os.path.join(config.ctu_dir, triple_arch, temp_fnmap_folder,
+                              get_tu_id(action))
+    ast_path = get_ast_path(config.ctu_dir, triple_arch, source)
+    if not os.path.exists(fnmap_file) or not os.path.exists(ast_path) or \
+            manifest.get('ast') != __get_file_id(ast_path):
+        return False
+
+    return analysis_cache.is_unchanged(manifest.get('files', {}))
+
+
+def write_manifest(triple_arch, action, source, config, func_map_cmd):
+    """ Store the manifest of the translation unit after its AST and function
+    map have been generated. Nothing is stored if the files of the
+    translation unit can not be collected, so it is regenerated next time. """
+
+    dependencies = analysis_cache.get_tu_dependencies(action)
+    if not dependencies:
+        return
+
+    file_hashes = analysis_cache.hash_files(dependencies)
+    if file_hashes is None:
+        return
+
+    manifest = {'key': get_manifest_key(triple_arch, action, source, config,
+                                        func_map_cmd),
+                'source': source,
+                'ast': __get_file_id(get_ast_path(config.ctu_dir, triple_arch,
+                                                  source)),
+                'files': file_hashes}
+
+    __write_atomic(__get_manifest_path(config.ctu_dir, triple_arch, action),
+                   json.dumps(manifest))
+
+
+def remove_stale_tus(ctu_dir, temp_fnmap_folder, collected):
+    """ Remove the function maps, manifests and AST files of the translation
+    units which were not collected in the current collect phase, e.g. because
+    they have been removed from the build. collected is a set of
+    (triple arch, source file, translation unit id) tuples. The AST files
+    of the collected source files are kept, even if they are shared with a
+    removed translation unit. Returns True if anything was removed. """
+
+    collected_ids = set((triple_arch, tu_id)
+                        for triple_arch, _, tu_id in collected)
+    collected_asts = set(get_ast_path(ctu_dir, triple_arch, source)
+                         for triple_arch, source, _ in collected)
+
+    removed = False
+    for triple_path in glob.glob(os.path.join(ctu_dir, '*')):
+        if not os.path.isdir(triple_path):
+            continue
+
+        triple_arch = os.path.basename(triple_path)
+        fnmap_dir = os.path.join(triple_path, temp_fnmap_folder)
+        for fnmap_file in glob.glob(os.path.join(fnmap_dir, '*')):
+            tu_id = os.path.basename(fnmap_file)
+            if (triple_arch, tu_id) in collected_ids:
+                continue
+
+            manifest_path = os.path.join(triple_path, MANIFEST_FOLDER,
+                                         tu_id + '.json')
+            source = load_json_or_empty(manifest_path, {}).get('source') \
+                if os.path.exists(manifest_path) else None
+
+            LOG.debug("Removing CTU data of %s", source or tu_id)
+            stale_files = [fnmap_file, manifest_path]
+            if source:
+                ast_path = get_ast_path(ctu_dir, triple_arch, source)
+                if ast_path not in collected_asts:
+                    stale_files.append(ast_path)
+
+            for stale_file in stale_files:
+                try:
+                    os.remove(stale_file)
+                except OSError:
+                    pass
+
+            removed = True
+
+    return removed
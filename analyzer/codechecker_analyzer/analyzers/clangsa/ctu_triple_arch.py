@@ -10,10 +10,27 @@ from __future__ import print_function
 from __future__ import division
 from __future__ import absolute_import
 
+import hashlib
+import json
+import os
+import tempfile
+
+from codechecker_common.logger import get_logger
+from codechecker_common.util import load_json_or_empty
+
 from .. import analyzer_base
 from ..flag import has_flag
 from ..flag import prepend_all
 
+LOG = get_logger('analyzer')
+
+# The triple arch of the compilation commands is stored in this file of the
+# CTU directory, so the later analysis phases don't have to query it again.
+TRIPLE_ARCH_CACHE_FILE = 'triple_arch_cache.json'
+
+# Triple arch caches of the CTU directories loaded by this process.
+__loaded_caches = {}
+
 
 def get_compile_command(action, config, source='', output=''):
     """ Generate a standardized and cleaned compile command serving as a base
@@ -62,9 +79,93 @@ def _find_arch_in_command(output):
         pass
 
 
-def get_triple_arch(action, source, config, env):
+def __get_arch_flags(options):
+    """ Return the flags of the given compiler options which may affect the
+    target triple. """
+    arch_flags = []
+    it = iter(options)
+    for option in it:
+        if option in ['-target', '-arch']:
+            arch_flags.extend([option, next(it, '')])
+        elif option.startswith(('--target', '-target=', '-m')):
+            arch_flags.append(option)
+
+    return arch_flags
+
+
+def get_triple_arch_key(action, config):
+    """ Return the key of the triple arch cache for the given compilation
+    command. The key consists of the analyzer binary, the target and the
+    compiler flags which may affect the target triple. """
+    binary = os.path.realpath(config.analyzer_binary)
+    try:
+        binary_mtime = str(os.stat(binary).st_mtime)
+    except OSError:
+        binary_mtime = ''
+
+    key_content = [binary, binary_mtime, action.target.get(action.lang, '')]
+    key_content.extend(__get_arch_flags(config.analyzer_extra_arguments))
+    key_content.extend(__get_arch_flags(action.analyzer_options))
+
+    key_str = '\0'.join(key_content)
+    return hashlib.sha1(key_str.encode(errors='ignore')).hexdigest()
+
+
+def load_triple_arch_cache(ctu_dir):
+    """ Return the triple arch cache stored in the given CTU directory. The
+    cache is read again by a process only if the cache file has changed
+    since this process read it, e.g. when the pre-analysis stored it after
+    the worker processes had been started. """
+    cache_file = os.path.join(ctu_dir, TRIPLE_ARCH_CACHE_FILE)
+    try:
+        stat = os.stat(cache_file)
+        version = (stat.st_ino, stat.st_mtime, stat.st_size)
+    except OSError:
+        # A missing cache file is not cached, so the cache is loaded when
+        # the file is created later.
+        return {}
+
+    loaded = __loaded_caches.get(ctu_dir)
+    if loaded is None or loaded[0] != version:
+        loaded = (version,
+                  load_json_or_empty(cache_file, {}, 'triple arch cache'))
+        __loaded_caches[ctu_dir] = loaded
+
+    return loaded[1]
+
+
+def store_triple_arch_cache(ctu_dir, cache):
+    """ Store the given triple arch cache in the CTU directory. """
+    try:
+        if not os.path.isdir(ctu_dir):
+            os.makedirs(ctu_dir)
+
+        fd, tmp_file = tempfile.mkstemp(dir=ctu_dir)
+        with os.fdopen(fd, 'w') as cache_file:
+            json.dump(cache, cache_file)
+        os.rename(tmp_file, os.path.join(ctu_dir, TRIPLE_ARCH_CACHE_FILE))
+    except (IOError, OSError) as ex:
+        LOG.debug("Failed to store the triple arch cache: %s", ex)
+        return
+
+    __loaded_caches.pop(ctu_dir, None)
+
+
+def get_triple_arch(action, source, config, env, cache=None):
     """Returns the architecture part of the target triple for the given
-    compilation command. """
+    compilation command.
+
+    cache -- A dict (or a dict proxy of a multiprocessing manager) which is
+             used to look up and store the triple arch of the compilation
+             commands by get_triple_arch_key(). The arch is queried from the
+             analyzer only if it is not found in the cache.
+    """
+    key = None
+    if cache is not None:
+        key = get_triple_arch_key(action, config)
+        triple_arch = cache.get(key)
+        if triple_arch is not None:
+            return triple_arch
 
     cmd = get_compile_command(action, config, source)
     cmd.insert(1, '-###')
@@ -75,4 +176,9 @@ def get_triple_arch(action, source, config, env):
     # The -### flag in a Clang invocation emits the commands of substeps in a
     # build process (compilation phase, link phase, etc.). If there is -c flag
     # in the build command then there is no linking.
-    return _find_arch_in_command(stdout + stderr) or ""
+    triple_arch = _find_arch_in_command(stdout + stderr) or ""
+
+    if key is not None and triple_arch:
+        cache[key] = triple_arch
+
+    return triple_arch
@@ -16,6 +16,7 @@ try:
 except ImportError:
     from io import BytesIO as StringIO
 from collections import defaultdict
+import multiprocessing
 import os
 import re
 
@@ -101,6 +102,9 @@ class SpecialReturnValueCollector(object):
     # Checker name which runs the analysis.
     checker_analyze = 'statisticsbased.SpecialReturnValue'
 
+    # Only the lines containing this text are matched by the regex.
+    line_marker = 'warning: Special Return Value:'
+
     def __init__(self, stats_min_sample_count,
                  stats_relevance_threshold):
 
@@ -152,6 +156,9 @@ class SpecialReturnValueCollector(object):
         """
         Match regex on the line
         """
+        if self.line_marker not in line:
+            return
+
         m = self.special_ret_val_regexp.match(line)
         if m:
             func = m.group(1)
@@ -162,6 +169,15 @@ class SpecialReturnValueCollector(object):
             self.stats['nof_negative'][func] += int(ret_negative)
             self.stats['nof_null'][func] += int(ret_null)
 
+    def merge(self, other):
+        """
+        Add the statistics collected by the other collector to the
+        statistics of this collector.
+        """
+        for stat, counts in other.stats.items():
+            for func, count in counts.items():
+                self.stats[stat][func] += count
+
     def filter_stats(self):
 
         neg = []
@@ -213,6 +229,9 @@ class ReturnValueCollector(object):
     # Checker name which runs the analysis.
     checker_analyze = 'statisticsbased.UncheckedReturnValue'
 
+    # Only the lines containing this text are matched by the regex.
+    line_marker = 'warning: Return Value Check:'
+
     def __init__(self, stats_min_sample_count,
                  stats_relevance_threshold):
 
@@ -261,6 +280,9 @@ class ReturnValueCollector(object):
         """
         Match regex on the line
         """
+        if self.line_marker not in line:
+            return
+
         m = self.ret_val_regexp.match(line)
         if m:
             func = m.group(1)
@@ -268,6 +290,15 @@ class ReturnValueCollector(object):
             self.stats['total'][func] += 1
             self.stats['nof_unchecked'][func] += int(checked)
 
+    def merge(self, other):
+        """
+        Add the statistics collected by the other collector to the
+        statistics of this collector.
+        """
+        for stat, counts in other.stats.items():
+            for func, count in counts.items():
+                self.stats[stat][func] += count
+
     def filter_stats(self):
         """
         Filter the collected statistics based on the threshold.
@@ -298,12 +329,40 @@ class ReturnValueCollector(object):
         return stats_yaml.getvalue()
 
 
+def collect_shard(params):
+    """
+    Collect the statistics from the given clang analyzer output files.
+    The files are read line by line and only the collector states are kept
+    in memory. Returns the return value and special return value collectors
+    which can be merged with the collectors of the other shards.
+    """
+    clang_outs, stats_min_sample_count, stats_relevance_threshold = params
+
+    ret_collector = ReturnValueCollector(stats_min_sample_count,
+                                         stats_relevance_threshold)
+    special_ret_collector =\
+        SpecialReturnValueCollector(stats_min_sample_count,
+                                    stats_relevance_threshold)
+
+    for clang_output in clang_outs:
+        with open(clang_output, 'r') as out:
+            for line in out:
+                ret_collector.process_line(line)
+                special_ret_collector.process_line(line)
+
+    return ret_collector, special_ret_collector
+
+
 def postprocess_stats(clang_output_dir, stats_dir, stats_min_sample_count,
-                      stats_relevance_threshold):
+                      stats_relevance_threshold, jobs=1, pool=None):
     """
     Read the clang analyzer outputs where the statistics emitter checkers
     were enabled and collect the statistics.
 
+    The output files are split into shards which are processed on jobs
+    number of processes, and the statistics of the shards are merged. If a
+    process pool is given, the shards are processed on that pool.
+
     After the statistics collection cleanup the output files.
     """
 
@@ -338,13 +397,39 @@ def postprocess_stats(clang_output_dir, stats_dir, stats_min_sample_count,
         SpecialReturnValueCollector(stats_min_sample_count,
                                     stats_relevance_threshold)
 
-    for clang_output in clang_outs:
-        with open(clang_output, 'r') as out:
-            clang_output = ""
-            for line in out:
-                clang_output += line + "\n"
-                ret_collector.process_line(line)
-                special_ret_collector.process_line(line)
+    # More shards than processes, so the processes are kept busy even if
+    # the output files differ in size.
+    shard_count = min(len(clang_outs), max(jobs, 1) * 4)
+    shards = [(clang_outs[i::shard_count],
+               stats_min_sample_count,
+               stats_relevance_threshold) for i in range(shard_count)]
+
+    if pool and shard_count > 1:
+        for shard_ret_collector, shard_special_ret_collector \
+                in pool.imap_unordered(collect_shard, shards):
+            ret_collector.merge(shard_ret_collector)
+            special_ret_collector.merge(shard_special_ret_collector)
+    elif jobs > 1 and shard_count > 1:
+        pool = multiprocessing.Pool(min(jobs, shard_count))
+        try:
+            shard_results = pool.imap_unordered(collect_shard, shards)
+            for shard_ret_collector, shard_special_ret_collector \
+                    in shard_results:
+                ret_collector.merge(shard_ret_collector)
+                special_ret_collector.merge(shard_special_ret_collector)
+            pool.close()
+        except Exception:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+    else:
+        for shard in shards:
+            shard_ret_collector, shard_special_ret_collector = \
+                collect_shard(shard)
+            ret_collector.merge(shard_ret_collector)
+            special_ret_collector.merge(shard_special_ret_collector)
+
     LOG.debug("Collecting statistics finished.")
 
     # Write out statistics.
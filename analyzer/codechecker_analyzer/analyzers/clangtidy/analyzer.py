@@ -20,6 +20,7 @@ from codechecker_analyzer import host_check
 from codechecker_analyzer import env
 
 from .. import analyzer_base
+from .. import analyzer_info_cache
 from ..flag import has_flag
 from ..flag import prepend_all
 from ..clangsa.analyzer import ClangSA
@@ -67,15 +68,21 @@ class ClangTidy(analyzer_base.SourceAnalyzer):
         """
         analyzer_binary = cfg_handler.analyzer_binary
 
-        command = [analyzer_binary, "-list-checks", "-checks='*'"]
+        def list_checkers():
+            command = [analyzer_binary, "-list-checks", "-checks='*'"]
 
-        try:
-            command = shlex.split(' '.join(command))
-            result = subprocess.check_output(command, env=environ,
-                                             universal_newlines=True)
-            return parse_checkers(result)
-        except (subprocess.CalledProcessError, OSError):
-            return []
+            try:
+                command = shlex.split(' '.join(command))
+                result = subprocess.check_output(command, env=environ,
+                                                 universal_newlines=True)
+                return parse_checkers(result)
+            except (subprocess.CalledProcessError, OSError):
+                return None
+
+        checkers = analyzer_info_cache.get(analyzer_binary, 'checkers',
+                                           list_checkers)
+
+        return [tuple(checker) for checker in checkers or []]
 
     def construct_analyzer_cmd(self, result_handler):
         """
@@ -168,9 +175,6 @@ class ClangTidy(analyzer_base.SourceAnalyzer):
         mentioned in the standard output or standard error.
         """
 
-        if not output:
-            return set()
-
         # A line mentioning a file in Clang-Tidy's output looks like this:
         # /home/.../.cpp:L:C: warning: foobar.
         regex = re.compile(
@@ -183,7 +187,7 @@ class ClangTidy(analyzer_base.SourceAnalyzer):
 
         paths = []
 
-        for line in output.splitlines():
+        for line in output:
             match = re.match(regex, line)
             if match:
                 paths.append(match.group('path'))
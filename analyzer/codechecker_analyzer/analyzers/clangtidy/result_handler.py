@@ -22,7 +22,8 @@ LOG = get_logger('report')
 
 def generate_plist_from_tidy_result(output_file, tidy_stdout):
     """
-    Generate a plist file from the clang tidy analyzer results.
+    Generate a plist file from the clang tidy analyzer results. The output
+    of clang tidy is an iterable of lines which is consumed as a stream.
     """
     parser = output_converter.OutputParser()
 
@@ -45,8 +46,8 @@ class ClangTidyPlistToFile(ResultHandler):
         results which can be stored into the database.
         """
         output_file = self.analyzer_result_file
-        LOG.debug_analyzer(self.analyzer_stdout)
-        tidy_stdout = self.analyzer_stdout.splitlines()
+        tidy_stdout = self.analyzer_stdout_spool.lines() \
+            if self.analyzer_stdout_spool else []
         generate_plist_from_tidy_result(output_file, tidy_stdout)
 
         if self.report_hash_type == 'context-free':
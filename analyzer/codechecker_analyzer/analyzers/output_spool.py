@@ -0,0 +1,146 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Spool the standard outputs of the analyzer processes into temporary files,
+so the memory usage of the analysis workers does not depend on how much
+output the analyzers produce.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+
+from codechecker_common.logger import get_logger
+
+LOG = get_logger('analyzer')
+
+# Environment variable which can be used to change how many bytes of an
+# analyzer output are read into the memory at most (e.g. to be logged).
+MEMORY_LIMIT_ENV_VAR = 'CC_ANALYZER_OUTPUT_MEMORY_LIMIT'
+
+DEFAULT_MEMORY_LIMIT = 1 << 20
+
+
+def get_memory_limit():
+    """
+    Return the number of bytes of an analyzer output which are read into the
+    memory at most.
+    """
+    memory_limit = os.environ.get(MEMORY_LIMIT_ENV_VAR)
+    if memory_limit is None:
+        return DEFAULT_MEMORY_LIMIT
+
+    try:
+        return int(memory_limit)
+    except ValueError:
+        LOG.warning("Invalid value of %s: '%s'", MEMORY_LIMIT_ENV_VAR,
+                    memory_limit)
+        return DEFAULT_MEMORY_LIMIT
+
+
+class OutputSpool(object):
+    """
+    An output of a process stored in a temporary file. The process writes
+    the file directly, so the output is never buffered in the memory.
+
+    The spool can be pickled after it is closed, so it can be passed to the
+    postprocessing processes. The temporary file has to be removed by
+    remove().
+    """
+
+    def __init__(self, memory_limit=None):
+        self.memory_limit = get_memory_limit() if memory_limit is None \
+            else memory_limit
+
+        fd, self.path = tempfile.mkstemp(prefix='codechecker_output_')
+        self.__file = os.fdopen(fd, 'w')
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_OutputSpool__file'] = None
+        return state
+
+    def fileno(self):
+        """
+        Return the file descriptor of the temporary file, so the spool can be
+        given as the output of a subprocess.
+        """
+        return self.__file.fileno()
+
+    def close(self):
+        """
+        Close the temporary file after the process has finished writing it.
+        """
+        if self.__file:
+            self.__file.close()
+            self.__file = None
+
+    def size(self):
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def read(self):
+        """
+        Return the output. If the output is longer than the memory limit,
+        only the beginning of it is returned with a note.
+        """
+        try:
+            with open(self.path, 'r') as output:
+                text = output.read(self.memory_limit)
+        except IOError:
+            return ''
+
+        omitted = self.size() - len(text)
+        if omitted > 0:
+            text += "\n>>> CodeChecker: {0} more bytes of the output are " \
+                    "omitted. <<<\n".format(omitted)
+
+        return text
+
+    def lines(self):
+        """
+        Iterate over the lines of the whole output.
+        """
+        try:
+            with open(self.path, 'r') as output:
+                for line in output:
+                    yield line
+        except IOError:
+            return
+
+    def save(self, path):
+        """
+        Copy the whole output to the given file.
+        """
+        shutil.copyfile(self.path, path)
+
+    def prepend(self, text):
+        """
+        Insert the given text before the output.
+        """
+        fd, tmp_path = tempfile.mkstemp(prefix='codechecker_output_',
+                                        dir=os.path.dirname(self.path))
+        with os.fdopen(fd, 'w') as new_output:
+            new_output.write(text)
+            with open(self.path, 'r') as output:
+                shutil.copyfileobj(output, new_output)
+
+        os.rename(tmp_path, self.path)
+
+    def remove(self):
+        """
+        Remove the temporary file.
+        """
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
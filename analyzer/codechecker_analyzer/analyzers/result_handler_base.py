@@ -52,8 +52,9 @@ class ResultHandler(object):
         self.__workspace = workspace
 
         self.analyzer_cmd = []
-        self.analyzer_stdout = ''
-        self.analyzer_stderr = ''
+        # The outputs of the analyzer (see OutputSpool).
+        self.analyzer_stdout_spool = None
+        self.analyzer_stderr_spool = None
         self.severity_map = {}
         self.skiplist_handler = None
         self.analyzed_source_file = None
@@ -67,6 +68,34 @@ class ResultHandler(object):
         # report id (hash) values.
         self.report_hash_type = report_hash_type
 
+    @property
+    def analyzer_stdout(self):
+        """
+        The standard output of the analyzer, which is truncated if it is
+        longer than the memory limit of the output spool.
+        """
+        if not self.analyzer_stdout_spool:
+            return ''
+        return self.analyzer_stdout_spool.read()
+
+    @property
+    def analyzer_stderr(self):
+        """
+        The standard error of the analyzer, which is truncated if it is
+        longer than the memory limit of the output spool.
+        """
+        if not self.analyzer_stderr_spool:
+            return ''
+        return self.analyzer_stderr_spool.read()
+
+    def remove_output(self):
+        """
+        Remove the spooled outputs of the analyzer.
+        """
+        for spool in [self.analyzer_stdout_spool, self.analyzer_stderr_spool]:
+            if spool:
+                spool.remove()
+
     @property
     def buildaction(self):
         """
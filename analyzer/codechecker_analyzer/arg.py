@@ -51,3 +51,47 @@ class OrderedCheckersAction(argparse.Action):
         ordered_checkers.append((value, self.dest == 'enable'))
 
         namespace.ordered_checkers = ordered_checkers
+
+
+def memory_size(value):
+    """
+    Argument type for memory sizes given in bytes or with a K, M, G or T
+    suffix. The size is returned in bytes.
+    """
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30, 'T': 1 << 40}
+
+    multiplier = 1
+    size = value.strip().upper()
+    if size and size[-1] in units:
+        multiplier = units[size[-1]]
+        size = size[:-1]
+
+    try:
+        size = float(size)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "Invalid memory size '{0}'. It should be given in bytes or with "
+            "a K, M, G or T suffix, e.g. 16G.".format(value))
+
+    if size <= 0:
+        raise argparse.ArgumentTypeError(
+            "The memory size must be positive.")
+
+    return int(size * multiplier)
+
+
+def positive_float(value):
+    """
+    Argument type for positive real numbers.
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "Invalid number '{0}'.".format(value))
+
+    if number <= 0:
+        raise argparse.ArgumentTypeError(
+            "The number must be positive.")
+
+    return number
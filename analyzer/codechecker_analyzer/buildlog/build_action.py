@@ -8,6 +8,8 @@ from __future__ import print_function
 from __future__ import division
 from __future__ import absolute_import
 
+import hashlib
+
 
 class BuildAction(object):
     """
@@ -81,3 +83,22 @@ class BuildAction(object):
         details = {key: getattr(self, key) for key in BuildAction.__slots__}
         details[attr] = value
         return BuildAction(**details)
+
+
+def get_action_key(action):
+    """
+    Return the key of the given build action which identifies it across the
+    analysis runs, e.g. in the analysis history and the analysis journal.
+    The same command run in different directories gives different keys.
+    """
+    hasher = hashlib.md5()
+    for part in [action.analyzer_type, action.directory, action.source,
+                 action.original_command]:
+        # The parts are hashed as bytes, so the non-ASCII byte strings are
+        # not decoded.
+        if not isinstance(part, bytes):
+            part = part.encode('utf-8', 'ignore')
+        hasher.update(part)
+        hasher.update(b'\0')
+
+    return hasher.hexdigest()
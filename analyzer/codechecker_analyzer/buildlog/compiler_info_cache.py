@@ -0,0 +1,111 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+User level cache of the implicit compiler information (include paths, target
+and default standard) which is shared by every analysis run of the user.
+
+A cache entry is identified by the real path of the compiler binary, the
+modification time, size and inode of the binary and the compiler flags which
+affect the implicit information, so an entry is not used after the compiler
+has been reinstalled.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from distutils.spawn import find_executable
+import hashlib
+import json
+import os
+import tempfile
+
+from codechecker_common.logger import get_logger
+from codechecker_common.util import load_json_or_empty
+
+LOG = get_logger('buildlogger')
+
+# Environment variable which can be used to change the location of the
+# cache. The cache is disabled if it is set to an empty string.
+CACHE_DIR_ENV_VAR = 'CC_COMPILER_INFO_CACHE_DIR'
+
+
+def get_default_cache_dir():
+    """
+    Return the directory of the cache or None if the cache is disabled.
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENV_VAR)
+    if cache_dir is not None:
+        return cache_dir or None
+
+    return os.path.join(os.path.expanduser('~'), '.codechecker',
+                        'compiler_info')
+
+
+def get_key(compiler, extra_opts):
+    """
+    Return the cache key of the given compiler invoked with the given flags
+    or None if the compiler binary can not be found.
+    """
+    compiler_path = find_executable(compiler)
+    if not compiler_path:
+        return None
+
+    compiler_path = os.path.realpath(compiler_path)
+    try:
+        stat = os.stat(compiler_path)
+    except OSError:
+        return None
+
+    key_content = [compiler_path, str(stat.st_mtime), str(stat.st_size),
+                   str(stat.st_ino)]
+    key_content.extend(extra_opts)
+
+    key_str = '\0'.join(key_content)
+    return hashlib.sha256(key_str.encode(errors='ignore')).hexdigest()
+
+
+class CompilerInfoCache(object):
+    """
+    Implicit compiler information stored in the given directory, one file per
+    compiler configuration.
+    """
+
+    def __init__(self, cache_dir):
+        self.__cache_dir = cache_dir
+
+    def __entry_path(self, key):
+        return os.path.join(self.__cache_dir, key + '.json')
+
+    def get(self, key):
+        """
+        Return the compiler information stored with the given key or None.
+        """
+        entry = self.__entry_path(key)
+        if not os.path.exists(entry):
+            return None
+
+        return load_json_or_empty(entry, None, 'compiler info cache')
+
+    def store(self, key, compiler_info):
+        """
+        Store the compiler information with the given key.
+        """
+        try:
+            if not os.path.isdir(self.__cache_dir):
+                os.makedirs(self.__cache_dir)
+        except OSError:
+            # The directory may be created by another process.
+            pass
+
+        try:
+            # Rename the written file so the concurrent analysis runs never
+            # see half-written entries.
+            fd, tmp_entry = tempfile.mkstemp(dir=self.__cache_dir)
+            with os.fdopen(fd, 'w') as entry:
+                json.dump(compiler_info, entry)
+            os.rename(tmp_entry, self.__entry_path(key))
+        except (IOError, OSError) as ex:
+            LOG.debug("Failed to store compiler info cache entry: %s", ex)
@@ -9,7 +9,11 @@ from __future__ import absolute_import
 
 from collections import defaultdict
 from distutils.spawn import find_executable
+from itertools import islice
+from multiprocessing.pool import ThreadPool
+import io
 import json
+import multiprocessing
 import os
 import re
 import shlex
@@ -22,6 +26,7 @@ from codechecker_common.logger import get_logger
 from codechecker_common.util import load_json_or_empty
 
 from .. import gcc_toolchain
+from . import compiler_info_cache
 from .build_action import BuildAction
 
 LOG = get_logger('buildlogger')
@@ -430,6 +435,70 @@ class ImplicitCompilerInfo(object):
 
         return standard
 
+    @staticmethod
+    def detect_compiler_info(compiler, compiler_flags):
+        """
+        Invoke the compiler to gather the implicit compiler information for C
+        and C++. The compiler invocations run concurrently.
+        """
+        ICI = ImplicitCompilerInfo
+
+        pool = ThreadPool(5)
+        try:
+            c_includes = pool.apply_async(
+                ICI.get_compiler_includes, (compiler, ICI.c(), compiler_flags))
+            cpp_includes = pool.apply_async(
+                ICI.get_compiler_includes,
+                (compiler, ICI.cpp(), compiler_flags))
+            target = pool.apply_async(ICI.get_compiler_target, (compiler,))
+            c_standard = pool.apply_async(
+                ICI.get_compiler_standard, (compiler, ICI.c()))
+            cpp_standard = pool.apply_async(
+                ICI.get_compiler_standard, (compiler, ICI.cpp()))
+
+            compiler_info = defaultdict(dict)
+            compiler_info[ICI.c()] = {
+                'compiler_includes': c_includes.get(),
+                'target': target.get(),
+                'compiler_standard': c_standard.get()}
+            compiler_info[ICI.cpp()] = {
+                'compiler_includes': cpp_includes.get(),
+                'target': target.get(),
+                'compiler_standard': cpp_standard.get()}
+        finally:
+            pool.close()
+            pool.join()
+
+        return compiler_info
+
+    @staticmethod
+    def get_cached_compiler_info(compiler, compiler_flags):
+        """
+        Return the implicit compiler information from the user level compiler
+        info cache or detect and store it if it is not cached yet.
+        """
+        ICI = ImplicitCompilerInfo
+
+        cache_dir = compiler_info_cache.get_default_cache_dir()
+        key = None
+        if cache_dir:
+            extra_opts = filter_compiler_includes_extra_args(compiler_flags)
+            key = compiler_info_cache.get_key(compiler, extra_opts)
+
+        if key:
+            cache = compiler_info_cache.CompilerInfoCache(cache_dir)
+            compiler_info = cache.get(key)
+            if compiler_info:
+                LOG.debug("Using cached compiler info of %s", compiler)
+                return defaultdict(dict, compiler_info)
+
+        compiler_info = ICI.detect_compiler_info(compiler, compiler_flags)
+
+        if key:
+            cache.store(key, compiler_info)
+
+        return compiler_info
+
     @staticmethod
     def load_compiler_info(filename, compiler):
         """Load compiler information from a file."""
@@ -491,25 +560,9 @@ class ImplicitCompilerInfo(object):
             # Independently of the actual compilation language in the
             # compile command collect the iformation for C and C++.
             if not ICI.compiler_info.get(compiler):
-                ICI.compiler_info[compiler] = defaultdict(dict)
-
-                # Collect for C
-                ICI.compiler_info[compiler][ICI.c()]['compiler_includes'] = \
-                    ICI.get_compiler_includes(compiler, ICI.c(),
-                                              details['analyzer_options'])
-                ICI.compiler_info[compiler][ICI.c()]['target'] = \
-                    ICI.get_compiler_target(compiler)
-                ICI.compiler_info[compiler][ICI.c()]['compiler_standard'] = \
-                    ICI.get_compiler_standard(compiler, ICI.c())
-
-                # Collect for C++
-                ICI.compiler_info[compiler][ICI.cpp()]['compiler_includes'] = \
-                    ICI.get_compiler_includes(compiler, ICI.cpp(),
-                                              details['analyzer_options'])
-                ICI.compiler_info[compiler][ICI.cpp()]['target'] = \
-                    ICI.get_compiler_target(compiler)
-                ICI.compiler_info[compiler][ICI.cpp()]['compiler_standard'] = \
-                    ICI.get_compiler_standard(compiler, ICI.cpp())
+                ICI.compiler_info[compiler] = \
+                    ICI.get_cached_compiler_info(compiler,
+                                                 details['analyzer_options'])
 
         def set_details_from_ICI(key, lang):
             """Set compiler related information in the 'details' dictionary.
@@ -929,13 +982,242 @@ class CompileActionUniqueingType(object):
     STRICT = 3  # Gives error in case of duplicate
 
 
+# Whitespace between the tokens of a JSON document.
+JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def iter_compilation_database(log_file, chunk_size=1 << 16):
+    """
+    Generator which yields the entries of the given JSON compilation database
+    file one by one. The file is read in chunks and only the currently parsed
+    entry is kept in memory, so huge compilation databases can be processed
+    without loading them as a whole.
+
+    ValueError is raised if the file is not a valid JSON array.
+    """
+    decoder = json.JSONDecoder()
+
+    with io.open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
+        # The entries are parsed from the current position of the buffer.
+        # The parsed part of the buffer is dropped only when the next chunk
+        # is read, so the rest of the buffer is not copied after every entry.
+        buf = u''
+        pos = 0
+        eof = False
+
+        # Characters which may follow in the current position besides an
+        # entry: the opening bracket, the end of the array after the opening
+        # bracket and the separator or the end of the array after an entry.
+        expect = u'['
+        entry_allowed = False
+
+        while True:
+            pos = JSON_WHITESPACE.match(buf, pos).end()
+            if pos == len(buf):
+                if eof:
+                    raise ValueError("Unexpected end of compilation "
+                                     "database.")
+
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buf = chunk
+                pos = 0
+                continue
+
+            char = buf[pos]
+            if char in expect:
+                if char == u']':
+                    return
+
+                entry_allowed = True
+                expect = u']' if char == u'[' else u''
+                pos += 1
+                continue
+
+            if not entry_allowed:
+                raise ValueError("Expected one of '{0}' in compilation "
+                                 "database, found '{1}'."
+                                 .format(expect, char))
+
+            try:
+                entry, end = decoder.raw_decode(buf, pos)
+            except ValueError:
+                if eof:
+                    raise
+
+                # The entry is not complete yet, read further. At least as
+                # much as the incomplete entry is read, so a huge entry is
+                # not parsed again after every chunk.
+                chunk = f.read(max(chunk_size, len(buf) - pos))
+                eof = not chunk
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+
+            yield entry
+            pos = end
+            expect = u',]'
+            entry_allowed = False
+
+
+# Compilers of which the implicit information has already been sent to the
+# parent process by the current parser worker.
+_reported_compilers = set()
+
+
+def _parse_entry(args):
+    """
+    Parse a compilation database entry in a parser worker process. Returns
+    the build action and the implicit information of the compilers which has
+    not been sent to the parent process before.
+    """
+    entry, compiler_info_file, keep_gcc_fix_headers = args
+
+    action = parse_options(entry, compiler_info_file, keep_gcc_fix_headers)
+
+    compiler_info = {}
+    for compiler, info in ImplicitCompilerInfo.get().items():
+        if compiler not in _reported_compilers:
+            _reported_compilers.add(compiler)
+            compiler_info[compiler] = dict(info)
+
+    return action, compiler_info
+
+
+def _parse_entries(entries, compiler_info_file, keep_gcc_fix_headers, jobs):
+    """
+    Generator which yields the build actions of the given compilation
+    database entries in their original order. The entries are parsed on the
+    given number of processes. Only a batch of entries is handed to the
+    processes at once, so the entries are read from the input iterable
+    gradually.
+    """
+    if jobs <= 1:
+        for entry in entries:
+            yield parse_options(entry, compiler_info_file,
+                                keep_gcc_fix_headers)
+        return
+
+    ICI = ImplicitCompilerInfo
+    batch_size = jobs * 256
+    pool = multiprocessing.Pool(jobs)
+    try:
+        while True:
+            batch = [(entry, compiler_info_file, keep_gcc_fix_headers)
+                     for entry in islice(entries, batch_size)]
+            if not batch:
+                break
+
+            for action, compiler_info in pool.imap(_parse_entry, batch,
+                                                   chunksize=32):
+                for compiler, info in compiler_info.items():
+                    if not ICI.compiler_info.get(compiler):
+                        ICI.compiler_info[compiler] = \
+                            defaultdict(dict, info)
+
+                yield action
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+PATH_OPTIONS = re.compile('(-I|-isystem|-iquote|-idirafter|-include|'
+                          '--include=|-imacros|-isysroot|--sysroot=)(.*)$')
+
+INCLUDE_PATH_OPTIONS = ('-I', '-isystem', '-iquote', '-idirafter')
+
+
+def __canonical_options(options, directory):
+    """
+    Return the given analyzer options in a canonical form: the parameters of
+    the flags given separately are merged into the flags, the relative paths
+    of the include and sysroot flags are made absolute and the repeated
+    include paths are removed as the compiler ignores them.
+
+    The returned flag is True if an option is kept which may still refer
+    to a path relative to the given working directory.
+    """
+    canonical = []
+    relative = False
+    it = iter(options)
+    for option in it:
+        m = COMPILE_OPTIONS_MERGED.match(option)
+        if m and m.group(0) == option:
+            param = next(it, '')
+            option = option + ('=' if option.startswith('--') else '') + \
+                param
+
+        m = PATH_OPTIONS.match(option)
+        if m and m.group(2):
+            option = m.group(1) + \
+                os.path.normpath(os.path.join(directory, m.group(2)))
+
+            if option.startswith(INCLUDE_PATH_OPTIONS) \
+                    and option in canonical:
+                continue
+        elif not option.startswith('-') or option.startswith('-fplugin') \
+                or option.startswith('-fprofile'):
+            relative = relative or not os.path.isabs(option.split('=')[-1])
+
+        canonical.append(option)
+
+    return canonical, relative
+
+
+def get_canonical_key(action):
+    """
+    Return a key which contains the parts of the given build action which
+    affect the analysis: the source file, the language, the target, the
+    standard, the implicit include paths and the canonical form of the
+    compiler options (e.g. defines, include paths). The output file and
+    the working directory of the build action are not part of the key,
+    unless an option may refer to a path relative to the directory.
+    """
+    lang = action.lang
+    options, relative = __canonical_options(action.analyzer_options,
+                                            action.directory)
+    return (action.source,
+            lang,
+            action.target.get(lang),
+            action.compiler_standard.get(lang),
+            tuple(action.compiler_includes.get(lang) or []),
+            tuple(options),
+            action.directory if relative else None)
+
+
+def deduplicate_actions(actions):
+    """
+    Keep only the first one of the build actions which have the same
+    canonical key. Returns the kept build actions and a list of
+    (kept build action, list of identical build actions) tuples.
+    """
+    identical_actions = {}
+    keys = []
+    for action in actions:
+        key = get_canonical_key(action)
+        if key not in identical_actions:
+            identical_actions[key] = (action, [])
+            keys.append(key)
+        else:
+            identical_actions[key][1].append(action)
+
+    unique_actions = [identical_actions[key][0] for key in keys]
+    aliases = [identical_actions[key] for key in keys
+               if identical_actions[key][1]]
+
+    return unique_actions, aliases
+
+
 def parse_unique_log(compilation_database,
                      report_dir,
                      compile_uniqueing="none",
                      compiler_info_file=None,
                      keep_gcc_fix_headers=False,
                      analysis_skip_handler=None,
-                     pre_analysis_skip_handler=None):
+                     pre_analysis_skip_handler=None,
+                     jobs=1,
+                     action_aliases=None):
     """
     This function reads up the compilation_database
     and returns with a list of build actions that is prepared for clang
@@ -946,7 +1228,9 @@ def parse_unique_log(compilation_database,
     This function also dumps auto-detected the compiler info
     into <report_dir>/compiler_info.json.
 
-    compilation_database -- A compilation database as a list of dict objects.
+    compilation_database -- A compilation database as a list (or any other
+                            iterable, see iter_compilation_database()) of
+                            dict objects.
                             These object should contain "file", "dictionary"
                             and "command" keys. The "command" may be replaced
                             by "arguments" which is a split command. Older
@@ -973,7 +1257,34 @@ def parse_unique_log(compilation_database,
                              during analysis
     pre_analysis_skip_handler -- skip handler for files wich should be skipped
                                  during pre analysis
+    jobs -- Number of processes used to parse the compilation commands.
+    action_aliases -- If a list is given, the build actions which have the
+                      same analyzer inputs (see get_canonical_key()) are
+                      analyzed only once. A {'action': ..., 'aliases': [...]}
+                      dict of compilation database entries is appended to
+                      the list for every group of identical build actions.
+
+    The entries are uniqued as they are parsed, so only the unique build
+    actions are kept in memory.
     """
+    entry_count = [0]
+
+    def not_skipped(entries):
+        """
+        Skip parsing the compilaton commands if it should be skipped
+        at both analysis phases (pre analysis and analysis).
+        """
+        for entry in entries:
+            entry_count[0] += 1
+            full_path = os.path.join(entry["directory"], entry["file"])
+            if analysis_skip_handler \
+                    and analysis_skip_handler.should_skip(full_path) \
+                    and pre_analysis_skip_handler \
+                    and pre_analysis_skip_handler.should_skip(full_path):
+                continue
+
+            yield entry
+
     try:
         uniqued_build_actions = dict()
 
@@ -987,20 +1298,10 @@ def parse_unique_log(compilation_database,
             build_action_uniqueing = CompileActionUniqueingType.SOURCE_REGEX
             uniqueing_re = re.compile(compile_uniqueing)
 
-        for entry in compilation_database:
-            # Skip parsing the compilaton commands if it should be skipped
-            # at both analysis phases (pre analysis and analysis).
-            full_path = os.path.join(entry["directory"], entry["file"])
-            if analysis_skip_handler \
-                    and analysis_skip_handler.should_skip(full_path) \
-                    and pre_analysis_skip_handler \
-                    and pre_analysis_skip_handler.should_skip(full_path):
-                continue
-
-            action = parse_options(entry,
-                                   compiler_info_file,
-                                   keep_gcc_fix_headers)
-
+        for action in _parse_entries(not_skipped(iter(compilation_database)),
+                                     compiler_info_file,
+                                     keep_gcc_fix_headers,
+                                     jobs):
             if not action.lang:
                 continue
             if action.action_type != BuildAction.COMPILE:
@@ -1051,10 +1352,22 @@ def parse_unique_log(compilation_database,
             json.dump(ImplicitCompilerInfo.get(), f)
 
         LOG.debug('Parsing log file done.')
-        return list(uniqued_build_actions.values())
+
+        actions = list(uniqued_build_actions.values())
+        if action_aliases is not None:
+            actions, aliases = deduplicate_actions(actions)
+            for action, identical in aliases:
+                action_aliases.append({
+                    'action': action.to_dict(),
+                    'aliases': [alias.to_dict() for alias in identical]})
+
+            LOG.debug("%d identical build action(s) are deduplicated.",
+                      sum(len(identical) for _, identical in aliases))
+
+        return actions
 
     except (ValueError, KeyError, TypeError) as ex:
-        if not compilation_database:
+        if not entry_count[0]:
             LOG.error('The compile database is empty.')
         else:
             LOG.error('The compile database is not valid.')
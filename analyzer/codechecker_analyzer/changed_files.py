@@ -0,0 +1,200 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Prioritize the analysis of the translation units affected by a change.
+
+In pre-commit gating the reports of the translation units which include a
+changed file are the most important ones. These build actions are analyzed
+first and their results are reported as soon as they are available.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from collections import defaultdict
+import multiprocessing
+import os
+import sys
+
+from codechecker_common import plist_parser
+from codechecker_common.logger import get_logger
+
+from .analysis_cache import get_tu_dependencies
+
+LOG = get_logger('analyzer')
+
+
+def parse_changed_files(lines):
+    """
+    Return the paths of the changed files from the given lines which are
+    either a list of paths (one path per line) or a unified diff, e.g. the
+    output of 'git diff'. In case of a diff both the old and the new path of
+    the changed files are returned.
+    """
+    lines = [line.rstrip('\r\n') for line in lines]
+
+    is_diff = any(line.startswith('+++ ') or line.startswith('diff ')
+                  for line in lines)
+    if not is_diff:
+        return set(line.strip() for line in lines if line.strip())
+
+    paths = set()
+    for line in lines:
+        if not line.startswith('+++ ') and not line.startswith('--- '):
+            continue
+
+        # The file name may be followed by a timestamp.
+        path = line[4:].split('\t')[0].strip()
+        if path == '/dev/null':
+            continue
+
+        # Remove the prefixes of 'git diff'.
+        if path[:2] in ('a/', 'b/'):
+            path = path[2:]
+        paths.add(path)
+
+    return paths
+
+
+def matches(changed_path, path):
+    """
+    Return True if the given normalized path is the given changed path. A
+    relative changed path matches every file whose path ends with it,
+    because the paths in a diff are relative to the root of the repository
+    which is not known.
+    """
+    if os.path.isabs(changed_path):
+        return path == changed_path
+
+    return path == changed_path or path.endswith(os.sep + changed_path)
+
+
+class ChangedFiles(object):
+    """
+    Set of the changed files.
+    """
+
+    def __init__(self, paths):
+        self.__paths = set(os.path.normpath(path) for path in paths)
+
+        # Changed paths by their file name for faster lookup.
+        self.__by_name = defaultdict(list)
+        for path in self.__paths:
+            self.__by_name[os.path.basename(path)].append(path)
+
+    @staticmethod
+    def from_file(path):
+        """
+        Read the changed files from the given file or from the standard input
+        if the path is '-'.
+        """
+        if path == '-':
+            return ChangedFiles(parse_changed_files(sys.stdin.readlines()))
+
+        with open(path, 'r') as changes:
+            return ChangedFiles(parse_changed_files(changes.readlines()))
+
+    def __len__(self):
+        return len(self.__paths)
+
+    def __contains__(self, path):
+        path = os.path.normpath(path)
+        return any(matches(changed_path, path) for changed_path
+                   in self.__by_name.get(os.path.basename(path), []))
+
+    def get_affected_actions(self, actions, jobs=1, pool=None):
+        """
+        Return the set of the build actions which analyze a changed file or
+        a file including a changed file.
+
+        The dependencies of the translation units are collected (in parallel
+        on the given number of processes or on the given process pool) only
+        if a changed file is not the source file of any build action, e.g. a
+        header has changed.
+        """
+        sources = {}
+        for action in actions:
+            sources.setdefault(os.path.normpath(
+                os.path.join(action.directory, action.source)),
+                []).append(action)
+
+        affected = set()
+        for source, source_actions in sources.items():
+            if source in self:
+                affected.update(source_actions)
+
+        if all(any(matches(changed_path, source) for source in sources)
+               for changed_path in self.__paths):
+            return affected
+
+        # The dependencies of a compilation command are the same for every
+        # analyzer.
+        remaining = {}
+        for action in actions:
+            if action not in affected:
+                remaining.setdefault((action.original_command,
+                                      action.directory), action)
+
+        commands = list(remaining.keys())
+        if pool:
+            dependencies = pool.map(get_tu_dependencies,
+                                    [remaining[cmd] for cmd in commands])
+        else:
+            pool = multiprocessing.Pool(jobs)
+            try:
+                dependencies = pool.map(get_tu_dependencies,
+                                        [remaining[cmd] for cmd in commands])
+                pool.close()
+            except Exception:
+                pool.terminate()
+                raise
+            finally:
+                pool.join()
+
+        affected_commands = set(
+            command for command, files in zip(commands, dependencies)
+            if files and any(f in self for f in files))
+
+        affected.update(action for action in actions
+                        if (action.original_command, action.directory)
+                        in affected_commands)
+        return affected
+
+
+def prioritize(actions, affected):
+    """
+    Move the affected build actions to the front, keeping the order of the
+    build actions otherwise.
+    """
+    return [action for action in actions if action in affected] + \
+        [action for action in actions if action not in affected]
+
+
+def report_changed_results(action, result, changed_files):
+    """
+    Log the number of reports in the changed files found by the finished
+    analysis of an affected build action.
+    """
+    return_code, _, _, analyzer_type, result_file, _, _, _, _ = result
+    if return_code != 0 or not result_file or \
+            not os.path.exists(result_file):
+        LOG.warning("%s failed to analyze %s affected by the changed "
+                    "files.", analyzer_type, action.source)
+        return
+
+    files, reports = plist_parser.parse_plist_file(result_file,
+                                                   allow_plist_update=False)
+    changed_reports = [report for report in reports
+                       if files[report.main['location']['file']]
+                       in changed_files]
+
+    if changed_reports:
+        LOG.warning("%s found %d report(s) in the changed files analyzing "
+                    "%s.", analyzer_type, len(changed_reports),
+                    action.source)
+    else:
+        LOG.info("%s found no reports in the changed files analyzing %s.",
+                 analyzer_type, action.source)
@@ -16,7 +16,7 @@ import os
 import shutil
 import sys
 
-from codechecker_analyzer import analyzer, analyzer_context, arg
+from codechecker_analyzer import analyzer, analyzer_context, arg, distributed
 from codechecker_analyzer.analyzers import analyzer_types
 from codechecker_analyzer.buildlog import log_parser
 
@@ -139,6 +139,18 @@ def add_arguments_to_parser(parser):
                              "reports and overwrites only those files that "
                              "were update by the current build command).")
 
+    parser.add_argument('--resume',
+                        dest="resume",
+                        required=False,
+                        action='store_true',
+                        default=argparse.SUPPRESS,
+                        help="Resume an interrupted analysis in the output "
+                             "directory. The compilation commands which were "
+                             "analyzed before the interruption are not "
+                             "analyzed again, their results are kept. "
+                             "Without this flag the progress of the previous "
+                             "analysis is discarded.")
+
     parser.add_argument('--compile-uniqueing',
                         type=str,
                         dest="compile_uniqueing",
@@ -172,6 +184,19 @@ def add_arguments_to_parser(parser):
                              "The whole compilation "
                              "action text is searched for match.")
 
+    parser.add_argument('--dedup-identical-actions',
+                        dest="dedup_identical_actions",
+                        action='store_true',
+                        default=argparse.SUPPRESS,
+                        required=False,
+                        help="Analyze the compilation actions which have "
+                             "the same analyzer inputs (source file, "
+                             "language, target, standard, defines, include "
+                             "paths and other compiler options) only once, "
+                             "even if they differ in their output file or "
+                             "working directory. The identical actions are "
+                             "recorded in the metadata of the analysis.")
+
     parser.add_argument('--report-hash',
                         dest="report_hash",
                         default=argparse.SUPPRESS,
@@ -269,6 +294,103 @@ def add_arguments_to_parser(parser):
                                     "the analysis is considered as a failed "
                                     "one.")
 
+    analyzer_opts.add_argument('--adaptive-timeout',
+                               type=arg.positive_float,
+                               dest='adaptive_timeout',
+                               metavar='MULTIPLIER',
+                               required=False,
+                               default=argparse.SUPPRESS,
+                               help="Set the timeout of the analysis of every "
+                                    "compilation command to the given "
+                                    "multiple of its longest analysis time "
+                                    "in the last runs, measured in the "
+                                    "output directory, but at least 60 "
+                                    "seconds and at most the value of "
+                                    "'--timeout'. The compilation commands "
+                                    "without history and the ones killed by "
+                                    "the timeout in the previous analysis "
+                                    "get the value of '--timeout'. The latter "
+                                    "are analyzed at the end.")
+
+    analyzer_opts.add_argument('--changed-files',
+                               type=str,
+                               dest='changed_files',
+                               required=False,
+                               default=argparse.SUPPRESS,
+                               help="File containing the list of the changed "
+                                    "files (one path per line) or a unified "
+                                    "diff, e.g. the output of 'git diff'. "
+                                    "Use '-' to read it from the standard "
+                                    "input. The compilation commands "
+                                    "analyzing a changed file or a file "
+                                    "which includes a changed file are "
+                                    "analyzed first, and the number of the "
+                                    "reports in the changed files is logged "
+                                    "as soon as their analysis finishes. "
+                                    "Relative paths match every file whose "
+                                    "path ends with them.")
+
+    analyzer_opts.add_argument('--analysis-cache',
+                               type=str,
+                               dest='analysis_cache_dir',
+                               required=False,
+                               default=argparse.SUPPRESS,
+                               help="Path of a directory where the results "
+                                    "of the analyzer invocations are "
+                                    "cached. An analyzer invocation is "
+                                    "skipped and its earlier result is "
+                                    "reused if the build action, the "
+                                    "analyzer version, the analyzer "
+                                    "configuration and the content of the "
+                                    "files of the translation unit did not "
+                                    "change. The directory can be shared "
+                                    "between several analysis runs. Results "
+                                    "of CTU and statistics based analysis "
+                                    "are not cached.")
+
+    analyzer_opts.add_argument('--max-memory',
+                               type=arg.memory_size,
+                               dest='max_memory',
+                               metavar='MAX_MEMORY',
+                               required=False,
+                               default=argparse.SUPPRESS,
+                               help="Memory budget of the parallel analyzer "
+                                    "processes in bytes or with a K, M, G "
+                                    "or T suffix (e.g. 16G). The peak memory "
+                                    "usage of every analyzer process is "
+                                    "recorded in the output directory. A new "
+                                    "analyzer process is started only if "
+                                    "the sum of the peak memory usage of the "
+                                    "running ones, measured in the previous "
+                                    "analysis, fits into this budget. "
+                                    "Independently of this option, no new "
+                                    "analyzer process is started while the "
+                                    "free memory of the system is below 5%% "
+                                    "of the total memory.")
+
+    analyzer_opts.add_argument('--coordinator',
+                               type=str,
+                               dest='coordinator',
+                               metavar='HOST:PORT',
+                               required=False,
+                               default=argparse.SUPPRESS,
+                               help="Do not analyze the build actions "
+                                    "locally but serve them on the given "
+                                    "address to 'CodeChecker analyze-worker' "
+                                    "processes, possibly running on other "
+                                    "hosts. The results are sent back by "
+                                    "the workers and stored in the output "
+                                    "directory. The actions of the failed "
+                                    "or unresponsive workers are given to "
+                                    "other workers. The source files (and "
+                                    "the output directory in case of CTU or "
+                                    "statistical analysis) must be available "
+                                    "on the same path on every worker host. "
+                                    "The coordinator and the workers "
+                                    "authenticate each other with the "
+                                    "secret in the CC_COORDINATOR_AUTHKEY "
+                                    "environment variable.")
+
     context = analyzer_context.get_context()
     clang_has_z3 = analyzer_types.is_z3_capable(context)
 
@@ -543,12 +665,9 @@ def main(args):
         LOG.info("'--enable-all' was supplied for this analysis.")
 
     # We clear the output directory in the following cases.
-    ctu_dir = os.path.join(args.output_path, 'ctu-dir')
-    if 'ctu_phases' in args and args.ctu_phases[0] and \
-            os.path.isdir(ctu_dir):
-        # Clear the CTU-dir if the user turned on the collection phase.
-        LOG.debug("Previous CTU contents have been deleted.")
-        shutil.rmtree(ctu_dir)
+    if 'clean' in args and 'resume' in args:
+        LOG.warning("'--resume' has no effect together with '--clean'.")
+        delattr(args, 'resume')
 
     if 'clean' in args and os.path.isdir(args.output_path):
         LOG.info("Previous analysis results in '%s' have been removed, "
@@ -561,6 +680,18 @@ def main(args):
     LOG.debug("args: " + str(args))
     LOG.debug("Output will be stored to: '" + args.output_path + "'")
 
+    if 'coordinator' in args:
+        try:
+            distributed.parse_address(args.coordinator)
+        except ValueError as ex:
+            LOG.error(ex)
+            sys.exit(1)
+
+        if not distributed.get_authkey():
+            LOG.error("The %s environment variable must be set in "
+                      "coordinator mode.", distributed.AUTHKEY_ENV_VAR)
+            sys.exit(1)
+
     # Process the skip list if present.
     skip_handler = __get_skip_handler(args)
 
@@ -591,6 +722,7 @@ def main(args):
 
     # Parse the JSON CCDBs and retrieve the compile commands.
     actions = []
+    action_aliases = [] if 'dedup_identical_actions' in args else None
     for log_file in args.logfile:
         if not os.path.exists(log_file):
             LOG.error("The specified logfile '%s' does not exist!",
@@ -598,13 +730,15 @@ def main(args):
             continue
 
         actions += log_parser.parse_unique_log(
-            load_json_or_empty(log_file),
+            log_parser.iter_compilation_database(log_file),
             report_dir,
             args.compile_uniqueing,
             compiler_info_file,
             args.keep_gcc_include_fixed,
             skip_handler,
-            pre_analysis_skip_handler)
+            pre_analysis_skip_handler,
+            args.jobs,
+            action_aliases)
 
     if not actions:
         LOG.info("No analysis is required.\nThere were no compilation "
@@ -632,6 +766,11 @@ def main(args):
     if 'name' in args:
         metadata['name'] = args.name
 
+    if action_aliases is not None:
+        metadata['action_aliases'] = action_aliases
+        LOG.info("Identical compilation commands analyzed only once: %d",
+                 sum(len(alias['aliases']) for alias in action_aliases))
+
     # Update metadata dictionary with old values.
     metadata_file = os.path.join(args.output_path, 'metadata.json')
     if os.path.exists(metadata_file):
@@ -0,0 +1,105 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Subcommand module for the 'CodeChecker analyze-worker' command which analyzes
+the build actions served by a 'CodeChecker analyze --coordinator' process.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import argparse
+import functools
+import multiprocessing
+import sys
+
+from codechecker_analyzer import analysis_manager, analyzer_context, \
+    distributed
+
+from codechecker_common import logger
+
+LOG = logger.get_logger('system')
+
+
+def get_argparser_ctor_args():
+    """
+    This method returns a dict containing the kwargs for constructing an
+    argparse.ArgumentParser (either directly or as a subparser).
+    """
+
+    return {
+        'prog': 'CodeChecker analyze-worker',
+        'formatter_class': argparse.ArgumentDefaultsHelpFormatter,
+
+        # Description is shown when the command's help is queried directly
+        'description': "Connect to a coordinator started by 'CodeChecker "
+                       "analyze --coordinator' and analyze the build "
+                       "actions served by it. The results are sent back to "
+                       "the coordinator. The worker exits when every build "
+                       "action has been analyzed. The secret shared with "
+                       "the coordinator must be given in the "
+                       "CC_COORDINATOR_AUTHKEY environment variable.",
+
+        # Help is shown when the "parent" CodeChecker command lists the
+        # individual subcommands.
+        'help': "Analyze build actions served by an analysis coordinator."
+    }
+
+
+def add_arguments_to_parser(parser):
+    """
+    Add the subcommand's arguments to the given argparse.ArgumentParser.
+    """
+
+    parser.add_argument('coordinator',
+                        type=str,
+                        metavar='HOST:PORT',
+                        help="The address of the coordinator.")
+
+    parser.add_argument('-j', '--jobs',
+                        type=int,
+                        dest="jobs",
+                        required=False,
+                        default=1,
+                        help="Number of build actions to analyze in "
+                             "parallel on this host.")
+
+    logger.add_verbose_arguments(parser)
+    parser.set_defaults(func=main)
+
+
+def main(args):
+    """
+    Analyze the build actions of the coordinator.
+    """
+    logger.setup_logger(args.verbose if 'verbose' in args else None)
+
+    try:
+        address = distributed.parse_address(args.coordinator)
+    except ValueError as ex:
+        LOG.error(ex)
+        sys.exit(1)
+
+    authkey = distributed.get_authkey()
+    if not authkey:
+        LOG.error("The %s environment variable must be set.",
+                  distributed.AUTHKEY_ENV_VAR)
+        sys.exit(1)
+
+    context = analyzer_context.get_context()
+    process_task = functools.partial(analysis_manager.check_remote, context)
+
+    workers = [multiprocessing.Process(target=distributed.run_worker,
+                                       args=(address, authkey, process_task))
+               for _ in range(max(args.jobs, 1))]
+
+    for worker in workers:
+        worker.start()
+
+    for worker in workers:
+        worker.join()
+
+    LOG.info("Every build action of the coordinator has been analyzed.")
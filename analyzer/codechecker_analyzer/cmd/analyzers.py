@@ -15,7 +15,8 @@ import argparse
 import subprocess
 
 from codechecker_analyzer import analyzer_context
-from codechecker_analyzer.analyzers import analyzer_types
+from codechecker_analyzer.analyzers import analyzer_info_cache, \
+    analyzer_types
 
 from codechecker_common import logger
 from codechecker_common import output_formatters
@@ -141,11 +142,7 @@ def main(args):
             rows.append([analyzer])
         else:
             binary = context.analyzer_binaries.get(analyzer)
-            try:
-                version = subprocess.check_output([binary,
-                                                   '--version'])
-            except (subprocess.CalledProcessError, OSError):
-                version = 'ERROR'
+            version = analyzer_info_cache.get_version(binary) or 'ERROR'
 
             rows.append([analyzer,
                          binary,
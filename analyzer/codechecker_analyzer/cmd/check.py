@@ -165,6 +165,19 @@ used to generate a log file on the fly.""")
                                     "overwrites only those files that were "
                                     "update by the current build command).")
 
+    analyzer_opts.add_argument('--resume',
+                               dest="resume",
+                               required=False,
+                               action='store_true',
+                               default=argparse.SUPPRESS,
+                               help="Resume an interrupted analysis in the "
+                                    "output directory. The compilation "
+                                    "commands which were analyzed before the "
+                                    "interruption are not analyzed again, "
+                                    "their results are kept. Without this "
+                                    "flag the progress of the previous "
+                                    "analysis is discarded.")
+
     parser.add_argument('--compile-uniqueing',
                         type=str,
                         dest="compile_uniqueing",
@@ -198,6 +211,21 @@ used to generate a log file on the fly.""")
                              "The whole compilation "
                              "action text is searched for match.")
 
+    analyzer_opts.add_argument('--dedup-identical-actions',
+                               dest="dedup_identical_actions",
+                               action='store_true',
+                               default=argparse.SUPPRESS,
+                               required=False,
+                               help="Analyze the compilation actions which "
+                                    "have the same analyzer inputs (source "
+                                    "file, language, target, standard, "
+                                    "defines, include paths and other "
+                                    "compiler options) only once, even if "
+                                    "they differ in their output file or "
+                                    "working directory. The identical "
+                                    "actions are recorded in the metadata of "
+                                    "the analysis.")
+
     analyzer_opts.add_argument('--report-hash',
                                dest="report_hash",
                                default=argparse.SUPPRESS,
@@ -299,6 +327,80 @@ used to generate a log file on the fly.""")
                                     "the analysis is considered as a failed "
                                     "one.")
 
+    analyzer_opts.add_argument('--adaptive-timeout',
+                               type=arg.positive_float,
+                               dest='adaptive_timeout',
+                               metavar='MULTIPLIER',
+                               required=False,
+                               default=argparse.SUPPRESS,
+                               help="Set the timeout of the analysis of every "
+                                    "compilation command to the given "
+                                    "multiple of its longest analysis time "
+                                    "in the last runs, measured in the "
+                                    "output directory, but at least 60 "
+                                    "seconds and at most the value of "
+                                    "'--timeout'. The compilation commands "
+                                    "without history and the ones killed by "
+                                    "the timeout in the previous analysis "
+                                    "get the value of '--timeout'. The latter "
+                                    "are analyzed at the end.")
+
+    analyzer_opts.add_argument('--changed-files',
+                               type=str,
+                               dest='changed_files',
+                               required=False,
+                               default=argparse.SUPPRESS,
+                               help="File containing the list of the changed "
+                                    "files (one path per line) or a unified "
+                                    "diff, e.g. the output of 'git diff'. "
+                                    "Use '-' to read it from the standard "
+                                    "input. The compilation commands "
+                                    "analyzing a changed file or a file "
+                                    "which includes a changed file are "
+                                    "analyzed first, and the number of the "
+                                    "reports in the changed files is logged "
+                                    "as soon as their analysis finishes. "
+                                    "Relative paths match every file whose "
+                                    "path ends with them.")
+
+    analyzer_opts.add_argument('--analysis-cache',
+                               type=str,
+                               dest='analysis_cache_dir',
+                               required=False,
+                               default=argparse.SUPPRESS,
+                               help="Path of a directory where the results "
+                                    "of the analyzer invocations are "
+                                    "cached. An analyzer invocation is "
+                                    "skipped and its earlier result is "
+                                    "reused if the build action, the "
+                                    "analyzer version, the analyzer "
+                                    "configuration and the content of the "
+                                    "files of the translation unit did not "
+                                    "change. The directory can be shared "
+                                    "between several analysis runs. Results "
+                                    "of CTU and statistics based analysis "
+                                    "are not cached.")
+
+    analyzer_opts.add_argument('--max-memory',
+                               type=arg.memory_size,
+                               dest='max_memory',
+                               metavar='MAX_MEMORY',
+                               required=False,
+                               default=argparse.SUPPRESS,
+                               help="Memory budget of the parallel analyzer "
+                                    "processes in bytes or with a K, M, G "
+                                    "or T suffix (e.g. 16G). The peak memory "
+                                    "usage of every analyzer process is "
+                                    "recorded in the output directory. A new "
+                                    "analyzer process is started only if "
+                                    "the sum of the peak memory usage of the "
+                                    "running ones, measured in the previous "
+                                    "analysis, fits into this budget. "
+                                    "Independently of this option, no new "
+                                    "analyzer process is started while the "
+                                    "free memory of the system is below 5%% "
+                                    "of the total memory.")
+
     context = analyzer_context.get_context()
     clang_has_z3 = analyzer_types.is_z3_capable(context)
 
@@ -613,7 +715,13 @@ def main(args):
                           'enable_all',
                           'ordered_checkers',  # --enable and --disable.
                           'timeout',
+                          'adaptive_timeout',
+                          'changed_files',
+                          'analysis_cache_dir',
+                          'max_memory',
                           'compile_uniqueing',
+                          'dedup_identical_actions',
+                          'resume',
                           'report_hash',
                           'enable_z3',
                           'enable_z3_refutation']
@@ -637,6 +745,7 @@ def main(args):
         __update_if_key_exists(args, parse_args, 'print_steps')
         __update_if_key_exists(args, parse_args, 'verbose')
         __update_if_key_exists(args, parse_args, 'skipfile')
+        __update_if_key_exists(args, parse_args, 'jobs')
 
         import codechecker_analyzer.cmd.parse as parse_module
         LOG.debug("Calling PARSE with args:")
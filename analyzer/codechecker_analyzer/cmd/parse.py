@@ -11,11 +11,13 @@ from __future__ import print_function
 from __future__ import division
 from __future__ import absolute_import
 
-from collections import defaultdict
+from collections import defaultdict, deque
 import argparse
 import math
+import multiprocessing
 import os
 import sys
+import traceback
 
 from plist_to_html import PlistToHtml
 
@@ -30,10 +32,31 @@ from codechecker_common.source_code_comment_handler import \
 from codechecker_common.output_formatters import twodim_to_str
 from codechecker_common.report import Report, get_report_path_hash
 from codechecker_common.source_code_comment_handler import skip_suppress_status
+from codechecker_common.source_line_cache import source_line_cache
 
 LOG = logger.get_logger('system')
 
 
+class PreparedReport(Report):
+    """
+    Report with the data of its deduplication and filtering which is
+    computed when the plist file is loaded, possibly by a worker process.
+    """
+
+    def __init__(self, report, path_hash, skipped, src_comment_data):
+        super(PreparedReport, self).__init__(report.main, report.bug_path,
+                                             report.files)
+
+        # Hash of the bug path to filter the deduplications.
+        self.path_hash = path_hash
+
+        # True if the report is in a file skipped by the skip list.
+        self.skipped = skipped
+
+        # Source code comments of the report line for the checker.
+        self.src_comment_data = src_comment_data
+
+
 class PlistToPlaintextFormatter(object):
     """
     Parse and format plist reports to a more human readable format.
@@ -149,7 +172,7 @@ class PlistToPlaintextFormatter(object):
                                     key=lambda r: r.main['location']['line'])
 
             for report in sorted_reports:
-                path_hash = get_report_path_hash(report, report.files)
+                path_hash = report.path_hash
                 if path_hash in self._processed_path_hashes:
                     LOG.debug("Not showing report because it is a "
                               "deduplication of an already processed report!")
@@ -162,8 +185,7 @@ class PlistToPlaintextFormatter(object):
                 events = [i for i in report.bug_path
                           if i.get('kind') == 'event']
                 f_path = report.files[events[-1]['location']['file']]
-                if self.skiplist_handler and \
-                        self.skiplist_handler.should_skip(f_path):
+                if report.skipped:
                     LOG.debug("Skipped report in '%s'", f_path)
                     LOG.debug(report)
                     continue
@@ -181,7 +203,8 @@ class PlistToPlaintextFormatter(object):
                 checker_name = report.main['check_name']
 
                 if skip_report(report_hash, source_file, report_line,
-                               checker_name, self.src_comment_handler):
+                               checker_name, self.src_comment_handler,
+                               report.src_comment_data):
                     continue
 
                 file_stats[f_path] += 1
@@ -268,11 +291,25 @@ class PlistToPlaintextFormatter(object):
                 "reports": report_count}
 
 
+def get_source_comment_data(source_file, report_line, checker_name):
+    """
+    Returns the source code comments of the report line which belong to the
+    given checker.
+    """
+    sc_handler = SourceCodeCommentHandler()
+    return sc_handler.filter_source_line_comments(source_file,
+                                                  report_line,
+                                                  checker_name)
+
+
 def skip_report(report_hash, source_file, report_line, checker_name,
-                src_comment_handler=None):
+                src_comment_handler=None, src_comment_data=None):
     """
     Returns True if the report was suppressed in the source code, otherwise
     False.
+
+    The source code comments of the report line are read from the source file
+    unless they are given.
     """
     bug = {'hash_value': report_hash, 'file_path': source_file}
     if src_comment_handler and src_comment_handler.get_suppressed(bug):
@@ -280,13 +317,11 @@ def skip_report(report_hash, source_file, report_line, checker_name,
                   report_line, checker_name, report_hash)
         return True
 
-    sc_handler = SourceCodeCommentHandler()
-
     # Check for source code comment.
-    src_comment_data = sc_handler.filter_source_line_comments(
-        source_file,
-        report_line,
-        checker_name)
+    if src_comment_data is None:
+        src_comment_data = get_source_comment_data(source_file,
+                                                   report_line,
+                                                   checker_name)
 
     if len(src_comment_data) == 1:
         status = src_comment_data[0]['status']
@@ -379,6 +414,19 @@ def add_arguments_to_parser(parser):
                                   "only those that belongs to a plist file "
                                   "given by the input argument.")
 
+    output_opts.add_argument('--shared-assets',
+                             dest="shared_assets",
+                             required=False,
+                             action='store_true',
+                             default=argparse.SUPPRESS,
+                             help="Write the CSS and JavaScript files and the "
+                                  "source files of the reports into the "
+                                  "output folder only once instead of "
+                                  "embedding them into every HTML file. The "
+                                  "source files are loaded by the viewer when "
+                                  "they are shown. The HTML files are written "
+                                  "on '--jobs' processes.")
+
     parser.add_argument('--suppress',
                         type=str,
                         dest="suppress",
@@ -436,6 +484,29 @@ def add_arguments_to_parser(parser):
                              "If multiple prefix is given, the longest match "
                              "will be removed.")
 
+    parser.add_argument('-j', '--jobs',
+                        type=int,
+                        dest="jobs",
+                        required=False,
+                        default=1,
+                        help="Number of processes loading and filtering the "
+                             "plist files in parallel. The reports are "
+                             "printed in the same order as with one "
+                             "process.")
+
+    parser.add_argument('--stream',
+                        dest="stream",
+                        action="store_true",
+                        required=False,
+                        default=argparse.SUPPRESS,
+                        help="Print the reports of every plist file as soon "
+                             "as the plist file is loaded, instead of "
+                             "printing the reports of every plist file "
+                             "grouped by source file at the end. The "
+                             "memory usage does not grow with the number of "
+                             "the plist files. The summary is printed at "
+                             "the end.")
+
     logger.add_verbose_arguments(parser)
 
     def __handle(args):
@@ -458,29 +529,50 @@ def add_arguments_to_parser(parser):
     parser.set_defaults(func=__handle)
 
 
-def parse(plist_file, metadata_dict, rh, file_report_map):
-    """
-    Prints the results in the given file to the standard output in a human-
-    readable format.
+# Skip list handler of the plist loading worker processes. It is set only
+# by the initializer of the process pool.
+parse_skip_handler = None
 
-    Returns the report statistics collected by the result handler.
+
+def init_worker(skip_handler):
+    global parse_skip_handler
+    parse_skip_handler = skip_handler
+
+
+def prepare_report(report, skip_handler):
+    """
+    Compute the data of the deduplication and the filtering of the report.
     """
+    events = [i for i in report.bug_path if i.get('kind') == 'event']
+    f_path = report.files[events[-1]['location']['file']]
+    skipped = bool(skip_handler and skip_handler.should_skip(f_path))
 
-    if not plist_file.endswith(".plist"):
-        LOG.debug("Skipping input file '%s' as it is not a plist.", plist_file)
-        return set()
+    src_comment_data = None
+    if not skipped:
+        last_report_event = report.bug_path[-1]
+        src_comment_data = get_source_comment_data(
+            report.files[last_report_event['location']['file']],
+            last_report_event['location']['line'],
+            report.main['check_name'])
 
-    LOG.debug("Parsing input file '%s'", plist_file)
+    return PreparedReport(report,
+                          get_report_path_hash(report, report.files),
+                          skipped,
+                          src_comment_data)
 
-    if 'result_source_files' in metadata_dict and \
-            plist_file in metadata_dict['result_source_files']:
-        analyzed_source_file = \
-            metadata_dict['result_source_files'][plist_file]
 
-        if analyzed_source_file not in file_report_map:
-            file_report_map[analyzed_source_file] = []
+def load_plist_file(plist_file, skip_handler):
+    """
+    Load the reports of the given plist file and prepare them for printing
+    with the given skip list handler.
+
+    Returns the set of the source files which changed since the plist file
+    was written and the list of the prepared reports, which is empty if any
+    of the source files changed.
+    """
+    LOG.debug("Parsing input file '%s'", plist_file)
 
-    files, reports = rh.parse(plist_file)
+    files, reports = PlistToPlaintextFormatter.parse(plist_file)
 
     plist_mtime = util.get_last_mod_time(plist_file)
 
@@ -498,17 +590,142 @@ def parse(plist_file, metadata_dict, rh, file_report_map):
             changed_files.add(source_file)
             LOG.warning('%s did change since the last analysis.', source_file)
 
-    if not changed_files:
-        for report in reports:
-            file_path = report.file_path
-            if file_path not in file_report_map:
-                file_report_map[file_path] = []
+    if changed_files:
+        return changed_files, []
+
+    return changed_files, [prepare_report(report, skip_handler)
+                           for report in reports]
+
+
+def merge_reports(plist_file, metadata_dict, file_report_map, reports):
+    """
+    Add the loaded reports of the plist file to the file report map.
+    """
+    if 'result_source_files' in metadata_dict and \
+            plist_file in metadata_dict['result_source_files']:
+        analyzed_source_file = \
+            metadata_dict['result_source_files'][plist_file]
+
+        if analyzed_source_file not in file_report_map:
+            file_report_map[analyzed_source_file] = []
+
+    for report in reports:
+        file_path = report.file_path
+        if file_path not in file_report_map:
+            file_report_map[file_path] = []
+
+        file_report_map[file_path].append(report)
+
 
-            file_report_map[file_path].append(report)
+def parse(plist_file, metadata_dict, rh, file_report_map):
+    """
+    Prints the results in the given file to the standard output in a human-
+    readable format.
+
+    Returns the report statistics collected by the result handler.
+    """
+
+    if not plist_file.endswith(".plist"):
+        LOG.debug("Skipping input file '%s' as it is not a plist.", plist_file)
+        return set()
+
+    changed_files, reports = load_plist_file(plist_file, rh.skiplist_handler)
+    merge_reports(plist_file, metadata_dict, file_report_map, reports)
 
     return changed_files
 
 
+def load_plist_chunk(plist_files):
+    """
+    Load the given plist files in a worker process with the skip list handler
+    of the worker.
+    """
+    return [load_plist_file(plist_file, parse_skip_handler)
+            for plist_file in plist_files]
+
+
+def load_plist_files(plist_files, skip_handler, pool=None, jobs=1):
+    """
+    Load the given plist files, on the process pool of the given number of
+    processes if it is given. The pool has to be initialized by init_worker()
+    with the given skip list handler. Yields the plist files and the results of
+    load_plist_file() in the order of the plist files, so the output does
+    not depend on the number of the processes.
+
+    Only a few chunks of the plist files are loaded ahead of the consumer,
+    so the memory usage does not grow with the number of the plist files.
+    """
+    plist_files = [plist_file for plist_file in plist_files
+                   if plist_file.endswith(".plist")]
+
+    if not pool:
+        for plist_file in plist_files:
+            yield plist_file, load_plist_file(plist_file, skip_handler)
+        return
+
+    # Bigger chunks keep the inter-process communication low, while there
+    # are still enough chunks to balance the load.
+    chunk_size = max(1, len(plist_files) // (jobs * 16))
+    chunks = [plist_files[i:i + chunk_size]
+              for i in range(0, len(plist_files), chunk_size)]
+
+    pending = deque()
+    next_chunk = 0
+    while pending or next_chunk < len(chunks):
+        # Keep every worker busy with the next chunk.
+        while next_chunk < len(chunks) and len(pending) < jobs * 2:
+            pending.append((chunks[next_chunk],
+                            pool.apply_async(load_plist_chunk,
+                                             (chunks[next_chunk],))))
+            next_chunk += 1
+
+        chunk, result = pending.popleft()
+        for plist_file, loaded in zip(chunk, result.get()):
+            yield plist_file, loaded
+
+
+def parse_files(plist_files, metadata_dict, file_report_map, skip_handler,
+                pool=None, jobs=1):
+    """
+    Load the given plist files into the file report map, on the process pool
+    of the given number of processes if it is given. The reports are merged
+    in the order of the plist files.
+
+    Returns the set of the source files which changed since the analysis.
+    """
+    file_change = set()
+    for plist_file, (changed_files, reports) in \
+            load_plist_files(plist_files, skip_handler, pool, jobs):
+        file_change.update(changed_files)
+        merge_reports(plist_file, metadata_dict, file_report_map, reports)
+
+    return file_change
+
+
+def stream_files(plist_files, metadata_dict, rh, add_report_stats,
+                 pool=None, jobs=1, output=sys.stdout):
+    """
+    Print the reports of the given plist files one plist file at a time, as
+    soon as the plist file is loaded. The statistics of the printed reports
+    are passed to the add_report_stats callback.
+
+    Returns the set of the source files which changed since the analysis.
+    """
+    file_change = set()
+    for plist_file, (changed_files, reports) in \
+            load_plist_files(plist_files, rh.skiplist_handler, pool, jobs):
+        file_change.update(changed_files)
+
+        file_report_map = defaultdict(list)
+        merge_reports(plist_file, metadata_dict, file_report_map, reports)
+        add_report_stats(rh.write(file_report_map, output))
+
+        # The output may be followed live, e.g. by a CI job.
+        output.flush()
+
+    return file_change
+
+
 def main(args):
     """
     Entry point for parsing some analysis results and printing them to the
@@ -562,6 +779,8 @@ def main(args):
     trim_path_prefixes = args.trim_path_prefix if \
         'trim_path_prefix' in args else None
 
+    jobs = args.jobs if 'jobs' in args else 1
+
     def trim_path_prefixes_handler(source_file):
         """
         Callback to util.trim_path_prefixes to prevent module dependency
@@ -602,7 +821,22 @@ def main(args):
     file_change = set()
     severity_stats = defaultdict(int)
     file_stats = defaultdict(int)
-    report_count = 0
+    report_count = defaultdict(int)
+
+    def add_report_stats(report_stats):
+        """
+        Add the statistics of the printed reports to the summary.
+        """
+        sev_stats = report_stats.get('severity')
+        for severity in sev_stats:
+            severity_stats[severity] += sev_stats[severity]
+
+        f_stats = report_stats.get('files')
+        for file_path in f_stats:
+            file_stats[file_path] += f_stats[file_path]
+
+        rep_stats = report_stats.get('reports')
+        report_count["report_count"] += rep_stats.get("report_count", 0)
 
     for input_path in args.input:
 
@@ -617,7 +851,8 @@ def main(args):
             if not html_builder:
                 html_builder = \
                     PlistToHtml.HtmlBuilder(context.path_plist_to_html_dist,
-                                            context.severity_map)
+                                            context.severity_map,
+                                            'shared_assets' in args)
 
             LOG.info("Generating html output files:")
             PlistToHtml.parse(input_path,
@@ -625,7 +860,8 @@ def main(args):
                               context.path_plist_to_html_dist,
                               skip_html_report_data_handler,
                               html_builder,
-                              trim_path_prefixes_handler)
+                              trim_path_prefixes_handler,
+                              jobs)
             continue
 
         files = []
@@ -653,8 +889,6 @@ def main(args):
             files = [os.path.join(input_path, file_name) for file_name
                      in file_names]
 
-        file_report_map = defaultdict(list)
-
         rh = PlistToPlaintextFormatter(suppr_handler,
                                        skip_handler,
                                        context.severity_map,
@@ -662,21 +896,38 @@ def main(args):
                                        trim_path_prefixes)
         rh.print_steps = 'print_steps' in args
 
-        for file_path in files:
-            f_change = parse(file_path, metadata_dict, rh, file_report_map)
-            file_change = file_change.union(f_change)
-
-        report_stats = rh.write(file_report_map)
-        sev_stats = report_stats.get('severity')
-        for severity in sev_stats:
-            severity_stats[severity] += sev_stats[severity]
-
-        f_stats = report_stats.get('files')
-        for file_path in f_stats:
-            file_stats[file_path] += f_stats[file_path]
+        # The workers are started in the working directory of the analysis,
+        # because the source file paths may be relative to it.
+        pool = None
+        if jobs > 1 and len(files) > 1:
+            pool = multiprocessing.Pool(jobs,
+                                        initializer=init_worker,
+                                        initargs=(skip_handler,))
+        try:
+            if 'stream' in args:
+                file_change.update(stream_files(files, metadata_dict, rh,
+                                                add_report_stats, pool,
+                                                jobs))
+            else:
+                file_report_map = defaultdict(list)
+                file_change.update(parse_files(files, metadata_dict,
+                                               file_report_map, skip_handler,
+                                               pool, jobs))
+                add_report_stats(rh.write(file_report_map))
+
+            if pool:
+                pool.close()
+        except Exception:
+            if pool:
+                pool.terminate()
+            raise
+        finally:
+            if pool:
+                pool.join()
 
-        rep_stats = report_stats.get('reports')
-        report_count += rep_stats.get("report_count", 0)
+    # The printed source files are not kept mapped, e.g. by 'CodeChecker
+    # check' which continues after the parsing.
+    source_line_cache.clear()
 
     print("\n----==== Summary ====----")
     if file_stats:
@@ -693,7 +944,8 @@ def main(args):
         print(table)
 
     print("----=================----")
-    print("Total number of reports: {}".format(report_count))
+    print("Total number of reports: {}".format(
+        report_count["report_count"]))
     print("----=================----")
 
     if file_change:
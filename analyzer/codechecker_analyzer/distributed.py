@@ -0,0 +1,415 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Coordinator and worker processes for analyzing build actions on several
+hosts.
+
+The coordinator serves a task queue over authenticated TCP connections of the
+multiprocessing module. The workers connect to the coordinator, lease the
+tasks one by one, process them and send the results back. A lease has to be
+renewed by the worker periodically while the task is processed. The tasks of
+the workers which failed or stopped renewing their leases are given to other
+workers.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from collections import deque
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+import os
+import socket
+import threading
+import time
+
+from codechecker_common.logger import get_logger
+
+LOG = get_logger('analyzer')
+
+# Environment variable which contains the secret shared by the coordinator
+# and the workers.
+AUTHKEY_ENV_VAR = 'CC_COORDINATOR_AUTHKEY'
+
+# Returned to the workers if every task has been processed.
+FINISHED = 'FINISHED'
+
+# Seconds after the lease of a task expires if it is not renewed.
+LEASE_TIMEOUT = 60
+
+# Number of times a task is given out before it is considered as failed.
+MAX_ATTEMPTS = 3
+
+
+def parse_address(address):
+    """
+    Parse a 'host:port' address to a tuple which can be used by the managers.
+    """
+    host, _, port = address.rpartition(':')
+    if not host or not port.isdigit():
+        raise ValueError("Invalid address '{0}', it should be given in "
+                         "'host:port' format.".format(address))
+
+    return host, int(port)
+
+
+def get_authkey():
+    """
+    Return the shared secret of the coordinator and the workers or None if it
+    is not set.
+    """
+    return os.environ.get(AUTHKEY_ENV_VAR)
+
+
+class TaskQueue(object):
+    """
+    Tasks to be processed by the workers. The object lives in the coordinator
+    process and its methods are called by the workers remotely.
+    """
+
+    def __init__(self, tasks, settings, lease_timeout=LEASE_TIMEOUT,
+                 max_attempts=MAX_ATTEMPTS):
+        self.__tasks = tasks
+        self.__settings = settings
+        self.__lease_timeout = lease_timeout
+        self.__max_attempts = max_attempts
+
+        self.__pending = deque(range(len(tasks)))
+        self.__attempts = [0] * len(tasks)
+
+        # Task id -> (worker id, lease deadline).
+        self.__leases = {}
+
+        self.__done = set()
+
+        # Results which have not been fetched by the coordinator yet.
+        self.__results = []
+
+        # The coordinator handles every connection on a separate thread.
+        self.__lock = threading.Lock()
+
+    def get_settings(self):
+        """
+        Return the settings which are common for every task.
+        """
+        return self.__settings
+
+    def get_lease_timeout(self):
+        return self.__lease_timeout
+
+    def get_task(self, worker):
+        """
+        Lease a task to the given worker. Returns a (task id, task) tuple,
+        None if every remaining task is leased by other workers or FINISHED
+        if every task has been processed.
+        """
+        with self.__lock:
+            self.__requeue_expired()
+
+            if self.__pending:
+                task_id = self.__pending.popleft()
+                self.__attempts[task_id] += 1
+                self.__leases[task_id] = \
+                    (worker, time.time() + self.__lease_timeout)
+                return task_id, self.__tasks[task_id]
+
+            if len(self.__done) == len(self.__tasks):
+                return FINISHED
+
+            return None
+
+    def heartbeat(self, worker, task_id):
+        """
+        Renew the lease of the given task. Returns False if the task is not
+        leased to the worker anymore.
+        """
+        with self.__lock:
+            lease = self.__leases.get(task_id)
+            if not lease or lease[0] != worker:
+                return False
+
+            self.__leases[task_id] = \
+                (worker, time.time() + self.__lease_timeout)
+            return True
+
+    def put_result(self, worker, task_id, result):
+        """
+        Store the result of a task. The result of a task which has already
+        been finished by another worker is dropped.
+        """
+        with self.__lock:
+            if task_id in self.__done:
+                return False
+
+            self.__leases.pop(task_id, None)
+            if task_id in self.__pending:
+                self.__pending.remove(task_id)
+
+            self.__done.add(task_id)
+            self.__results.append((task_id, result))
+            return True
+
+    def fail_task(self, worker, task_id, reason):
+        """
+        The worker could not process the given task, so give it to another
+        worker.
+        """
+        with self.__lock:
+            lease = self.__leases.get(task_id)
+            if not lease or lease[0] != worker:
+                return
+
+            LOG.warning("Worker %s failed to process task %d: %s",
+                        worker, task_id, reason)
+            self.__release(task_id)
+
+    def pop_results(self):
+        """
+        Return the results which arrived since the previous call as a list of
+        (task id, result) tuples. The result of a task which could not be
+        processed by any worker is None.
+        """
+        with self.__lock:
+            self.__requeue_expired()
+
+            results = self.__results
+            self.__results = []
+            return results
+
+    def __requeue_expired(self):
+        now = time.time()
+        for task_id, lease in list(self.__leases.items()):
+            worker, deadline = lease
+            if deadline < now:
+                LOG.warning("Lease of task %d by worker %s has expired.",
+                            task_id, worker)
+                self.__release(task_id)
+
+    def __release(self, task_id):
+        """
+        Give the leased task to another worker or mark it as failed if it
+        has been tried too many times.
+        """
+        del self.__leases[task_id]
+
+        if self.__attempts[task_id] >= self.__max_attempts:
+            self.__done.add(task_id)
+            self.__results.append((task_id, None))
+        else:
+            # Give it out first, as it probably takes long.
+            self.__pending.appendleft(task_id)
+
+
+class Coordinator(object):
+    """
+    Serve the given tasks to the workers. Every worker connection is handled
+    on a separate thread which calls the methods of the task queue listed in
+    REQUESTS.
+    """
+
+    REQUESTS = ('get_settings', 'get_lease_timeout', 'get_task',
+                'heartbeat', 'put_result', 'fail_task')
+
+    def __init__(self, address, authkey, tasks, settings,
+                 lease_timeout=LEASE_TIMEOUT, max_attempts=MAX_ATTEMPTS):
+        self.__queue = TaskQueue(tasks, settings, lease_timeout,
+                                 max_attempts)
+        self.__task_num = len(tasks)
+        self.__address = address
+        self.__authkey = authkey
+        self.__listener = None
+        self.__closed = threading.Event()
+
+    @property
+    def address(self):
+        return self.__listener.address
+
+    def start(self):
+        self.__listener = Listener(self.__address, authkey=self.__authkey)
+
+        acceptor = threading.Thread(target=self.__accept)
+        acceptor.daemon = True
+        acceptor.start()
+
+        LOG.info("Coordinator is waiting for workers on %s:%d.",
+                 *self.address)
+
+    def __accept(self):
+        while not self.__closed.is_set():
+            try:
+                conn = self.__listener.accept()
+            except (AuthenticationError, EOFError, IOError) as ex:
+                LOG.debug("Failed to accept worker connection: %s", ex)
+                continue
+
+            handler = threading.Thread(target=self.__serve, args=(conn,))
+            handler.daemon = True
+            handler.start()
+
+    def __serve(self, conn):
+        try:
+            while not self.__closed.is_set():
+                if not conn.poll(0.5):
+                    continue
+
+                method, args = conn.recv()
+                if method not in self.REQUESTS:
+                    LOG.debug("Invalid request from worker: %s", method)
+                    break
+
+                conn.send(getattr(self.__queue, method)(*args))
+        except (EOFError, IOError):
+            pass
+        finally:
+            conn.close()
+
+    def wait(self, result_callback, poll_interval=0.5):
+        """
+        Wait for the results of every task. The result callback is called
+        with the task id and the result of every task in order of their
+        arrival.
+        """
+        remaining = self.__task_num
+        while remaining:
+            results = self.__queue.pop_results()
+            for task_id, result in results:
+                result_callback(task_id, result)
+
+            remaining -= len(results)
+            if remaining and not results:
+                time.sleep(poll_interval)
+
+    def shutdown(self):
+        """
+        Stop serving the workers. The connected workers are disconnected.
+        """
+        self.__closed.set()
+
+        # Wake up the thread waiting for new connections.
+        try:
+            Client(self.address, authkey=self.__authkey).close()
+        except (AuthenticationError, EOFError, IOError):
+            pass
+
+        self.__listener.close()
+
+
+class RemoteTaskQueue(object):
+    """
+    Access the task queue of a coordinator from a worker. The connection can
+    be used from multiple threads.
+    """
+
+    def __init__(self, address, authkey):
+        self.__conn = Client(address, authkey=authkey)
+        self.__lock = threading.Lock()
+
+    def __call(self, method, *args):
+        with self.__lock:
+            self.__conn.send((method, args))
+            return self.__conn.recv()
+
+    def get_settings(self):
+        return self.__call('get_settings')
+
+    def get_lease_timeout(self):
+        return self.__call('get_lease_timeout')
+
+    def get_task(self, worker):
+        return self.__call('get_task', worker)
+
+    def heartbeat(self, worker, task_id):
+        return self.__call('heartbeat', worker, task_id)
+
+    def put_result(self, worker, task_id, result):
+        return self.__call('put_result', worker, task_id, result)
+
+    def fail_task(self, worker, task_id, reason):
+        return self.__call('fail_task', worker, task_id, reason)
+
+    def close(self):
+        self.__conn.close()
+
+
+def _keep_lease(queue, worker, task_id, interval, stop):
+    """
+    Renew the lease of a task until the stop event is set.
+    """
+    while not stop.wait(interval):
+        try:
+            if not queue.heartbeat(worker, task_id):
+                return
+        except (EOFError, IOError):
+            return
+
+
+def run_worker(address, authkey, process_task, worker=None,
+               poll_interval=1):
+    """
+    Process the tasks of the coordinator on the given address until every
+    task is finished. The process_task function is called with the task and
+    the settings of the coordinator.
+    """
+    if not worker:
+        worker = '{0}:{1}'.format(socket.gethostname(), os.getpid())
+
+    try:
+        queue = RemoteTaskQueue(address, authkey)
+        settings = queue.get_settings()
+        heartbeat_interval = queue.get_lease_timeout() / 3
+    except (AuthenticationError, EOFError, IOError) as ex:
+        LOG.error("Failed to connect to the coordinator on %s:%d: %s",
+                  address[0], address[1], ex)
+        return 0
+
+    processed = 0
+    while True:
+        try:
+            task = queue.get_task(worker)
+        except (EOFError, IOError):
+            # The coordinator has been shut down.
+            break
+
+        if task == FINISHED:
+            break
+
+        if task is None:
+            time.sleep(poll_interval)
+            continue
+
+        task_id, payload = task
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=_keep_lease,
+                                     args=(queue, worker, task_id,
+                                           heartbeat_interval, stop))
+        heartbeat.daemon = True
+        heartbeat.start()
+
+        try:
+            try:
+                result = process_task(payload, settings)
+            finally:
+                stop.set()
+                heartbeat.join()
+        except Exception as ex:
+            LOG.debug("Failed to process task %d.", task_id)
+            LOG.debug(ex)
+            try:
+                queue.fail_task(worker, task_id, str(ex))
+                continue
+            except (EOFError, IOError):
+                break
+
+        try:
+            queue.put_result(worker, task_id, result)
+            processed += 1
+        except (EOFError, IOError):
+            break
+
+    queue.close()
+
+    LOG.debug("Worker %s processed %d tasks.", worker, processed)
+    return processed
@@ -17,6 +17,8 @@ import tempfile
 
 from codechecker_common.logger import get_logger
 
+from .analyzers import analyzer_info_cache
+
 LOG = get_logger('analyze')
 
 
@@ -24,6 +26,11 @@ def check_clang(compiler_bin, env):
     """
     Simple check if clang is available.
     """
+    # Only the version of the working analyzers is cached, so the failing
+    # ones are always checked again.
+    if analyzer_info_cache.get_version(compiler_bin, env) is not None:
+        return True
+
     clang_version_cmd = [compiler_bin, '--version']
     LOG.debug_analyzer(' '.join(clang_version_cmd))
     try:
@@ -48,9 +55,9 @@ def has_analyzer_config_option(clang_bin, config_option_name, env=None):
     """Check if an analyzer config option is available."""
     cmd = [clang_bin, "-cc1", "-analyzer-config-help"]
 
-    LOG.debug('run: "%s"', ' '.join(cmd))
+    def get_config_help():
+        LOG.debug('run: "%s"', ' '.join(cmd))
 
-    try:
         proc = subprocess.Popen(cmd,
                                 stdout=subprocess.PIPE,
                                 stderr=subprocess.PIPE,
@@ -58,6 +65,11 @@ def has_analyzer_config_option(clang_bin, config_option_name, env=None):
         out, err = proc.communicate()
         LOG.debug("stdout:\n%s", out)
         LOG.debug("stderr:\n%s", err)
+        return out
+
+    try:
+        out = analyzer_info_cache.get(clang_bin, 'analyzer-config-help',
+                                      get_config_help)
 
         match = re.search(config_option_name, out)
         if match:
@@ -73,6 +85,12 @@ def has_analyzer_option(clang_bin, feature, env=None):
     """Test if the analyzer has a specific option.
 
     Testing a feature is done by compiling a dummy file."""
+    return analyzer_info_cache.get(
+        clang_bin, 'analyzer-option:' + ' '.join(feature),
+        lambda: __compile_with_option(clang_bin, feature, env))
+
+
+def __compile_with_option(clang_bin, feature, env=None):
     with tempfile.NamedTemporaryFile() as inputFile:
         inputFile.write("void foo(){}")
         inputFile.flush()
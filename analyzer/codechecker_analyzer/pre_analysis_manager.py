@@ -10,7 +10,6 @@ from __future__ import print_function
 from __future__ import division
 from __future__ import absolute_import
 
-import multiprocessing
 import os
 import shutil
 import signal
@@ -83,9 +82,15 @@ def init_worker(checked_num, action_num):
 
 
 def pre_analyze(params):
+    """
+    Run the pre analysis of a build action. Returns a (triple arch, source,
+    translation unit id, regenerated) tuple if CTU data was collected for the
+    build action where regenerated is False if the CTU data of a previous
+    collect phase was reused.
+    """
 
     action, context, analyzer_config_map, skip_handler, \
-        ctu_data, statistics_data = params
+        ctu_data, statistics_data, triple_arch_cache = params
 
     analyzer_environment = env.extend(context.path_env_extra,
                                       context.ld_lib_path_extra)
@@ -105,6 +110,7 @@ def pre_analyze(params):
 
     config = analyzer_config_map.get(ClangSA.ANALYZER_NAME)
 
+    ctu_result = None
     try:
         if ctu_data:
             LOG.debug("running CTU pre analysis")
@@ -114,13 +120,31 @@ def pre_analyze(params):
             triple_arch = \
                 ctu_triple_arch.get_triple_arch(action, action.source,
                                                 config,
-                                                analyzer_environment)
-            ctu_manager.generate_ast(triple_arch, action, action.source,
-                                     config, analyzer_environment)
-            ctu_manager.map_functions(triple_arch, action, action.source,
-                                      config, analyzer_environment,
-                                      ctu_func_map_cmd,
-                                      ctu_temp_fnmap_folder)
+                                                analyzer_environment,
+                                                triple_arch_cache)
+
+            if ctu_manager.is_up_to_date(triple_arch, action, action.source,
+                                         config, ctu_func_map_cmd,
+                                         ctu_temp_fnmap_folder):
+                LOG.debug("CTU data of %s is up to date.", action.source)
+                ctu_result = (triple_arch, action.source,
+                              ctu_manager.get_tu_id(action), False)
+            else:
+                ast_ok = ctu_manager.generate_ast(triple_arch, action,
+                                                  action.source, config,
+                                                  analyzer_environment)
+                fnmap_ok = ctu_manager.map_functions(triple_arch, action,
+                                                     action.source, config,
+                                                     analyzer_environment,
+                                                     ctu_func_map_cmd,
+                                                     ctu_temp_fnmap_folder)
+                if ast_ok and fnmap_ok:
+                    ctu_manager.write_manifest(triple_arch, action,
+                                               action.source, config,
+                                               ctu_func_map_cmd)
+
+                ctu_result = (triple_arch, action.source,
+                              ctu_manager.get_tu_id(action), True)
 
     except Exception as ex:
         LOG.debug_analyzer(str(ex))
@@ -141,11 +165,19 @@ def pre_analyze(params):
         traceback.print_exc(file=sys.stdout)
         raise
 
+    return ctu_result
+
 
-def run_pre_analysis(actions, context, analyzer_config_map,
-                     jobs, skip_handler, ctu_data, statistics_data, manager):
+def start_pre_analysis(actions, context, analyzer_config_map, skip_handler,
+                       ctu_data, statistics_data, manager, worker_pool):
     """
-    Run multiple pre analysis jobs before the actual analysis.
+    Queue the pre analysis jobs of the build actions on the worker pool (see
+    analysis_manager.WorkerPool). Returns a function which waits for the
+    jobs and postprocesses their results, e.g. merges the CTU function maps.
+
+    The postprocessing runs on the postprocessing pool of the worker pool,
+    so the jobs queued on the worker pool after the pre analysis jobs can
+    run in the meantime.
     """
     LOG.info('Pre-analysis started.')
     if ctu_data:
@@ -155,20 +187,16 @@ def run_pre_analysis(actions, context, analyzer_config_map,
 
     def signal_handler(signum, frame):
         try:
-            pool.terminate()
+            worker_pool.terminate()
             manager.shutdown()
         finally:
             sys.exit(128 + signum)
 
     signal.signal(signal.SIGINT, signal_handler)
 
-    processed_var = multiprocessing.Value('i', 0)
-    actions_num = multiprocessing.Value('i', len(actions))
-
-    pool = multiprocessing.Pool(jobs,
-                                initializer=init_worker,
-                                initargs=(processed_var,
-                                          actions_num))
+    worker_pool.pre_checked_num.value = 0
+    worker_pool.pre_actions_num.value = len(actions)
+    worker_pool.pre_analysis_ready.clear()
 
     if statistics_data:
         # Statistics collection is enabled setup temporary
@@ -184,43 +212,101 @@ def run_pre_analysis(actions, context, analyzer_config_map,
 
         statistics_data['stat_tmp_dir'] = stat_tmp_dir
 
-    try:
-        collect_actions = [(build_action,
-                            context,
-                            analyzer_config_map,
-                            skip_handler,
-                            ctu_data,
-                            statistics_data)
-                           for build_action in actions]
-
-        pool.map_async(pre_analyze, collect_actions).get(float('inf'))
-        pool.close()
-    except Exception:
-        pool.terminate()
-        raise
-    finally:
-        pool.join()
+    # The triple arch of the compilation commands is shared by the workers
+    # and is kept in the CTU directory for the later runs.
+    triple_arch_cache = None
+    if ctu_data:
+        triple_arch_cache = manager.dict(
+            ctu_triple_arch.load_triple_arch_cache(ctu_data.get('ctu_dir')))
+
+    collect_actions = [(build_action,
+                        context,
+                        analyzer_config_map,
+                        skip_handler,
+                        ctu_data,
+                        statistics_data,
+                        triple_arch_cache)
+                       for build_action in actions]
+
+    async_results = worker_pool.pool.map_async(pre_analyze, collect_actions)
+
+    def finish_pre_analysis():
+        try:
+            results = async_results.get(float('inf'))
+        except Exception:
+            worker_pool.terminate()
+            raise
+
+        postprocess_pre_analysis(results, ctu_data, statistics_data,
+                                 triple_arch_cache, worker_pool)
+
+        worker_pool.pre_analysis_ready.set()
+        LOG.info('Pre-analysis finished.')
 
-    # Postprocessing the pre analysis results.
+    return finish_pre_analysis
+
+
+def postprocess_pre_analysis(results, ctu_data, statistics_data,
+                             triple_arch_cache, worker_pool):
+    """
+    Merge the CTU data and the statistics collected by the pre analysis.
+    """
     if ctu_data:
-        ctu_manager.merge_ctu_func_maps(
-                ctu_data.get('ctu_dir'),
-                ctu_data.get('ctu_func_map_file'),
-                ctu_data.get('ctu_temp_fnmap_folder'))
+        ctu_triple_arch.store_triple_arch_cache(ctu_data.get('ctu_dir'),
+                                                triple_arch_cache.copy())
+
+        ctu_results = [result for result in results if result]
+        collected = set((triple_arch, source, tu_id)
+                        for triple_arch, source, tu_id, _ in ctu_results)
+        regenerated = sum(1 for _, _, _, regen in ctu_results if regen)
+
+        LOG.info("CTU data of %d translation unit(s) was reused from the "
+                 "previous collect phase.", len(ctu_results) - regenerated)
+
+        removed = ctu_manager.remove_stale_tus(
+            ctu_data.get('ctu_dir'),
+            ctu_data.get('ctu_temp_fnmap_folder'),
+            collected)
+
+        # The global function map has to be rebuilt only if any of the
+        # function maps of the translation units have changed.
+        func_map_missing = any(
+            not os.path.exists(os.path.join(ctu_data.get('ctu_dir'),
+                                            triple_arch,
+                                            ctu_data.get('ctu_func_map_file')))
+            for triple_arch, _, _ in collected)
+
+        if regenerated or removed or func_map_missing:
+            ctu_manager.merge_ctu_func_maps(
+                    ctu_data.get('ctu_dir'),
+                    ctu_data.get('ctu_func_map_file'),
+                    ctu_data.get('ctu_temp_fnmap_folder'),
+                    worker_pool.jobs,
+                    worker_pool.postprocess_pool)
+        else:
+            LOG.debug("Global CTU function map is up to date.")
 
     if statistics_data:
 
         stats_in = statistics_data.get('stat_tmp_dir')
         stats_out = statistics_data.get('stats_out_dir')
 
-        statistics_collector.postprocess_stats(stats_in, stats_out,
-                                               statistics_data.get(
-                                                   'stats_min_sample_count'),
-                                               statistics_data.get(
-                                                   'stats_relevance_threshold')
-                                               )
+        statistics_collector.postprocess_stats(
+            stats_in, stats_out,
+            statistics_data.get('stats_min_sample_count'),
+            statistics_data.get('stats_relevance_threshold'),
+            worker_pool.jobs,
+            worker_pool.postprocess_pool)
 
         if os.path.exists(stats_in):
             LOG.debug('Cleaning up temporary statistics directory')
             shutil.rmtree(stats_in)
-    LOG.info('Pre-analysis finished.')
+
+
+def run_pre_analysis(actions, context, analyzer_config_map, skip_handler,
+                     ctu_data, statistics_data, manager, worker_pool):
+    """
+    Run multiple pre analysis jobs before the actual analysis.
+    """
+    start_pre_analysis(actions, context, analyzer_config_map, skip_handler,
+                       ctu_data, statistics_data, manager, worker_pool)()
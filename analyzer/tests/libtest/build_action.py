@@ -0,0 +1,35 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+"""
+Build action helpers of the unit tests.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+import os
+
+from codechecker_analyzer.buildlog.build_action import BuildAction
+
+
+def create_build_action(source, directory=None, analyzer_options=None,
+                        original_command=None, analyzer_type='clangsa'):
+    """
+    Return the build action which compiles the given C source file. By
+    default the build action is run in the directory of the source file.
+    """
+    return BuildAction(
+        analyzer_options=analyzer_options or [],
+        compiler_includes={'c': []},
+        compiler_standard={'c': ''},
+        analyzer_type=analyzer_type,
+        original_command=original_command or 'gcc -c ' + source,
+        directory=directory or os.path.dirname(source),
+        output='',
+        lang='c',
+        target={'c': ''},
+        source=source,
+        action_type=BuildAction.COMPILE)
@@ -0,0 +1,91 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the persistent analysis result cache.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from libtest.build_action import create_build_action
+
+from codechecker_analyzer.analysis_cache import AnalysisCache
+
+
+class AnalysisCacheTest(unittest.TestCase):
+    """
+    Test storing and restoring analysis results.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, 'cache')
+
+        self.header = os.path.join(self.tmp_dir, 'main.h')
+        with open(self.header, 'w') as header:
+            header.write('int f();\n')
+
+        self.source = os.path.join(self.tmp_dir, 'main.c')
+        with open(self.source, 'w') as source:
+            source.write('#include "main.h"\nint f() { return 0; }\n')
+
+        self.result_file = os.path.join(self.tmp_dir, 'main.c.plist')
+        with open(self.result_file, 'w') as result:
+            result.write('<plist/>\n')
+
+        self.action = create_build_action(self.source, self.tmp_dir)
+
+        self.analyzer_cmd = ['clang', '--analyze', self.source,
+                             '-o', self.result_file]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_key(self):
+        """
+        The key depends on the command and on the analyzer version but not on
+        the result file.
+        """
+        cache = AnalysisCache(self.cache_dir, {'clang': '1.0'})
+        key = cache.get_key(self.analyzer_cmd, self.result_file, 'clang')
+
+        other_cmd = ['clang', '--analyze', self.source, '-o', 'other.plist']
+        self.assertEqual(key, cache.get_key(other_cmd, 'other.plist',
+                                            'clang'))
+
+        self.assertNotEqual(key, cache.get_key(
+            self.analyzer_cmd + ['-DX'], self.result_file, 'clang'))
+
+        new_cache = AnalysisCache(self.cache_dir, {'clang': '2.0'})
+        self.assertNotEqual(key, new_cache.get_key(
+            self.analyzer_cmd, self.result_file, 'clang'))
+
+    def test_restore(self):
+        """
+        Stored results are restored until a file of the TU changes.
+        """
+        cache = AnalysisCache(self.cache_dir)
+        key = cache.get_key(self.analyzer_cmd, self.result_file, 'clang')
+
+        restored = os.path.join(self.tmp_dir, 'restored.plist')
+        self.assertFalse(cache.restore(key, restored))
+
+        cache.store(key, self.action, self.result_file)
+        self.assertTrue(cache.restore(key, restored))
+        with open(restored, 'r') as result:
+            self.assertEqual(result.read(), '<plist/>\n')
+
+        with open(self.header, 'a') as header:
+            header.write('int g();\n')
+        os.remove(restored)
+        self.assertFalse(cache.restore(key, restored))
+        self.assertFalse(os.path.exists(restored))
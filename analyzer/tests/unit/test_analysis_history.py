@@ -0,0 +1,163 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the scheduling of the build actions based on the analysis history.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from libtest.build_action import create_build_action
+
+from codechecker_analyzer.analysis_history import AnalysisHistory, \
+    DURATION_HISTORY_LENGTH, MIN_ADAPTIVE_TIMEOUT, predict_makespan, \
+    schedule_longest_first
+from codechecker_analyzer.buildlog.build_action import get_action_key
+
+
+class AnalysisHistoryTest(unittest.TestCase):
+    """
+    Test the analysis history and the longest-first scheduling.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+        self.actions = []
+        for name, size in [('small.c', 10), ('big.c', 1000),
+                           ('medium.c', 100)]:
+            source = os.path.join(self.tmp_dir, name)
+            with open(source, 'w') as src:
+                src.write('x' * size)
+            self.actions.append(create_build_action(source))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_size_fallback(self):
+        """
+        Without history the biggest source files are analyzed first.
+        """
+        history = AnalysisHistory(self.tmp_dir)
+        durations, has_history = history.estimate_durations(self.actions)
+        self.assertFalse(has_history)
+
+        ordered = schedule_longest_first(self.actions, durations)
+        self.assertEqual([os.path.basename(a.source) for a in ordered],
+                         ['big.c', 'medium.c', 'small.c'])
+
+    def test_persisted_durations(self):
+        """
+        The measured durations are used in the next run.
+        """
+        history = AnalysisHistory(self.tmp_dir)
+        history.update(self.actions[0], duration=50.0)
+        history.update(self.actions[1], duration=5.0)
+        history.write()
+
+        history = AnalysisHistory(self.tmp_dir)
+        durations, has_history = history.estimate_durations(self.actions)
+        self.assertTrue(has_history)
+        self.assertEqual(durations[0], 50.0)
+        self.assertEqual(durations[1], 5.0)
+
+        ordered = schedule_longest_first(self.actions, durations)
+        self.assertEqual(os.path.basename(ordered[0].source), 'small.c')
+
+    def test_peak_memory(self):
+        """
+        Actions without history are expected to use the average memory.
+        """
+        history = AnalysisHistory(self.tmp_dir)
+        history.update(self.actions[0], peak_memory=100)
+        history.update(self.actions[1], peak_memory=300)
+
+        self.assertEqual(history.estimate_peak_memory(self.actions),
+                         [100, 300, 200])
+
+    def test_adaptive_timeouts(self):
+        """
+        The timeout is the multiple of the longest analysis in the last runs
+        within the given limits.
+        """
+        history = AnalysisHistory(self.tmp_dir)
+        for duration in [100.0, 200.0, 150.0]:
+            history.add_duration(self.actions[0], duration)
+        history.add_duration(self.actions[1], 1.0)
+        history.write()
+
+        history = AnalysisHistory(self.tmp_dir)
+        self.assertEqual(history.estimate_timeouts(self.actions, 2),
+                         [400, MIN_ADAPTIVE_TIMEOUT, None])
+        self.assertEqual(history.estimate_timeouts(self.actions, 2, 300),
+                         [300, MIN_ADAPTIVE_TIMEOUT, 300])
+
+        # Only the last durations are kept.
+        for _ in range(DURATION_HISTORY_LENGTH):
+            history.add_duration(self.actions[0], 50.0)
+        self.assertEqual(history.estimate_timeouts(self.actions, 3)[0], 150)
+
+    def test_timed_out_last(self):
+        """
+        The actions killed by the timeout are retried at the end with the
+        full timeout.
+        """
+        history = AnalysisHistory(self.tmp_dir)
+        for action, duration in zip(self.actions, [100.0, 200.0, 50.0]):
+            history.add_duration(action, duration)
+        history.add_duration(self.actions[1], 400.0, timed_out=True)
+
+        durations, _ = history.estimate_durations(self.actions)
+        ordered = schedule_longest_first(self.actions, durations, history)
+        self.assertEqual([os.path.basename(a.source) for a in ordered],
+                         ['small.c', 'medium.c', 'big.c'])
+
+        self.assertEqual(history.estimate_timeouts(self.actions, 2, 1000),
+                         [200, 1000, 100])
+
+    def test_action_key(self):
+        """
+        The same command run in different directories has its own history.
+        """
+        source = self.actions[0].source
+        build_dir = os.path.join(self.tmp_dir, 'build')
+        other_dir = os.path.join(self.tmp_dir, 'other')
+
+        action = create_build_action(source, build_dir,
+                                     original_command='gcc -c ../small.c')
+        other = create_build_action(source, other_dir,
+                                    original_command='gcc -c ../small.c')
+        self.assertNotEqual(get_action_key(action), get_action_key(other))
+
+        history = AnalysisHistory(self.tmp_dir)
+        history.add_duration(action, 10.0)
+        self.assertIsNone(history.get(other, 'duration'))
+
+    def test_non_ascii_action_key(self):
+        """
+        The non-ASCII byte string commands are hashed as they are.
+        """
+        command = u'gcc -DNAME=\u00e9 -c small.c'
+        action = create_build_action(self.actions[0].source,
+                                     original_command=command.encode('utf-8'))
+        unicode_action = create_build_action(self.actions[0].source,
+                                             original_command=command)
+        self.assertEqual(get_action_key(action),
+                         get_action_key(unicode_action))
+
+    def test_predict_makespan(self):
+        """
+        Longest-first scheduling on multiple workers.
+        """
+        self.assertEqual(predict_makespan([4, 4, 3, 3], 2), 7)
+        self.assertEqual(predict_makespan([5, 4, 3], 1), 12)
+        self.assertEqual(predict_makespan([], 4), 0)
@@ -0,0 +1,111 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the progress journal of the analysis.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from libtest.build_action import create_build_action
+
+from codechecker_analyzer.analysis_journal import AnalysisJournal, \
+    get_resumed_result
+from codechecker_analyzer.buildlog.build_action import get_action_key
+
+
+class AnalysisJournalTest(unittest.TestCase):
+    """
+    Test recording and loading the completed build actions.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.journal_file = os.path.join(self.tmp_dir,
+                                         AnalysisJournal.FILE_NAME)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def __create_action(self, source):
+        return create_build_action(source, self.tmp_dir)
+
+    def __create_result(self, action, return_code):
+        result_file = os.path.join(self.tmp_dir,
+                                   os.path.basename(action.source) + '.plist')
+        with open(result_file, 'w') as result:
+            result.write('plist')
+
+        return (return_code, False, False, action.analyzer_type, result_file,
+                action.source, False, 1.5, 1024)
+
+    def test_record_and_load(self):
+        """ The recorded results can be restored. """
+        main = self.__create_action('main.c')
+        lib = self.__create_action('lib.c')
+        main_result = self.__create_result(main, 0)
+        lib_result = self.__create_result(lib, 1)
+
+        journal = AnalysisJournal(self.tmp_dir)
+        journal.open()
+        journal.record(main, main_result)
+        journal.record(lib, lib_result)
+        journal.close()
+
+        records = AnalysisJournal(self.tmp_dir).load()
+        self.assertEqual(len(records), 2)
+        self.assertEqual(get_resumed_result(records[get_action_key(main)]),
+                         main_result)
+        self.assertEqual(get_resumed_result(records[get_action_key(lib)]),
+                         lib_result)
+
+        # The successful analysis is repeated if its results are missing.
+        os.remove(main_result[4])
+        self.assertIsNone(
+            get_resumed_result(records[get_action_key(main)]))
+
+        # The journal is not resumed by a new analysis.
+        journal.open()
+        journal.close()
+        self.assertEqual(journal.load(), {})
+
+        journal.remove()
+        self.assertFalse(os.path.exists(self.journal_file))
+
+    def test_interrupted_record(self):
+        """ A partially written record is ignored when resuming. """
+        main = self.__create_action('main.c')
+        lib = self.__create_action('lib.c')
+
+        journal = AnalysisJournal(self.tmp_dir)
+        journal.open()
+        journal.record(main, self.__create_result(main, 0))
+        journal.close()
+
+        with open(self.journal_file, 'a') as journal_file:
+            journal_file.write('{"key": "')
+
+        journal.open(resume=True)
+        journal.record(lib, self.__create_result(lib, 0))
+        journal.close()
+
+        records = journal.load()
+        self.assertEqual(sorted(records.keys()),
+                         sorted([get_action_key(main), get_action_key(lib)]))
+
+    def test_action_key(self):
+        """ The key depends on the analyzer and the compilation command. """
+        main = self.__create_action('main.c')
+        self.assertEqual(get_action_key(main),
+                         get_action_key(self.__create_action('main.c')))
+        self.assertNotEqual(get_action_key(main),
+                            get_action_key(self.__create_action('lib.c')))
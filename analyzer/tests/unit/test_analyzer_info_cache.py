@@ -0,0 +1,120 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the user level cache of the analyzer information.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+from codechecker_analyzer.analyzers import analyzer_info_cache
+from codechecker_analyzer.analyzers.clangtidy.analyzer import ClangTidy
+
+
+class FakeConfig(object):
+    def __init__(self, analyzer_binary):
+        self.analyzer_binary = analyzer_binary
+
+
+class AnalyzerInfoCacheTest(unittest.TestCase):
+    """
+    Test that the analyzer binaries are invoked only on a cache miss.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, 'cache')
+        self.calls = os.path.join(self.tmp_dir, 'calls')
+
+        self.env_backup = os.environ.get(analyzer_info_cache.CACHE_DIR_ENV_VAR)
+        os.environ[analyzer_info_cache.CACHE_DIR_ENV_VAR] = self.cache_dir
+        analyzer_info_cache._memory_cache.clear()
+
+        # An analyzer which counts its invocations.
+        self.analyzer = os.path.join(self.tmp_dir, 'fake-clang-tidy')
+        with open(self.analyzer, 'w') as analyzer:
+            analyzer.write('#!/bin/sh\n'
+                           'echo >> "{0}"\n'
+                           'if [ "$1" = "--version" ]; then\n'
+                           '  echo "LLVM version 8.0.0"\n'
+                           'else\n'
+                           '  echo "Enabled checks:"\n'
+                           '  echo "    bugprone-use-after-move"\n'
+                           '  echo "    clang-analyzer-core.DivideZero"\n'
+                           'fi\n'.format(self.calls))
+        os.chmod(self.analyzer, stat.S_IRWXU)
+
+    def tearDown(self):
+        if self.env_backup is None:
+            del os.environ[analyzer_info_cache.CACHE_DIR_ENV_VAR]
+        else:
+            os.environ[analyzer_info_cache.CACHE_DIR_ENV_VAR] = \
+                self.env_backup
+
+        analyzer_info_cache._memory_cache.clear()
+        shutil.rmtree(self.tmp_dir)
+
+    def __call_count(self):
+        if not os.path.exists(self.calls):
+            return 0
+        with open(self.calls) as calls:
+            return len(calls.readlines())
+
+    def __get_checkers(self):
+        return ClangTidy.get_analyzer_checkers(FakeConfig(self.analyzer),
+                                               os.environ)
+
+    def test_checkers(self):
+        """ The checker list is cached in the memory and in the files. """
+        checkers = [('bugprone-use-after-move', '')]
+
+        self.assertEqual(self.__get_checkers(), checkers)
+        self.assertEqual(self.__get_checkers(), checkers)
+        self.assertEqual(self.__call_count(), 1)
+
+        # Started again.
+        analyzer_info_cache._memory_cache.clear()
+        self.assertEqual(self.__get_checkers(), checkers)
+        self.assertEqual(self.__call_count(), 1)
+
+        # The analyzer is reinstalled.
+        analyzer_info_cache._memory_cache.clear()
+        binary_stat = os.stat(self.analyzer)
+        os.utime(self.analyzer, (binary_stat.st_atime,
+                                 binary_stat.st_mtime + 10))
+        self.assertEqual(self.__get_checkers(), checkers)
+        self.assertEqual(self.__call_count(), 2)
+
+    def test_version(self):
+        """ Only the successful queries are cached. """
+        self.assertEqual(analyzer_info_cache.get_version(self.analyzer),
+                         'LLVM version 8.0.0\n')
+        self.assertEqual(analyzer_info_cache.get_version(self.analyzer),
+                         'LLVM version 8.0.0\n')
+        self.assertEqual(self.__call_count(), 1)
+
+        self.assertIsNone(analyzer_info_cache.get_version(
+            os.path.join(self.tmp_dir, 'missing-clang')))
+
+        computed = []
+        for _ in range(2):
+            analyzer_info_cache.get(self.analyzer, 'failing',
+                                    lambda: computed.append(1))
+        self.assertEqual(len(computed), 2)
+
+    def test_disabled_cache(self):
+        """ Nothing is stored if the cache is disabled. """
+        os.environ[analyzer_info_cache.CACHE_DIR_ENV_VAR] = ''
+
+        self.assertEqual(len(self.__get_checkers()), 1)
+        self.assertFalse(os.path.exists(self.cache_dir))
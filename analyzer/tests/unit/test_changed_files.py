@@ -0,0 +1,117 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the prioritization of the build actions affected by the changed files.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from libtest.build_action import create_build_action
+
+from codechecker_analyzer.analysis_manager import defer_pre_analysis_waits
+from codechecker_analyzer.changed_files import ChangedFiles, \
+    parse_changed_files, prioritize
+
+
+GIT_DIFF = """diff --git a/src/main.c b/src/main.c
+index 1111111..2222222 100644
+--- a/src/main.c
++++ b/src/main.c
+@@ -1 +1 @@
+-int main() { return 0; }
++int main() { return 1; }
+diff --git a/include/old.h b/include/old.h
+deleted file mode 100644
+--- a/include/old.h
++++ /dev/null
+@@ -1 +0,0 @@
+-int old();
+"""
+
+
+class ChangedFilesTest(unittest.TestCase):
+    """
+    Test reading the changed files and finding the affected build actions.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+        with open(os.path.join(self.tmp_dir, 'lib.h'), 'w') as header:
+            header.write('int lib();\n')
+
+        self.actions = []
+        for name, content in [('a.c', 'int a() { return 0; }\n'),
+                              ('b.c', '#include "lib.h"\n'),
+                              ('c.c', 'int c() { return 0; }\n')]:
+            source = os.path.join(self.tmp_dir, name)
+            with open(source, 'w') as src:
+                src.write(content)
+
+            self.actions.append(create_build_action(source, self.tmp_dir))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_parse(self):
+        """ The changed files are read from a list or from a diff. """
+        self.assertEqual(parse_changed_files(['a.c\n', '\n', ' b/c.h \n']),
+                         set(['a.c', 'b/c.h']))
+        self.assertEqual(parse_changed_files(GIT_DIFF.splitlines(True)),
+                         set(['src/main.c', 'include/old.h']))
+
+    def test_relative_paths(self):
+        """ Relative paths match the end of the paths. """
+        changed_files = ChangedFiles(['src/main.c', '/abs/lib.h'])
+        self.assertIn('/repo/src/main.c', changed_files)
+        self.assertIn('/abs/lib.h', changed_files)
+        self.assertNotIn('/repo/mysrc/main.c', changed_files)
+        self.assertNotIn('/other/abs/lib.h', changed_files)
+
+    def test_changed_source(self):
+        """ The build action of a changed source is affected. """
+        changed_files = ChangedFiles(['c.c'])
+        affected = changed_files.get_affected_actions(self.actions)
+        self.assertEqual(affected, set([self.actions[2]]))
+
+        self.assertEqual(prioritize(self.actions, affected),
+                         [self.actions[2], self.actions[0], self.actions[1]])
+
+    def test_changed_header(self):
+        """ The build actions including a changed header are affected. """
+        changed_files = ChangedFiles([os.path.join(self.tmp_dir, 'lib.h'),
+                                      'a.c'])
+        affected = changed_files.get_affected_actions(self.actions, 2)
+        self.assertEqual(affected, set(self.actions[:2]))
+
+    def test_pre_analysis_order(self):
+        """
+        The analyses waiting for the pre-analysis are started after the
+        other analyses, but the affected build actions are still first.
+        """
+        tidy_actions = [create_build_action(action.source, self.tmp_dir,
+                                            analyzer_type='clang-tidy')
+                        for action in self.actions]
+        actions = [action for pair in zip(self.actions, tidy_actions)
+                   for action in pair]
+
+        changed_files = ChangedFiles(['c.c'])
+        affected = changed_files.get_affected_actions(actions)
+        self.assertEqual(affected, set([self.actions[2], tidy_actions[2]]))
+
+        actions = defer_pre_analysis_waits(prioritize(actions, affected),
+                                           affected)
+        self.assertEqual(actions,
+                         [self.actions[2], tidy_actions[2],
+                          tidy_actions[0], tidy_actions[1],
+                          self.actions[0], self.actions[1]])
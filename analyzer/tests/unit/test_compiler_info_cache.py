@@ -0,0 +1,99 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the user level implicit compiler info cache.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+from codechecker_analyzer.buildlog import compiler_info_cache
+from codechecker_analyzer.buildlog.log_parser import ImplicitCompilerInfo
+
+
+class CompilerInfoCacheTest(unittest.TestCase):
+    """
+    Test storing and reusing the implicit compiler information.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, 'cache')
+
+        self.env_backup = os.environ.get(compiler_info_cache.CACHE_DIR_ENV_VAR)
+        os.environ[compiler_info_cache.CACHE_DIR_ENV_VAR] = self.cache_dir
+
+        # A compiler which reports the given target.
+        self.compiler = os.path.join(self.tmp_dir, 'fake-gcc')
+        with open(self.compiler, 'w') as compiler:
+            compiler.write('#!/bin/sh\necho "Target: fake-target" >&2\n')
+        os.chmod(self.compiler, stat.S_IRWXU)
+
+    def tearDown(self):
+        if self.env_backup is None:
+            del os.environ[compiler_info_cache.CACHE_DIR_ENV_VAR]
+        else:
+            os.environ[compiler_info_cache.CACHE_DIR_ENV_VAR] = \
+                self.env_backup
+
+        shutil.rmtree(self.tmp_dir)
+
+    def test_key(self):
+        """ The key depends on the compiler binary and the flags. """
+        key = compiler_info_cache.get_key(self.compiler, [])
+        self.assertEqual(key, compiler_info_cache.get_key(self.compiler, []))
+        self.assertNotEqual(key,
+                            compiler_info_cache.get_key(self.compiler,
+                                                        ['-m32']))
+
+        with open(self.compiler, 'a') as compiler:
+            compiler.write('# Reinstalled.\n')
+        self.assertNotEqual(key,
+                            compiler_info_cache.get_key(self.compiler, []))
+
+        self.assertIsNone(compiler_info_cache.get_key(
+            os.path.join(self.tmp_dir, 'missing-gcc'), []))
+
+    def test_store_and_get(self):
+        """ Stored entries can be read back. """
+        cache = compiler_info_cache.CompilerInfoCache(self.cache_dir)
+        self.assertIsNone(cache.get('key'))
+
+        cache.store('key', {'c': {'target': 'x86_64'}})
+        self.assertEqual(cache.get('key'), {'c': {'target': 'x86_64'}})
+
+    def test_compiler_not_invoked_on_cache_hit(self):
+        """ The compiler is invoked only if there is no cache entry. """
+        compiler_info = ImplicitCompilerInfo.get_cached_compiler_info(
+            self.compiler, [])
+        self.assertEqual(compiler_info['c']['target'], 'fake-target')
+        self.assertEqual(compiler_info['c++']['target'], 'fake-target')
+
+        key = compiler_info_cache.get_key(self.compiler, [])
+        cache = compiler_info_cache.CompilerInfoCache(self.cache_dir)
+        self.assertEqual(cache.get(key)['c']['target'], 'fake-target')
+
+        # Modify the cache entry to see that it is used.
+        cache.store(key, {'c': {'target': 'cached-target'}})
+        compiler_info = ImplicitCompilerInfo.get_cached_compiler_info(
+            self.compiler, [])
+        self.assertEqual(compiler_info['c']['target'], 'cached-target')
+
+    def test_disabled_cache(self):
+        """ Nothing is stored if the cache is disabled. """
+        os.environ[compiler_info_cache.CACHE_DIR_ENV_VAR] = ''
+
+        compiler_info = ImplicitCompilerInfo.get_cached_compiler_info(
+            self.compiler, [])
+        self.assertEqual(compiler_info['c']['target'], 'fake-target')
+        self.assertFalse(os.path.exists(self.cache_dir))
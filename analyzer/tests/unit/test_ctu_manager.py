@@ -0,0 +1,244 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the reuse of the CTU data of the previous collect phases.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from distutils.spawn import find_executable
+import os
+import shutil
+import tempfile
+import unittest
+
+from libtest.build_action import create_build_action
+
+from codechecker_analyzer.analyzers.clangsa import ctu_manager
+
+
+class FakeConfig(object):
+    def __init__(self, ctu_dir):
+        self.ctu_dir = ctu_dir
+        self.analyzer_binary = find_executable('gcc')
+        self.analyzer_extra_arguments = []
+
+
+class CTUManagerTest(unittest.TestCase):
+    """
+    Test the manifests of the translation units in the CTU directory.
+    """
+
+    FNMAP_FOLDER = 'externalFnMaps'
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.config = FakeConfig(os.path.join(self.tmp_dir, 'ctu-dir'))
+        self.func_map_cmd = self.config.analyzer_binary
+
+        self.header = os.path.join(self.tmp_dir, 'main.h')
+        with open(self.header, 'w') as header:
+            header.write('int f();\n')
+
+        self.source = os.path.join(self.tmp_dir, 'main.c')
+        with open(self.source, 'w') as source:
+            source.write('#include "main.h"\nint f() { return 0; }\n')
+
+        self.action = self.__create_action([])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def __create_action(self, options):
+        return create_build_action(self.source, self.tmp_dir, options,
+                                   ' '.join(['gcc', '-c', self.source] +
+                                            options))
+
+    def __collect(self, action):
+        """ Create the CTU files of the translation unit like the collect
+        phase. """
+        ast_path = ctu_manager.get_ast_path(self.config.ctu_dir, 'x86_64',
+                                            self.source)
+        fnmap_dir = os.path.join(self.config.ctu_dir, 'x86_64',
+                                 self.FNMAP_FOLDER)
+        for folder in [os.path.dirname(ast_path), fnmap_dir]:
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+
+        with open(ast_path, 'w') as ast:
+            ast.write('AST ' + action.original_command)
+        with open(os.path.join(fnmap_dir,
+                               ctu_manager.get_tu_id(action)),
+                  'w') as fnmap:
+            fnmap.write('c:@F@f ast/main.c.ast\n')
+
+        ctu_manager.write_manifest('x86_64', action, self.source,
+                                   self.config, self.func_map_cmd)
+
+    def __is_up_to_date(self, action):
+        return ctu_manager.is_up_to_date('x86_64', action, self.source,
+                                         self.config, self.func_map_cmd,
+                                         self.FNMAP_FOLDER)
+
+    def test_reuse_unchanged(self):
+        """ The CTU data is reused only if nothing has changed. """
+        self.assertFalse(self.__is_up_to_date(self.action))
+
+        self.__collect(self.action)
+        self.assertTrue(self.__is_up_to_date(self.action))
+
+        # The compilation command changes.
+        self.assertFalse(self.__is_up_to_date(
+            self.__create_action(['-DDEBUG'])))
+
+        # An included header changes.
+        with open(self.header, 'a') as header:
+            header.write('int g();\n')
+        self.assertFalse(self.__is_up_to_date(self.action))
+
+    def test_missing_ast(self):
+        """ The CTU data is regenerated if the AST file is missing. """
+        self.__collect(self.action)
+        os.remove(ctu_manager.get_ast_path(self.config.ctu_dir, 'x86_64',
+                                           self.source))
+        self.assertFalse(self.__is_up_to_date(self.action))
+
+    def test_remove_stale(self):
+        """ The data of the translation units not collected is removed. """
+        self.__collect(self.action)
+
+        collected = set([('x86_64', self.source,
+                          ctu_manager.get_tu_id(self.action))])
+        self.assertFalse(ctu_manager.remove_stale_tus(self.config.ctu_dir,
+                                                      self.FNMAP_FOLDER,
+                                                      collected))
+        self.assertTrue(self.__is_up_to_date(self.action))
+
+        self.assertTrue(ctu_manager.remove_stale_tus(self.config.ctu_dir,
+                                                     self.FNMAP_FOLDER,
+                                                     set()))
+        self.assertFalse(os.path.exists(
+            ctu_manager.get_ast_path(self.config.ctu_dir, 'x86_64',
+                                     self.source)))
+        self.assertFalse(ctu_manager.remove_stale_tus(self.config.ctu_dir,
+                                                      self.FNMAP_FOLDER,
+                                                      set()))
+
+    def test_same_source(self):
+        """ The build actions compiling the same source file have their own
+        manifests and function maps, but share the AST file. """
+        other_action = self.__create_action(['-DDEBUG'])
+        self.__collect(self.action)
+        self.__collect(other_action)
+        self.assertTrue(self.__is_up_to_date(other_action))
+
+        # The AST file was regenerated by the other build action.
+        self.assertFalse(self.__is_up_to_date(self.action))
+
+        # The shared AST file of a collected build action is kept.
+        collected = set([('x86_64', self.source,
+                          ctu_manager.get_tu_id(other_action))])
+        self.assertTrue(ctu_manager.remove_stale_tus(self.config.ctu_dir,
+                                                     self.FNMAP_FOLDER,
+                                                     collected))
+        self.assertTrue(self.__is_up_to_date(other_action))
+
+
+class GlobalFuncMapTest(unittest.TestCase):
+    """
+    Test merging the function maps of the translation units.
+    """
+
+    FNMAP_FOLDER = 'externalFnMaps'
+    MAP_FILE = 'externalDefMap.txt'
+
+    def setUp(self):
+        self.ctu_dir = tempfile.mkdtemp()
+        self.partition_size = ctu_manager.MERGE_PARTITION_SIZE
+
+        for arch in ['x86_64', 'arm']:
+            fnmap_dir = os.path.join(self.ctu_dir, arch, self.FNMAP_FOLDER)
+            os.makedirs(fnmap_dir)
+
+            for tu in range(10):
+                with open(os.path.join(fnmap_dir, str(tu)), 'w') as fnmap:
+                    for func in range(50):
+                        fnmap.write('c:@F@f{0}_{1} ast/{0}.c.ast\n'
+                                    .format(tu, func))
+                    # Defined in every translation unit.
+                    fnmap.write('c:@F@main ast/{0}.c.ast\n'.format(tu))
+                    # Defined twice in the same translation unit.
+                    fnmap.write('c:@F@inline{0} ast/{0}.c.ast\n'.format(tu))
+                    fnmap.write('c:@F@inline{0} ast/{0}.c.ast\n'.format(tu))
+
+    def tearDown(self):
+        ctu_manager.MERGE_PARTITION_SIZE = self.partition_size
+        shutil.rmtree(self.ctu_dir)
+
+    def __read_map(self, arch):
+        with open(os.path.join(self.ctu_dir, arch, self.MAP_FILE)) as f:
+            return [line.rstrip('\n').split(' ', 1) for line in f]
+
+    def test_merge(self):
+        """
+        The global map is sorted and does not contain the conflicting names
+        independently of the number of partitions and the parallel jobs.
+        """
+        for partition_size, jobs in [(1 << 20, 1), (1024, 2)]:
+            ctu_manager.MERGE_PARTITION_SIZE = partition_size
+            ctu_manager.merge_ctu_func_maps(self.ctu_dir, self.MAP_FILE,
+                                            self.FNMAP_FOLDER, jobs)
+
+            for arch in ['x86_64', 'arm']:
+                func_map = self.__read_map(arch)
+                names = [name for name, _ in func_map]
+
+                self.assertEqual(len(func_map), 10 * 51)
+                self.assertEqual(names, sorted(names))
+                self.assertNotIn('c:@F@main', names)
+                self.assertIn(['c:@F@inline3', 'ast/3.c.ast'], func_map)
+
+                # The temporary partitions are removed.
+                self.assertEqual(
+                    sorted(os.listdir(os.path.join(self.ctu_dir, arch))),
+                    sorted([self.FNMAP_FOLDER, self.MAP_FILE,
+                            self.MAP_FILE + ctu_manager.INDEX_SUFFIX]))
+
+    def test_lookup(self):
+        """ Names can be looked up with and without the index. """
+        ctu_manager.merge_ctu_func_maps(self.ctu_dir, self.MAP_FILE,
+                                        self.FNMAP_FOLDER)
+
+        map_file = os.path.join(self.ctu_dir, 'arm', self.MAP_FILE)
+        for with_index in [True, False]:
+            if not with_index:
+                os.remove(map_file + ctu_manager.INDEX_SUFFIX)
+
+            for name, ast_file in self.__read_map('arm'):
+                self.assertEqual(
+                    ctu_manager.lookup_global_map(map_file, name), ast_file)
+
+            for name in ['a', 'c:@F@main', 'c:@F@f3_', 'zzz']:
+                self.assertIsNone(
+                    ctu_manager.lookup_global_map(map_file, name))
+
+    def test_lookup_first_block(self):
+        """ The lookup stops at the first bigger name in the first block. """
+        map_file = os.path.join(self.ctu_dir, self.MAP_FILE)
+        with open(map_file, 'w') as func_map:
+            # The last line is out of order, so it is found only if the whole
+            # map is read.
+            func_map.write('c:@F@a ast/a.c.ast\n'
+                           'c:@F@c ast/c.c.ast\n'
+                           'c:@F@b ast/b.c.ast\n')
+        with open(map_file + ctu_manager.INDEX_SUFFIX, 'w') as index:
+            index.write('c:@F@a 0\n')
+
+        self.assertEqual(ctu_manager.lookup_global_map(map_file, 'c:@F@c'),
+                         'ast/c.c.ast')
+        self.assertIsNone(ctu_manager.lookup_global_map(map_file, 'c:@F@b'))
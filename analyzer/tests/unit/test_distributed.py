@@ -0,0 +1,120 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the coordinator and the workers of the distributed analysis.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import multiprocessing
+import os
+import unittest
+
+from codechecker_analyzer import distributed
+
+AUTHKEY = b'test'
+
+
+def square(task, settings):
+    return task * task + settings['offset']
+
+
+def fail_on_odd(task, settings):
+    if task % 2:
+        raise ValueError("Odd task")
+    return task
+
+
+def die_on_first(task, settings):
+    if task == 0:
+        # Simulate a worker which dies without releasing its task.
+        os._exit(1)
+    return task
+
+
+def start_worker(process_task):
+    """
+    Start a worker process which connects to the coordinator address sent
+    through the returned pipe. The worker is forked before the coordinator
+    starts its threads.
+    """
+    reader, writer = multiprocessing.Pipe(False)
+
+    def run():
+        distributed.run_worker(reader.recv(), AUTHKEY, process_task, None,
+                               0.1)
+
+    worker = multiprocessing.Process(target=run)
+    worker.start()
+    return worker, writer
+
+
+def run_tasks(tasks, process_task, worker_num, lease_timeout=10,
+              max_attempts=distributed.MAX_ATTEMPTS):
+    """
+    Process the tasks with workers running on the localhost and return the
+    results in order of the tasks.
+    """
+    workers = [start_worker(process_task) for _ in range(worker_num)]
+
+    coordinator = distributed.Coordinator(('127.0.0.1', 0), AUTHKEY, tasks,
+                                          {'offset': 1}, lease_timeout,
+                                          max_attempts)
+    coordinator.start()
+
+    for _, address_pipe in workers:
+        address_pipe.send(coordinator.address)
+
+    results = {}
+
+    def handle_result(task_id, result):
+        results[task_id] = result
+
+    try:
+        coordinator.wait(handle_result, 0.1)
+    finally:
+        coordinator.shutdown()
+        for worker, _ in workers:
+            worker.join()
+
+    return [results[i] for i in range(len(tasks))]
+
+
+class DistributedTest(unittest.TestCase):
+    """
+    Test the coordinator with several workers on the localhost.
+    """
+
+    def test_parse_address(self):
+        self.assertEqual(distributed.parse_address('localhost:8080'),
+                         ('localhost', 8080))
+        with self.assertRaises(ValueError):
+            distributed.parse_address('localhost')
+
+    def test_workers(self):
+        """
+        Every task is processed exactly once.
+        """
+        tasks = list(range(20))
+        self.assertEqual(run_tasks(tasks, square, 3),
+                         [i * i + 1 for i in tasks])
+
+    def test_failed_tasks(self):
+        """
+        Failed tasks are retried and their result is None if every attempt
+        failed.
+        """
+        self.assertEqual(run_tasks(list(range(4)), fail_on_odd, 2),
+                         [0, None, 2, None])
+
+    def test_expired_lease(self):
+        """
+        The task of a dead worker is given to another worker.
+        """
+        results = run_tasks(list(range(4)), die_on_first, 2, 1, 1)
+        self.assertEqual(results, [None, 1, 2, 3])
@@ -0,0 +1,145 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the store of the debug data of the failed analyses.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+from codechecker_common import failure_store
+from codechecker_common.failure_store import FailureStore, \
+    should_collect_sources
+
+
+class FailureStoreTest(unittest.TestCase):
+    """
+    Test recording the failures and writing the debug zips.
+    """
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.failed_dir = os.path.join(self.output_dir, 'failed')
+        os.makedirs(self.failed_dir)
+
+        self.header = os.path.join(self.output_dir, 'common.h')
+        with open(self.header, 'w') as header:
+            header.write('int f();\n')
+
+        self.sources = []
+        for name in ['a.c', 'b.c']:
+            source = os.path.join(self.output_dir, name)
+            with open(source, 'w') as src:
+                src.write('#include "common.h"\n// ' + name + '\n')
+            self.sources.append(source)
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def __record(self, store, source):
+        zip_file = os.path.join(self.failed_dir,
+                                os.path.basename(source) + '.zip')
+        store.write_manifest(
+            zip_file,
+            {'build-action': 'gcc -c ' + source, 'return-code': '1'},
+            {'sources-root' + source: source,
+             'sources-root' + self.header: self.header})
+        return zip_file
+
+    def test_deduplicated_blobs(self):
+        """ The files shared by the failures are stored only once. """
+        store = FailureStore(self.output_dir)
+        zip_files = [self.__record(store, source) for source in self.sources]
+
+        blob_dir = os.path.join(self.output_dir, failure_store.STORE_DIR,
+                                'blobs')
+        blobs = [blob for _, _, files in os.walk(blob_dir) for blob in files]
+        self.assertEqual(len(blobs), 3)
+
+        # The zips are written only on request.
+        self.assertEqual(os.listdir(self.failed_dir), [])
+
+        manifests = store.get_manifests()
+        self.assertEqual(len(manifests), 2)
+        self.assertEqual(sorted(FailureStore.get_zip_name(manifest)
+                                for manifest in manifests),
+                         sorted(os.path.basename(zip_file)
+                                for zip_file in zip_files))
+        for manifest in manifests:
+            store.write_zip(manifest)
+        self.assertEqual(store.get_manifests(), manifests)
+
+        for zip_file, source in zip(zip_files, self.sources):
+            with zipfile.ZipFile(zip_file, 'r') as archive:
+                self.assertEqual(archive.read('build-action').decode(),
+                                 'gcc -c ' + source)
+                with open(source, 'r') as src:
+                    self.assertEqual(
+                        archive.read('sources-root' + source).decode(),
+                        src.read())
+                self.assertIn('sources-root' + self.header,
+                              archive.namelist())
+
+    def test_zip_dir(self):
+        """ The zips can be written into any directory on demand. """
+        store = FailureStore(self.output_dir)
+        zip_file = self.__record(store, self.sources[0])
+
+        zip_dir = os.path.join(self.output_dir, 'upload')
+        written = store.write_zip(store.get_manifests()[0], zip_dir)
+        self.assertEqual(written,
+                         os.path.join(zip_dir, os.path.basename(zip_file)))
+        self.assertTrue(zipfile.is_zipfile(written))
+        self.assertFalse(os.path.exists(zip_file))
+
+        # The zip of the previous run is replaced by the new manifest.
+        store.write_zip(store.get_manifests()[0])
+        self.assertTrue(os.path.exists(zip_file))
+        self.__record(store, self.sources[0])
+        self.assertFalse(os.path.exists(zip_file))
+
+    def test_remove_manifest(self):
+        """ The failure is forgotten if the analysis succeeds later. """
+        store = FailureStore(self.output_dir)
+        zip_file = self.__record(store, self.sources[0])
+        self.__record(store, self.sources[1])
+
+        blob_dir = os.path.join(self.output_dir, failure_store.STORE_DIR,
+                                'blobs')
+
+        def blob_count():
+            return len([blob for _, _, files in os.walk(blob_dir)
+                        for blob in files])
+
+        store.remove_manifest(zip_file)
+        self.assertEqual(len(store.get_manifests()), 1)
+
+        # The files archived only by the removed manifest are removed.
+        self.assertEqual(blob_count(), 3)
+        store.remove_unused_blobs()
+        self.assertEqual(blob_count(), 2)
+
+        store.remove_manifest(self.__record(store, self.sources[1]))
+        store.remove_unused_blobs()
+        self.assertFalse(os.path.exists(
+            os.path.join(self.output_dir, failure_store.STORE_DIR)))
+
+    def test_sampling(self):
+        """ Only a sample of the failures is collected above a limit. """
+        collected = [should_collect_sources(i) for i in range(
+            failure_store.FULL_FAILURE_NUM +
+            10 * failure_store.FAILURE_SAMPLING_RATE)]
+
+        self.assertTrue(all(collected[:failure_store.FULL_FAILURE_NUM]))
+        self.assertEqual(
+            collected[failure_store.FULL_FAILURE_NUM:].count(True), 10)
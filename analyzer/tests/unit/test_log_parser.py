@@ -10,6 +10,8 @@ from __future__ import division
 from __future__ import absolute_import
 
 import os
+import shutil
+import tempfile
 import unittest
 
 from codechecker_analyzer.buildlog import log_parser
@@ -368,3 +370,106 @@ class LogParserTest(unittest.TestCase):
                              pre_analysis_skip_handler=pre_analysis_skip)
 
         self.assertEqual(len(build_actions), 3)
+
+    def test_stream_compilation_database(self):
+        """
+        The streaming reader returns the same entries as the JSON parser,
+        independently of the size of the read chunks.
+        """
+        logfile = os.path.join(self.__test_files, "intercept-new.json")
+        entries = load_json_or_empty(logfile)
+
+        for chunk_size in [1, 7, 1 << 16]:
+            self.assertEqual(
+                list(log_parser.iter_compilation_database(logfile,
+                                                          chunk_size)),
+                entries)
+
+    def test_stream_invalid_compilation_database(self):
+        """ The streaming reader raises ValueError on invalid input. """
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            logfile = os.path.join(tmp_dir, 'compile_commands.json')
+            for content in ['', '{}', '[{"file": "a.c"}', '[{}}]']:
+                with open(logfile, 'w') as f:
+                    f.write(content)
+
+                with self.assertRaises(ValueError):
+                    list(log_parser.iter_compilation_database(logfile, 4))
+
+            with open(logfile, 'w') as f:
+                f.write(' [ ] ')
+            self.assertEqual(
+                list(log_parser.iter_compilation_database(logfile)), [])
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_parallel_parse(self):
+        """
+        Parsing on multiple processes gives the same uniqued build actions
+        as parsing on a single one.
+        """
+        cmp_cmd_json = [
+            {"directory": "/tmp/lib{0}".format(i % 5),
+             "command": "g++ -c /tmp/lib{0}/a.cpp -o a{1:02}.o".format(
+                 i % 5, i),
+             "file": "a.cpp"} for i in range(40)]
+
+        for uniqueing in ['none', 'alpha']:
+            serial = log_parser.parse_unique_log(cmp_cmd_json,
+                                                 self.__this_dir,
+                                                 uniqueing)
+            parallel = log_parser.parse_unique_log(iter(cmp_cmd_json),
+                                                   self.__this_dir,
+                                                   uniqueing,
+                                                   jobs=3)
+
+            self.assertEqual(
+                sorted(a.original_command for a in serial),
+                sorted(a.original_command for a in parallel))
+
+        # The alphabetically first output is kept for every source file.
+        self.assertEqual(
+            sorted(a.original_command for a in parallel),
+            ["g++ -c /tmp/lib{0}/a.cpp -o a0{0}.o".format(i)
+             for i in range(5)])
+
+    def test_dedup_identical_actions(self):
+        """
+        The build actions which differ only in their output file, working
+        directory or in the form of their options are analyzed once.
+        """
+        cmp_cmd_json = [
+            {"directory": "/tmp/build1",
+             "command": "g++ -c /tmp/a.cpp -o a.o -DA -I /tmp/inc",
+             "file": "/tmp/a.cpp"},
+            {"directory": "/tmp/build2",
+             "command": "g++ -c /tmp/a.cpp -o a_pic.o -DA -I/tmp/inc "
+                        "-I/tmp/inc",
+             "file": "/tmp/a.cpp"},
+            {"directory": "/tmp/build3",
+             "command": "g++ -c /tmp/a.cpp -o a_debug.o -DDEBUG -I/tmp/inc",
+             "file": "/tmp/a.cpp"},
+            {"directory": "/tmp/build4",
+             "command": "g++ -c /tmp/a.cpp -o a_rel.o -DA -I inc",
+             "file": "/tmp/a.cpp"}]
+
+        action_aliases = []
+        build_actions = log_parser.parse_unique_log(
+            cmp_cmd_json, self.__this_dir, action_aliases=action_aliases)
+
+        self.assertEqual(len(build_actions), 3)
+        self.assertEqual(len(action_aliases), 1)
+
+        # One of the identical build actions is kept.
+        kept = action_aliases[0]['action']['directory']
+        aliases = [a['directory'] for a in action_aliases[0]['aliases']]
+        self.assertEqual(sorted([kept] + aliases),
+                         ['/tmp/build1', '/tmp/build2'])
+        self.assertEqual(
+            sorted(a.directory for a in build_actions),
+            sorted([kept, '/tmp/build3', '/tmp/build4']))
+
+        # Nothing is deduplicated by default.
+        self.assertEqual(
+            len(log_parser.parse_unique_log(cmp_cmd_json, self.__this_dir)), 4)
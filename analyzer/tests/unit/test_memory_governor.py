@@ -0,0 +1,77 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the memory watcher and the admission control of the analyzer processes.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import argparse
+import subprocess
+import sys
+import threading
+import time
+import unittest
+
+from codechecker_analyzer.analysis_manager import MemoryGovernor, \
+    setup_process_memory_watch
+from codechecker_analyzer.arg import memory_size
+
+
+class MemoryGovernorTest(unittest.TestCase):
+    """
+    Test the memory related functionality of the analysis manager.
+    """
+
+    def test_memory_size(self):
+        self.assertEqual(memory_size('1024'), 1024)
+        self.assertEqual(memory_size('2k'), 2048)
+        self.assertEqual(memory_size('1.5G'), 3 << 29)
+
+        with self.assertRaises(argparse.ArgumentTypeError):
+            memory_size('many')
+
+        with self.assertRaises(argparse.ArgumentTypeError):
+            memory_size('0')
+
+    def test_memory_watch(self):
+        """
+        The peak memory usage of a process is measured.
+        """
+        allocate = "x = ' ' * (64 << 20); import time; time.sleep(1)"
+        proc = subprocess.Popen([sys.executable, '-c', allocate])
+        stop_watch = setup_process_memory_watch(proc, 0.1)
+        proc.wait()
+
+        self.assertGreater(stop_watch(), 64 << 20)
+
+    def test_budget(self):
+        """
+        An analyzer process is started only if it fits into the budget.
+        """
+        governor = MemoryGovernor(100, 0)
+
+        # The first process is always admitted.
+        governor.acquire(200)
+
+        admitted = threading.Event()
+
+        def start_second():
+            governor.acquire(50)
+            admitted.set()
+
+        second = threading.Thread(target=start_second)
+        second.start()
+
+        time.sleep(0.5)
+        self.assertFalse(admitted.is_set())
+
+        governor.release(200)
+        second.join(5)
+        self.assertTrue(admitted.is_set())
+        governor.release(50)
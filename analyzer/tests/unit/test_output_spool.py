@@ -0,0 +1,85 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test spooling the outputs of the analyzer processes.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import pickle
+import unittest
+
+from codechecker_analyzer.analyzers.analyzer_base import SourceAnalyzer
+from codechecker_analyzer.analyzers.clangtidy.result_handler import \
+    ClangTidyPlistToFile
+
+
+class OutputSpoolTest(unittest.TestCase):
+    """
+    Test the outputs of the processes written into temporary files.
+    """
+
+    def setUp(self):
+        self.spools = []
+
+    def tearDown(self):
+        for spool in self.spools:
+            spool.remove()
+
+    def __run(self, command):
+        ret_code, stdout, stderr = SourceAnalyzer.run_proc(
+            ['sh', '-c', command], spool_output=True)
+        self.spools.extend([stdout, stderr])
+        return ret_code, stdout, stderr
+
+    def test_run_proc(self):
+        """ The outputs of the process are written into the spools. """
+        ret_code, stdout, stderr = self.__run('echo out; echo err >&2; '
+                                              'exit 3')
+        self.assertEqual(ret_code, 3)
+        self.assertEqual(stdout.read(), 'out\n')
+        self.assertEqual(list(stderr.lines()), ['err\n'])
+
+        stderr.prepend('timed out\n')
+        self.assertEqual(stderr.read(), 'timed out\nerr\n')
+
+        stdout.remove()
+        self.assertFalse(os.path.exists(stdout.path))
+        self.assertEqual(stdout.read(), '')
+
+    def test_memory_limit(self):
+        """ Only the beginning of a long output is read into the memory. """
+        _, stdout, _ = self.__run('seq 1 100000')
+        stdout.memory_limit = 10
+
+        self.assertTrue(stdout.read().startswith('1\n2\n3\n4\n5\n'))
+        self.assertIn('588885 more bytes', stdout.read())
+        self.assertEqual(sum(1 for _ in stdout.lines()), 100000)
+
+    def test_pickle(self):
+        """ The closed spool can be passed to another process. """
+        _, stdout, _ = self.__run('echo out')
+        self.assertEqual(pickle.loads(pickle.dumps(stdout)).read(), 'out\n')
+
+    def test_tidy_output(self):
+        """ The clang-tidy output is converted from the spool. """
+        test_file = os.path.join(os.path.dirname(__file__),
+                                 'tidy_output_test_files', 'tidy1.out')
+        _, stdout, _ = self.__run('cat ' + test_file)
+
+        result_file = stdout.path + '.plist'
+        rh = ClangTidyPlistToFile(None, None)
+        rh.analyzer_stdout_spool = stdout
+        rh.analyzer_result_file = result_file
+        try:
+            rh.postprocess_result()
+            with open(result_file) as plist:
+                self.assertIn('clang-analyzer-core.DivideZero', plist.read())
+        finally:
+            os.remove(result_file)
@@ -0,0 +1,152 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the parallel loading of the plist files by 'CodeChecker parse'.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from collections import defaultdict
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+
+from codechecker_analyzer.cmd import parse
+from codechecker_common.skiplist_handler import SkipListHandler
+
+TEST_FILES = os.path.join(os.path.dirname(__file__), 'tidy_output_test_files')
+
+
+class ParallelParseTest(unittest.TestCase):
+    """
+    Test that the plist files loaded by worker processes give the same
+    result as the plist files loaded one by one.
+    """
+
+    def setUp(self):
+        self.__old_pwd = os.getcwd()
+
+        # The source files are relative to the test files.
+        os.chdir(TEST_FILES)
+
+        self.__report_dir = tempfile.mkdtemp()
+        self.__plist_files = []
+        for i in range(8):
+            for name in ('tidy1.plist', 'tidy2.plist', 'tidy3.plist'):
+                plist_file = os.path.join(self.__report_dir,
+                                          '{0}_{1}'.format(i, name))
+                shutil.copyfile(name, plist_file)
+                self.__plist_files.append(plist_file)
+
+    def tearDown(self):
+        os.chdir(self.__old_pwd)
+        shutil.rmtree(self.__report_dir)
+
+    def __parse(self, jobs, skip_handler=None):
+        file_report_map = defaultdict(list)
+        pool = None
+        if jobs > 1:
+            pool = multiprocessing.Pool(jobs,
+                                        initializer=parse.init_worker,
+                                        initargs=(skip_handler,))
+
+        try:
+            changed_files = parse.parse_files(self.__plist_files, {},
+                                              file_report_map, skip_handler,
+                                              pool, jobs)
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+
+        return changed_files, file_report_map
+
+    def test_same_order(self):
+        """
+        The reports are merged in the order of the plist files.
+        """
+        changed_files, serial_map = self.__parse(1)
+        self.assertFalse(changed_files)
+
+        changed_files, parallel_map = self.__parse(3)
+        self.assertFalse(changed_files)
+
+        self.assertEqual(list(serial_map.keys()), list(parallel_map.keys()))
+        for file_path in serial_map:
+            self.assertEqual(
+                [report.path_hash for report in serial_map[file_path]],
+                [report.path_hash for report in parallel_map[file_path]])
+
+    def test_skip_handler(self):
+        """
+        The skip list handler is used both by this process and by the
+        workers.
+        """
+        skip_handler = SkipListHandler('-*')
+        for jobs in (1, 3):
+            _, file_report_map = self.__parse(jobs, skip_handler)
+            self.assertTrue(file_report_map)
+            for reports in file_report_map.values():
+                self.assertTrue(all(report.skipped for report in reports))
+
+        # The skip list handler is not left behind for the serial parsing.
+        _, file_report_map = self.__parse(1)
+        for reports in file_report_map.values():
+            self.assertFalse(any(report.skipped for report in reports))
+
+    def test_deduplication(self):
+        """
+        The copies of the same plist file are printed only once.
+        """
+        _, file_report_map = self.__parse(3)
+
+        rh = parse.PlistToPlaintextFormatter(None, None, {}, set(), None)
+        with open(os.devnull, 'w') as output:
+            stats = rh.write(file_report_map, output)
+
+        unique_reports = set(report.path_hash
+                             for reports in file_report_map.values()
+                             for report in reports)
+        self.assertLess(len(unique_reports),
+                        sum(len(reports)
+                            for reports in file_report_map.values()))
+        self.assertEqual(stats['reports']['report_count'],
+                         len(unique_reports))
+
+    def test_stream(self):
+        """
+        The streamed reports are the same as the reports printed at the end.
+        """
+        _, file_report_map = self.__parse(1)
+
+        rh = parse.PlistToPlaintextFormatter(None, None, {}, set(), None)
+        with open(os.devnull, 'w') as output:
+            stats = rh.write(file_report_map, output)
+
+        streamed_stats = []
+        pool = multiprocessing.Pool(3, initializer=parse.init_worker,
+                                    initargs=(None,))
+        try:
+            rh = parse.PlistToPlaintextFormatter(None, None, {}, set(), None)
+            with open(os.devnull, 'w') as output:
+                changed_files = parse.stream_files(self.__plist_files, {}, rh,
+                                                   streamed_stats.append,
+                                                   pool, 3, output)
+        finally:
+            pool.close()
+            pool.join()
+
+        self.assertFalse(changed_files)
+
+        # The statistics are collected for every plist file.
+        self.assertEqual(len(streamed_stats), len(self.__plist_files))
+        self.assertEqual(
+            sum(stat['reports']['report_count'] for stat in streamed_stats),
+            stats['reports']['report_count'])
@@ -0,0 +1,88 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the streaming plist reader.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import os
+import plistlib
+import shutil
+import tempfile
+import unittest
+
+from codechecker_common import plist_parser
+from codechecker_common.plist_reader import PlistReader, \
+    UnsupportedPlistError
+
+TEST_DIR = os.path.dirname(__file__)
+
+PLIST_FILES = [
+    os.path.join(TEST_DIR, 'tidy_output_test_files', 'tidy1.plist'),
+    os.path.join(TEST_DIR, 'tidy_output_test_files', 'tidy3.plist'),
+    os.path.join(TEST_DIR, 'tidy_output_test_files', 'empty.plist'),
+    os.path.join(TEST_DIR, '..', 'projects', 'macros', 'macros.plist'),
+    os.path.join(TEST_DIR, '..', 'projects', 'notes', 'notes.plist')]
+
+
+class PlistReaderTest(unittest.TestCase):
+    """
+    Test that the streaming plist reader gives the same result as plistlib.
+    """
+
+    def setUp(self):
+        self.__tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.__tmp_dir)
+
+    def test_same_as_plistlib(self):
+        for plist_file in PLIST_FILES:
+            self.assertEqual(PlistReader(plist_file).read(),
+                             plistlib.readPlist(plist_file))
+
+    def test_streaming(self):
+        """
+        The diagnostics are read one by one, the files are available after
+        the diagnostics.
+        """
+        plist_file = PLIST_FILES[0]
+        expected = plistlib.readPlist(plist_file)
+
+        reader = PlistReader(plist_file)
+        diagnostics = reader.diagnostics()
+        self.assertEqual(next(diagnostics), expected['diagnostics'][0])
+
+        for _ in diagnostics:
+            pass
+        self.assertEqual(reader.values['files'], expected['files'])
+
+    def test_unsupported_element(self):
+        """
+        The generic plist parser is used for the unsupported elements.
+        """
+        plist_file = os.path.join(self.__tmp_dir, 'date.plist')
+        plistlib.writePlist({'diagnostics': [],
+                             'files': [],
+                             'data': plistlib.Data(b'binary')}, plist_file)
+
+        with self.assertRaises(UnsupportedPlistError):
+            PlistReader(plist_file).read()
+
+        self.assertEqual(plist_parser.read_plist_file(plist_file)['data'],
+                         plistlib.Data(b'binary'))
+
+    def test_parse_plist_file(self):
+        files, reports = plist_parser.parse_plist_file(PLIST_FILES[0],
+                                                       None, False)
+        self.assertEqual(files, plistlib.readPlist(PLIST_FILES[0])['files'])
+        self.assertEqual(
+            [report.main['check_name'] for report in reports],
+            [diag['check_name'] for diag
+             in plistlib.readPlist(PLIST_FILES[0])['diagnostics']])
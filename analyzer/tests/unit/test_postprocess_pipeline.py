@@ -0,0 +1,97 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the postprocessing stage of the analysis.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from codechecker_analyzer.analysis_manager import PostprocessPipeline, \
+    run_postprocess
+
+
+def write_file(file_path, delay):
+    time.sleep(delay)
+    with open(file_path, 'w') as result:
+        result.write(file_path)
+
+
+def fail():
+    raise ValueError("Postprocessing failed.")
+
+
+class PostprocessPipelineTest(unittest.TestCase):
+    """
+    Test running the postprocessing tasks on a separate process pool.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_run_postprocess(self):
+        """ A failing task does not stop the postprocessing. """
+        self.assertGreaterEqual(run_postprocess((fail, ())), 0)
+
+        file_path = os.path.join(self.tmp_dir, 'result')
+        run_postprocess((write_file, (file_path, 0)))
+        self.assertTrue(os.path.exists(file_path))
+
+    def test_pipeline(self):
+        """ Every task is run and the queue depth is bounded. """
+        pool = multiprocessing.Pool(2)
+        try:
+            pipeline = PostprocessPipeline(pool, 2, max_pending=3)
+
+            files = [os.path.join(self.tmp_dir, str(i)) for i in range(10)]
+            for i in range(0, len(files), 2):
+                pipeline.put([(write_file, (files[i], 0.05)),
+                              (write_file, (files[i + 1], 0.05))])
+            pipeline.put([(fail, ())])
+            pipeline.join()
+            pool.close()
+        finally:
+            pool.join()
+
+        self.assertTrue(all(os.path.exists(f) for f in files))
+
+        statistics = pipeline.get_statistics()
+        self.assertEqual(statistics['postprocess_tasks'], 11)
+        self.assertEqual(statistics['postprocess_jobs'], 2)
+        self.assertLessEqual(statistics['postprocess_max_depth'], 3)
+        self.assertGreater(statistics['postprocess_time'], 0.4)
+
+    def test_callback(self):
+        """ The callback is called when every task of the put finished. """
+        pool = multiprocessing.Pool(2)
+        try:
+            pipeline = PostprocessPipeline(pool, 2, max_pending=2)
+
+            files = [os.path.join(self.tmp_dir, str(i)) for i in range(3)]
+            finished = []
+
+            def callback():
+                finished.append(all(os.path.exists(f) for f in files))
+
+            pipeline.put([], lambda: finished.append(None))
+            pipeline.put([(write_file, (f, 0.05)) for f in files], callback)
+            pipeline.join()
+            pool.close()
+        finally:
+            pool.join()
+
+        self.assertEqual(finished, [None, True])
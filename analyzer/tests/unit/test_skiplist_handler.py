@@ -0,0 +1,91 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the matching of the skip list patterns.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import fnmatch
+import pickle
+import unittest
+
+from codechecker_common import skiplist_handler
+from codechecker_common.skiplist_handler import SkipListHandler
+
+
+def should_skip(skip_lines, source):
+    """ Reference implementation matching the patterns one by one. """
+    for line in skip_lines:
+        if fnmatch.fnmatch(source, line[1:].strip() + '*'):
+            return line[0] == '-'
+    return False
+
+
+class SkipListHandlerTest(unittest.TestCase):
+    """
+    Test the combined skip patterns against the patterns one by one.
+    """
+
+    def setUp(self):
+        self.skip_lines = ['+/project/lib/keep.c',
+                           '-/project/lib/*',
+                           '-*/generated/*.c',
+                           '+/project/src/dir?/main.cpp',
+                           '-/project/src/dir[0-4]/*']
+        for i in range(250):
+            self.skip_lines.append(('+' if i % 3 else '-') +
+                                   '/project/module{0}/*.c'.format(i))
+        self.skip_lines.append('-/project/*')
+
+        self.sources = ['/project/lib/keep.c',
+                        '/project/lib/other.c',
+                        '/x/generated/a.c',
+                        '/x/generated/a.h',
+                        '/project/src/dir1/main.cpp',
+                        '/project/src/dir1/util.cpp',
+                        '/project/src/dir9/util.cpp',
+                        '/project/module0/a.c',
+                        '/project/module1/a.c',
+                        '/project/module249/a.c',
+                        '/project/module249/a.h',
+                        '/outside/main.c']
+
+    def test_same_decisions(self):
+        """ The decisions are the same as matching one by one. """
+        handler = SkipListHandler('\n'.join(self.skip_lines))
+        for source in self.sources:
+            expected = should_skip(self.skip_lines, source)
+            self.assertEqual(handler.should_skip(source), expected, source)
+
+            # The cached decision.
+            self.assertEqual(handler.should_skip(source), expected, source)
+
+    def test_decision_cache(self):
+        """ The number of the cached decisions is limited. """
+        cache_size = skiplist_handler.DECISION_CACHE_SIZE
+        skiplist_handler.DECISION_CACHE_SIZE = 3
+        try:
+            handler = SkipListHandler('\n'.join(self.skip_lines))
+            for source in self.sources:
+                self.assertEqual(handler.should_skip(source),
+                                 should_skip(self.skip_lines, source))
+        finally:
+            skiplist_handler.DECISION_CACHE_SIZE = cache_size
+
+        handler = pickle.loads(pickle.dumps(handler))
+        self.assertTrue(handler.should_skip('/project/lib/other.c'))
+
+    def test_overwrite(self):
+        """ The overwritten patterns are used instead of the cached ones. """
+        handler = SkipListHandler('-/project/lib/*')
+        self.assertTrue(handler.should_skip('/project/lib/other.c'))
+
+        handler.overwrite_skip_content(['+/project/lib/*'])
+        self.assertFalse(handler.should_skip('/project/lib/other.c'))
+        self.assertFalse(SkipListHandler().should_skip('/project/a.c'))
@@ -0,0 +1,107 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the cache of the source file lines.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from codechecker_common.source_line_cache import SourceLineCache
+
+
+def read_lines(file_name, errors='ignore'):
+    """
+    Read the lines the same way as the cache should.
+    """
+    with io.open(file_name, mode='r', encoding='utf-8',
+                 errors=errors) as source_file:
+        return list(source_file)
+
+
+class SourceLineCacheTest(unittest.TestCase):
+    """
+    Test the source line cache.
+    """
+
+    def setUp(self):
+        self.__tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.__tmp_dir)
+
+    def __write(self, name, content):
+        file_name = os.path.join(self.__tmp_dir, name)
+        with open(file_name, 'wb') as source_file:
+            source_file.write(content)
+        return file_name
+
+    def test_same_as_io_open(self):
+        """
+        The lines are the same as the lines read by io.open().
+        """
+        cache = SourceLineCache()
+        contents = [b'int a;\nint b;\n',
+                    b'no newline\nat the end',
+                    b'windows\r\nline\r\nendings\r\n',
+                    b'old\rmac\r',
+                    b'invalid \xff\xfe utf-8\n',
+                    b'\xc3\xa1rv\xc3\xadzt\xc5\xb1r\xc5\x91\n',
+                    b'\n\n\n',
+                    b'']
+
+        for i, content in enumerate(contents):
+            file_name = self.__write('{0}.cpp'.format(i), content)
+
+            for errors in ('ignore', 'replace'):
+                lines = read_lines(file_name, errors)
+                for line_no in range(len(lines) + 2):
+                    expected = lines[line_no - 1] \
+                        if 1 <= line_no <= len(lines) else u''
+                    self.assertEqual(cache.get_line(file_name, line_no,
+                                                    errors),
+                                     expected)
+
+    def test_missing_file(self):
+        cache = SourceLineCache()
+        self.assertEqual(
+            cache.get_line(os.path.join(self.__tmp_dir, 'missing.cpp'), 1),
+            u'')
+
+    def test_modified_file(self):
+        """
+        The file is read again if it has been modified.
+        """
+        cache = SourceLineCache()
+        file_name = self.__write('main.cpp', b'int a;\n')
+        self.assertEqual(cache.get_line(file_name, 1), u'int a;\n')
+
+        self.__write('main.cpp', b'long b;\nint c;\n')
+        self.assertEqual(cache.get_line(file_name, 2), u'int c;\n')
+
+    def test_size_limit(self):
+        """
+        The lines are read correctly while the least recently used files are
+        removed from the cache.
+        """
+        cache = SourceLineCache(max_files=2)
+        file_names = [self.__write('{0}.cpp'.format(i),
+                                   'int a{0};\n'.format(i).encode())
+                      for i in range(4)]
+
+        for i, file_name in enumerate(file_names):
+            self.assertEqual(cache.get_line(file_name, 1),
+                             u'int a{0};\n'.format(i))
+
+        cache.forget(self.__tmp_dir)
+        self.assertEqual(cache.get_line(file_names[0], 1), u'int a0;\n')
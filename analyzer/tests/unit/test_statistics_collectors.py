@@ -9,6 +9,9 @@ from __future__ import print_function
 from __future__ import division
 from __future__ import absolute_import
 
+import os
+import shutil
+import tempfile
 import unittest
 
 from codechecker_analyzer.analyzers.clangsa import statistics_collector
@@ -162,3 +165,44 @@ class statistics_collectorsTest(unittest.TestCase):
         self.assertEqual({'parsedate': 10}, ret_val_collector.total())
         self.assertEqual({'parsedate': 1}, ret_val_collector.nof_unchecked())
         self.assertEqual(['parsedate'], ret_val_collector.filter_stats())
+
+    def test_postprocess_stats_parallel(self):
+        """
+        The statistics collected from the output shards on multiple
+        processes are the same as the ones collected on a single process.
+        """
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            clang_output_dir = os.path.join(tmp_dir, 'tmp')
+            os.makedirs(clang_output_dir)
+            for i in range(20):
+                with open(os.path.join(clang_output_dir, str(i)), 'w') as out:
+                    for func in ['parsedate', 'readline']:
+                        out.write("/.../x.c:551:12: warning: Return Value "
+                                  "Check:/.../x.c:551:12,{0},{1}\n"
+                                  .format(func, int(i == 0)))
+                        out.write("/.../x.c:551:12: warning: Special Return "
+                                  "Value:/.../x.c:551:12,{0},{1},0\n"
+                                  .format(func, int(i != 0)))
+                    out.write("/.../x.c:1:1: warning: unrelated\n")
+
+            stats = []
+            for jobs in [1, 3]:
+                stats_dir = os.path.join(tmp_dir, str(jobs))
+                statistics_collector.postprocess_stats(clang_output_dir,
+                                                       stats_dir, 10, 0.85,
+                                                       jobs)
+                with open(os.path.join(stats_dir,
+                                       'UncheckedReturn.yaml')) as f:
+                    unchecked = f.read()
+                with open(os.path.join(stats_dir, 'SpecialReturn.yaml')) as f:
+                    special = f.read()
+                stats.append((unchecked, special))
+
+            self.assertEqual(stats[0], stats[1])
+            self.assertIn('- parsedate\n', stats[0][0])
+            self.assertIn('- readline\n', stats[0][0])
+            self.assertIn('{name: readline, relation: LT, value: 0}',
+                          stats[0][1])
+        finally:
+            shutil.rmtree(tmp_dir)
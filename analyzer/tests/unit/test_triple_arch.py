@@ -9,8 +9,15 @@ from __future__ import print_function
 from __future__ import division
 from __future__ import absolute_import
 
+import os
+import shutil
+import stat
+import tempfile
 import unittest
 
+from libtest.build_action import create_build_action
+
+from codechecker_analyzer.analysis_manager import WorkerPool
 from codechecker_analyzer.analyzers.clangsa import ctu_triple_arch
 
 
@@ -40,3 +47,104 @@ InstalledDir: /opt/clang+llvm-8.0.0-x86_64-linux-gnu-ubuntu-18.04/bin
  "<blabla>" "main.cpp" "<blabla>"
  '''
         self.assertIsNone(ctu_triple_arch._find_arch_in_command(output))
+
+
+def load_cache(ctu_dir):
+    return ctu_triple_arch.load_triple_arch_cache(ctu_dir)
+
+
+class FakeConfig(object):
+    def __init__(self, analyzer_binary):
+        self.analyzer_binary = analyzer_binary
+        self.analyzer_extra_arguments = []
+
+
+class TripleArchCacheTest(unittest.TestCase):
+    """
+    Test that the analyzer is queried only once for the same target.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.ctu_dir = os.path.join(self.tmp_dir, 'ctu-dir')
+        self.calls = os.path.join(self.tmp_dir, 'calls')
+
+        # An analyzer which counts its invocations and reports a triple
+        # depending on the -m32 flag.
+        binary = os.path.join(self.tmp_dir, 'fake-clang')
+        with open(binary, 'w') as analyzer:
+            analyzer.write('#!/bin/sh\n'
+                           'echo >> "{0}"\n'
+                           'case "$*" in\n'
+                           '  *-m32*) echo \'"-cc1" "-triple" '
+                           '"i386-pc-linux-gnu"\' >&2;;\n'
+                           '  *) echo \'"-cc1" "-triple" '
+                           '"x86_64-pc-linux-gnu"\' >&2;;\n'
+                           'esac\n'.format(self.calls))
+        os.chmod(binary, stat.S_IRWXU)
+
+        self.config = FakeConfig(binary)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def __create_action(self, options, directory):
+        return create_build_action(os.path.join(directory, 'main.c'),
+                                   directory, options, 'gcc -c main.c')
+
+    def __get_triple_arch(self, action, cache):
+        return ctu_triple_arch.get_triple_arch(action, action.source,
+                                               self.config, os.environ,
+                                               cache)
+
+    def __call_count(self):
+        with open(self.calls) as calls:
+            return len(calls.readlines())
+
+    def test_cache(self):
+        """ The arch-affecting flags are part of the key. """
+        cache = {}
+        for directory in ['/tmp', '/']:
+            action = self.__create_action(['-DA', '-Ilib'], directory)
+            self.assertEqual(self.__get_triple_arch(action, cache), 'x86_64')
+        self.assertEqual(self.__call_count(), 1)
+
+        action = self.__create_action(['-m32'], '/tmp')
+        self.assertEqual(self.__get_triple_arch(action, cache), 'i386')
+        self.assertEqual(self.__get_triple_arch(action, cache), 'i386')
+        self.assertEqual(self.__call_count(), 2)
+
+    def test_persisted_cache(self):
+        """ The cache stored in the CTU directory is used by later runs. """
+        action = self.__create_action([], '/tmp')
+
+        cache = ctu_triple_arch.load_triple_arch_cache(self.ctu_dir)
+        self.assertEqual(self.__get_triple_arch(action, cache), 'x86_64')
+        ctu_triple_arch.store_triple_arch_cache(self.ctu_dir, cache)
+
+        cache = ctu_triple_arch.load_triple_arch_cache(self.ctu_dir)
+        self.assertEqual(self.__get_triple_arch(action, cache), 'x86_64')
+        self.assertEqual(self.__call_count(), 1)
+
+    def test_shared_pool(self):
+        """
+        The workers of the shared pool see the cache stored by the
+        pre-analysis after the workers have been started.
+        """
+        worker_pool = WorkerPool(2)
+        try:
+            pool = worker_pool.pool
+            self.assertEqual(pool.map(load_cache, [self.ctu_dir] * 4),
+                             [{}] * 4)
+
+            action = self.__create_action([], '/tmp')
+            cache = ctu_triple_arch.load_triple_arch_cache(self.ctu_dir)
+            self.__get_triple_arch(action, cache)
+            ctu_triple_arch.store_triple_arch_cache(self.ctu_dir, cache)
+
+            self.assertEqual(pool.map(load_cache, [self.ctu_dir] * 4),
+                             [cache] * 4)
+        finally:
+            worker_pool.close()
+
+        self.assertEqual(self.__call_count(), 1)
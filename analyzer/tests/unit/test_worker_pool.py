@@ -0,0 +1,68 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+
+"""
+Test the worker pool shared by the pre-analysis and the analysis.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import time
+import unittest
+
+from codechecker_analyzer import analysis_manager, pre_analysis_manager
+from codechecker_analyzer.analysis_manager import WorkerPool
+
+
+def get_progress(_):
+    return (pre_analysis_manager.progress_actions.value,
+            analysis_manager.progress_actions.value)
+
+
+def wait_pre_analysis(_):
+    analysis_manager.pre_analysis_ready.wait()
+    return True
+
+
+class WorkerPoolTest(unittest.TestCase):
+    """
+    Test the worker pool of the analysis manager.
+    """
+
+    def test_shared_pool(self):
+        """
+        The workers are initialized for both the pre-analysis and the
+        analysis and they are started only once.
+        """
+        worker_pool = WorkerPool(2)
+        try:
+            pool = worker_pool.pool
+            self.assertIs(worker_pool.pool, pool)
+
+            worker_pool.pre_actions_num.value = 3
+            worker_pool.actions_num.value = 5
+            self.assertEqual(pool.map(get_progress, range(4)), [(3, 5)] * 4)
+        finally:
+            worker_pool.close()
+
+    def test_pre_analysis_gate(self):
+        """
+        The jobs waiting for the pre-analysis are started when the
+        pre-analysis is ready.
+        """
+        worker_pool = WorkerPool(1)
+        try:
+            worker_pool.pre_analysis_ready.clear()
+            waiting = worker_pool.pool.apply_async(wait_pre_analysis, (0,))
+
+            time.sleep(0.5)
+            self.assertFalse(waiting.ready())
+
+            worker_pool.pre_analysis_ready.set()
+            self.assertTrue(waiting.get(5))
+        finally:
+            worker_pool.close()
@@ -0,0 +1,218 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Store of the debug data of the failed analyses.
+
+The debug zip of a failed analysis is not written when the analysis fails.
+Instead, a manifest of the zip is written: the content of its small entries
+(e.g. the build command) and the content hashes of the files to be archived
+(the analyzer outputs and the source files of the translation unit). The
+files are copied into a blob store by their content hash, so a header which
+is mentioned by many failed analyses is stored only once. The zips are
+written from the manifests only on demand, e.g. when the results are stored
+on the server.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+
+from codechecker_common.logger import get_logger
+from codechecker_common.util import get_file_content_hash
+
+LOG = get_logger('system')
+
+# Name of the failure store directory in the output directory.
+STORE_DIR = 'failure_data'
+
+# The source files of this many failed analyses are always collected.
+FULL_FAILURE_NUM = 50
+
+# Above FULL_FAILURE_NUM failures only the source files of every
+# FAILURE_SAMPLING_RATE-th failed analysis are collected.
+FAILURE_SAMPLING_RATE = 10
+
+
+def should_collect_sources(failure_index):
+    """
+    Return True if the source files of the failure with the given 0-based
+    index should be collected. If a lot of analyses fail (e.g. because of a
+    broken toolchain), the failures usually have the same reason, so
+    collecting the sources of a sample is enough.
+    """
+    return failure_index < FULL_FAILURE_NUM or \
+        (failure_index - FULL_FAILURE_NUM) % FAILURE_SAMPLING_RATE == 0
+
+
+class FailureStore(object):
+    """
+    Manifests of the debug zips and the content of the archived files in
+    the output directory.
+    """
+
+    def __init__(self, output_path):
+        self.__failed_dir = os.path.join(output_path, 'failed')
+        self.__store_dir = os.path.join(output_path, STORE_DIR)
+        self.__manifest_dir = os.path.join(self.__store_dir, 'manifests')
+        self.__blob_dir = os.path.join(self.__store_dir, 'blobs')
+
+    @staticmethod
+    def __makedirs(path):
+        try:
+            if not os.path.isdir(path):
+                os.makedirs(path)
+        except OSError:
+            # The directory may be created by another worker.
+            pass
+
+    def __manifest_path(self, zip_file):
+        return os.path.join(self.__manifest_dir,
+                            os.path.basename(zip_file) + '.json')
+
+    @staticmethod
+    def get_zip_name(manifest_path):
+        """
+        Return the file name of the debug zip of the given manifest.
+        """
+        return os.path.basename(manifest_path)[:-len('.json')]
+
+    def __blob_path(self, content_hash):
+        return os.path.join(self.__blob_dir, content_hash[:2], content_hash)
+
+    def add_file(self, file_path):
+        """
+        Copy the given file into the blob store if its content is not stored
+        yet. Returns the content hash of the file or None if the file can not
+        be read.
+        """
+        content_hash = get_file_content_hash(file_path)
+        if content_hash is None:
+            return None
+
+        blob = self.__blob_path(content_hash)
+        if os.path.exists(blob):
+            return content_hash
+
+        blob_dir = os.path.dirname(blob)
+        self.__makedirs(blob_dir)
+
+        try:
+            # Rename the copied file so the parallel workers never see
+            # half-written blobs.
+            fd, tmp_blob = tempfile.mkstemp(dir=blob_dir)
+            os.close(fd)
+            shutil.copyfile(file_path, tmp_blob)
+            os.rename(tmp_blob, blob)
+        except (IOError, OSError) as ex:
+            LOG.debug("Failed to store '%s': %s", file_path, ex)
+            return None
+
+        return content_hash
+
+    def write_manifest(self, zip_file, texts, files):
+        """
+        Write the manifest of the given debug zip of the failed directory.
+
+        texts -- Dict of the archive names and the content of the entries.
+        files -- Dict of the archive names and the paths of the files to be
+                 archived.
+        """
+        manifest = {'zip': os.path.basename(zip_file),
+                    'texts': texts,
+                    'files': {}}
+
+        for name, file_path in files.items():
+            content_hash = self.add_file(file_path)
+            if content_hash:
+                manifest['files'][name] = content_hash
+            else:
+                LOG.debug("'%s' is left out from '%s'.", file_path, zip_file)
+
+        self.__makedirs(self.__manifest_dir)
+
+        fd, tmp_manifest = tempfile.mkstemp(dir=self.__manifest_dir)
+        with os.fdopen(fd, 'w') as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.rename(tmp_manifest, self.__manifest_path(zip_file))
+
+        # The zip of a previous failure is replaced by the manifest.
+        if os.path.exists(zip_file):
+            os.remove(zip_file)
+
+    def remove_manifest(self, zip_file):
+        """
+        Remove the manifest of the given debug zip, e.g. because the analysis
+        has succeeded since it was written.
+        """
+        try:
+            os.remove(self.__manifest_path(zip_file))
+        except OSError:
+            pass
+
+    def get_manifests(self):
+        """
+        Return the paths of the manifests in the store.
+        """
+        if not os.path.isdir(self.__manifest_dir):
+            return []
+
+        return [os.path.join(self.__manifest_dir, manifest)
+                for manifest in sorted(os.listdir(self.__manifest_dir))
+                if manifest.endswith('.json')]
+
+    def write_zip(self, manifest_path, zip_dir=None):
+        """
+        Write the debug zip of the given manifest into the given directory,
+        by default into the failed directory of the output directory. The
+        manifest is kept. Returns the path of the zip file.
+        """
+        with open(manifest_path, 'r') as manifest_file:
+            manifest = json.load(manifest_file)
+
+        zip_dir = zip_dir or self.__failed_dir
+        self.__makedirs(zip_dir)
+
+        zip_file = os.path.join(zip_dir, manifest['zip'])
+        with zipfile.ZipFile(zip_file, 'w') as archive:
+            for name, content_hash in sorted(manifest['files'].items()):
+                archive.write(self.__blob_path(content_hash), name,
+                              zipfile.ZIP_DEFLATED)
+
+            for name, text in sorted(manifest['texts'].items()):
+                archive.writestr(name, text.encode('utf-8'))
+
+        LOG.debug("ZIP file written at '%s'", zip_file)
+        return zip_file
+
+    def remove_unused_blobs(self):
+        """
+        Remove the stored files which are not archived by any manifest, e.g.
+        because the analysis has succeeded since the file was stored. The
+        whole store is removed if there are no manifests.
+        """
+        manifests = self.get_manifests()
+        if not manifests:
+            shutil.rmtree(self.__store_dir, ignore_errors=True)
+            return
+
+        used = set()
+        for manifest_path in manifests:
+            try:
+                with open(manifest_path, 'r') as manifest_file:
+                    used.update(json.load(manifest_file)['files'].values())
+            except (IOError, ValueError, KeyError) as ex:
+                LOG.debug("Invalid failure manifest '%s': %s",
+                          manifest_path, ex)
+
+        for root, _, blobs in os.walk(self.__blob_dir):
+            for blob in blobs:
+                if blob not in used:
+                    os.remove(os.path.join(root, blob))
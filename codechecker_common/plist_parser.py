@@ -43,6 +43,8 @@ from plistlib import PlistParser, writePlist, writePlistToString, \
 from xml.parsers.expat import ExpatError
 
 from codechecker_common.logger import get_logger
+from codechecker_common.plist_reader import ParseError, PlistReader, \
+    UnsupportedPlistError
 from codechecker_common.report import Report, generate_report_hash
 
 LOG = get_logger('report')
@@ -139,6 +141,20 @@ def get_report_hash(diagnostic, source_file):
     return report_hash
 
 
+def read_plist_file(path):
+    """
+    Return the root dictionary of the given plist file. The streaming plist
+    reader is used if the plist contains only the elements written by the
+    analyzers, otherwise the generic plist parser.
+    """
+    try:
+        return PlistReader(path).read()
+    except UnsupportedPlistError as err:
+        LOG.debug("%s: %s", path, err)
+        with io.open(path, 'r') as plist_file_obj:
+            return parse_plist(plist_file_obj)
+
+
 def parse_plist_file(path, source_root=None, allow_plist_update=True):
     """
     Parse the reports from a plist file.
@@ -149,8 +165,7 @@ def parse_plist_file(path, source_root=None, allow_plist_update=True):
     reports = []
     files = []
     try:
-        with io.open(path, 'r') as plist_file_obj:
-            plist = parse_plist(plist_file_obj)
+        plist = read_plist_file(path)
 
         files = plist['files']
 
@@ -195,7 +210,7 @@ def parse_plist_file(path, source_root=None, allow_plist_update=True):
             # This way the client will always send a plist file where the
             # report hash field is filled.
             writePlist(plist, path)
-    except (ExpatError, TypeError, AttributeError) as err:
+    except (ExpatError, ParseError, TypeError, AttributeError) as err:
         LOG.warning('Failed to process plist file: %s wrong file format?',
                     path)
         LOG.warning(err)
@@ -0,0 +1,151 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Streaming reader of the plist files written by the analyzers.
+
+The plist is parsed by the C implementation of ElementTree and the
+diagnostics are converted to Python objects one by one, as soon as their XML
+element is parsed. The XML elements of the converted diagnostics are
+released, so the whole XML tree is never kept in the memory. The dictionary
+keys, the checker names and the file paths are interned, because they are
+repeated in every report.
+
+Only the plist elements used by the analyzers are supported (no dates and
+binary data), for the other plist files UnsupportedPlistError is raised and
+the generic plist parser should be used.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import sys
+
+try:
+    import xml.etree.cElementTree as ElementTree
+except ImportError:
+    import xml.etree.ElementTree as ElementTree
+
+try:
+    _intern = sys.intern
+except AttributeError:
+    _intern = intern  # noqa
+
+# Errors of the XML parsing.
+ParseError = ElementTree.ParseError
+
+
+class UnsupportedPlistError(ValueError):
+    """
+    The plist contains an element which is not supported by the reader.
+    """
+    pass
+
+
+def intern_str(text):
+    """
+    Return the interned version of the given string. Unicode strings can not
+    be interned in Python 2, these are returned as they are.
+    """
+    try:
+        return _intern(text)
+    except TypeError:
+        return text
+
+
+def convert(elem):
+    """
+    Convert the given plist XML element to a Python object the same way as
+    plistlib does.
+    """
+    tag = elem.tag
+    if tag == 'dict':
+        children = list(elem)
+        return {intern_str(children[i].text or ''): convert(children[i + 1])
+                for i in range(0, len(children) - 1, 2)}
+    if tag == 'array':
+        return [convert(child) for child in elem]
+    if tag == 'string':
+        return elem.text or ''
+    if tag == 'integer':
+        return int(elem.text)
+    if tag == 'real':
+        return float(elem.text)
+    if tag == 'true':
+        return True
+    if tag == 'false':
+        return False
+
+    raise UnsupportedPlistError("Unsupported plist element: " + tag)
+
+
+class PlistReader(object):
+    """
+    Read the diagnostics of an analyzer plist file one at a time.
+
+    The values of the root dictionary besides the diagnostics (e.g. the
+    'files' list) are available in the values attribute after the
+    diagnostics have been read.
+    """
+
+    def __init__(self, plist_file):
+        """
+        plist_file -- Path or binary file object of the plist file.
+        """
+        self.__plist_file = plist_file
+        self.values = {}
+
+    def diagnostics(self):
+        """
+        Yield the diagnostic dictionaries of the plist file.
+        """
+        depth = 0
+        key = None
+        diagnostics = None
+
+        for event, elem in ElementTree.iterparse(self.__plist_file,
+                                                 ('start', 'end')):
+            if event == 'start':
+                depth += 1
+
+                if depth == 3 and key == 'diagnostics' and \
+                        elem.tag == 'array':
+                    diagnostics = elem
+                continue
+
+            depth -= 1
+
+            # <plist> <dict> <key>: the keys and values of the root dict.
+            if depth == 2:
+                if elem.tag == 'key':
+                    key = elem.text
+                elif elem is diagnostics:
+                    diagnostics = None
+                    key = None
+                else:
+                    value = convert(elem)
+                    if key == 'files':
+                        value = [intern_str(path) for path in value]
+                    self.values[key] = value
+                    key = None
+                elem.clear()
+            elif depth == 3 and diagnostics is not None:
+                diagnostic = convert(elem)
+                if 'check_name' in diagnostic:
+                    diagnostic['check_name'] = \
+                        intern_str(diagnostic['check_name'])
+
+                # The converted diagnostics are released.
+                elem.clear()
+                yield diagnostic
+
+    def read(self):
+        """
+        Return the root dictionary of the plist file.
+        """
+        diagnostics = list(self.diagnostics())
+        plist = dict(self.values)
+        plist['diagnostics'] = diagnostics
+        return plist
@@ -9,6 +9,7 @@ from __future__ import print_function
 from __future__ import division
 from __future__ import absolute_import
 
+from collections import OrderedDict
 import fnmatch
 import re
 
@@ -16,6 +17,29 @@ from codechecker_common.logger import get_logger
 
 LOG = get_logger('system')
 
+# Number of the skip patterns which are combined into one regular expression.
+# Python 2 supports at most 100 groups in a regular expression.
+COMBINED_PATTERN_NUM = 99
+
+# Number of the paths whose decision is cached.
+DECISION_CACHE_SIZE = 1 << 16
+
+
+def translate(pattern):
+    """
+    Return the regular expression of the given skip pattern which can be
+    combined with the expressions of the other patterns.
+    """
+    rexpr = fnmatch.translate(pattern)
+
+    # Python 2 appends the flags to the end of the expression which is not
+    # allowed inside a combined expression. The flags are given when the
+    # combined expression is compiled.
+    if rexpr.endswith('(?ms)'):
+        rexpr = rexpr[:-len('(?ms)')]
+
+    return rexpr
+
 
 class SkipListHandler(object):
     """
@@ -32,6 +56,8 @@ class SkipListHandler(object):
         Process the lines of the skip file.
         """
         self.__skip = []
+        self.__combined = []
+        self.__decisions = OrderedDict()
 
         self.__skip_file_lines = [line.strip() for line
                                   in skip_file_content.splitlines()
@@ -53,6 +79,29 @@ class SkipListHandler(object):
                 fnmatch.translate(skip_line[1:].strip() + '*'))
             self.__skip.append((skip_line, rexpr))
 
+        self.__combine()
+
+    def __combine(self):
+        """
+        Combine the regular expressions of the skip lines into a few
+        alternations, so a path is matched against all of them at once. Every
+        alternative is a group, so the index of the first matching skip line
+        is the index of the matching group.
+        """
+        self.__combined = []
+        self.__decisions = OrderedDict()
+
+        # The alternatives can not contain groups, because the index of the
+        # matching alternative is given by the group index.
+        if any(rexpr.groups for _, rexpr in self.__skip):
+            return
+
+        for start in range(0, len(self.__skip), COMBINED_PATTERN_NUM):
+            lines = self.__skip[start:start + COMBINED_PATTERN_NUM]
+            rexpr = '|'.join('(' + translate(line[1:].strip() + '*') + ')'
+                             for line, _ in lines)
+            self.__combined.append((start, re.compile(rexpr, re.M | re.S)))
+
     def __check_line_format(self, skip_lines):
         """
         Check if the skip line is given in a valid format.
@@ -84,6 +133,28 @@ class SkipListHandler(object):
         valid_lines = self.__check_line_format(skip_lines)
         self.__gen_regex(valid_lines)
 
+    def __getstate__(self):
+        # The cached decisions are not sent to the other processes.
+        state = self.__dict__.copy()
+        state['_SkipListHandler__decisions'] = OrderedDict()
+        return state
+
+    def __match(self, source):
+        """
+        Return the first skip line matching the given source or None.
+        """
+        if not self.__combined:
+            for line, rexpr in self.__skip:
+                if rexpr.match(source):
+                    return line
+            return None
+
+        for start, rexpr in self.__combined:
+            match = rexpr.match(source)
+            if match:
+                return self.__skip[start + match.lastindex - 1][0]
+        return None
+
     def should_skip(self, source):
         """
         Check if the given source should be skipped.
@@ -92,8 +163,14 @@ class SkipListHandler(object):
         if not self.__skip:
             return False
 
-        for line, rexpr in self.__skip:
-            if rexpr.match(source):
-                sign = line[0]
-                return sign == '-'
-        return False
+        decision = self.__decisions.pop(source, None)
+        if decision is None:
+            line = self.__match(source)
+            decision = line is not None and line[0] == '-'
+
+            if len(self.__decisions) >= DECISION_CACHE_SIZE:
+                self.__decisions.popitem(last=False)
+
+        # The most recently used decisions are at the end.
+        self.__decisions[source] = decision
+        return decision
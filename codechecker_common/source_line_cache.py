@@ -0,0 +1,177 @@
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+"""
+Cache of the source files for reading their lines by line number.
+
+The report hashes, the source code comments and the printed reports need
+single lines of the source files, often the lines of the same file for every
+report in it. The cached files are memory mapped and the offsets of their
+lines are indexed, so a line is read without scanning the file. The least
+recently used files are unmapped when the number or the total size of the
+cached files exceeds the limits. A file is mapped again if its modification
+time or size has changed.
+
+Every mapped file keeps a duplicate of its file descriptor open, so the
+cache uses up to max_files descriptors of the process. A mapped file which
+is truncated while it is read, between the check of its size and the read,
+crashes the process with SIGBUS. The users should unmap the files by
+forget() or clear() when they are done with them.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+from collections import OrderedDict
+import mmap
+import os
+import re
+import threading
+
+from codechecker_common.logger import get_logger
+
+LOG = get_logger('system')
+
+# Maximum number of the cached files, which is also the number of the file
+# descriptors kept open by the cache.
+DEFAULT_MAX_FILES = 64
+
+# Maximum total size of the cached files in bytes.
+DEFAULT_MAX_SIZE = 256 << 20
+
+# Line endings of the universal newlines mode of io.open().
+LINE_END_PATTERN = re.compile(b'\r\n|\r|\n')
+
+
+class CachedFile(object):
+    """
+    Memory mapped source file with the offsets of its lines.
+    """
+
+    def __init__(self, file_name, stat):
+        self.mtime = stat.st_mtime
+        self.size = stat.st_size
+
+        if self.size:
+            with open(file_name, 'rb') as source_file:
+                self.__content = mmap.mmap(source_file.fileno(), 0,
+                                           access=mmap.ACCESS_READ)
+        else:
+            # Empty files can not be mapped.
+            self.__content = b''
+
+        # Start offsets of the lines and the end offset of the file.
+        self.__offsets = [0]
+        self.__offsets.extend(match.end() for match
+                              in LINE_END_PATTERN.finditer(self.__content))
+        if self.__offsets[-1] != self.size:
+            self.__offsets.append(self.size)
+
+    def get_line(self, line_no, errors):
+        """
+        Return the given line with '\\n' line ending or empty string if there
+        is no such line.
+        """
+        if line_no < 1 or line_no >= len(self.__offsets):
+            return u''
+
+        line = self.__content[self.__offsets[line_no - 1]:
+                              self.__offsets[line_no]]
+        line = line.decode('utf-8', errors)
+
+        if line.endswith(u'\r\n'):
+            return line[:-2] + u'\n'
+        if line.endswith(u'\r'):
+            return line[:-1] + u'\n'
+        return line
+
+    def close(self):
+        if self.size:
+            self.__content.close()
+
+
+class SourceLineCache(object):
+    """
+    Size-bounded LRU cache of the source files. The cache can be used by
+    multiple threads.
+    """
+
+    def __init__(self, max_files=DEFAULT_MAX_FILES,
+                 max_size=DEFAULT_MAX_SIZE):
+        self.__max_files = max_files
+        self.__max_size = max_size
+
+        self.__files = OrderedDict()
+        self.__size = 0
+        self.__lock = threading.Lock()
+
+    def __remove(self, file_name):
+        cached_file = self.__files.pop(file_name)
+        self.__size -= cached_file.size
+        cached_file.close()
+
+    def __get_file(self, file_name):
+        stat = os.stat(file_name)
+
+        cached_file = self.__files.get(file_name)
+        if cached_file and (cached_file.mtime, cached_file.size) == \
+                (stat.st_mtime, stat.st_size):
+            # Move the file to the end of the LRU order.
+            del self.__files[file_name]
+            self.__files[file_name] = cached_file
+            return cached_file
+
+        if cached_file:
+            self.__remove(file_name)
+
+        cached_file = CachedFile(file_name, stat)
+        self.__files[file_name] = cached_file
+        self.__size += cached_file.size
+
+        # The new file is kept even if it is bigger than the size limit.
+        while len(self.__files) > 1 and \
+                (len(self.__files) > self.__max_files or
+                 self.__size > self.__max_size):
+            self.__remove(next(iter(self.__files)))
+
+        return cached_file
+
+    def get_line(self, file_name, line_no, errors='ignore'):
+        """
+        Return the given line of the file decoded as utf-8 or empty string
+        if the file has no such line or it can not be read.
+        """
+        # The relative paths depend on the working directory.
+        file_name = os.path.abspath(file_name)
+
+        with self.__lock:
+            try:
+                return self.__get_file(file_name).get_line(line_no, errors)
+            except (IOError, OSError, ValueError):
+                LOG.error("Failed to open file %s", file_name)
+                return u''
+
+    def forget(self, directory):
+        """
+        Unmap the cached files in the given directory, e.g. before the
+        directory is removed.
+        """
+        prefix = os.path.join(directory, '')
+        with self.__lock:
+            for file_name in [file_name for file_name in self.__files
+                              if file_name.startswith(prefix)]:
+                self.__remove(file_name)
+
+    def clear(self):
+        """
+        Unmap every cached file.
+        """
+        with self.__lock:
+            while self.__files:
+                self.__remove(next(iter(self.__files)))
+
+
+# The cache of the source files shared by the modules of this process.
+source_line_cache = SourceLineCache()
@@ -10,6 +10,7 @@ from __future__ import print_function
 from __future__ import division
 from __future__ import absolute_import
 
+import hashlib
 import io
 import json
 import os
@@ -17,6 +18,7 @@ import os
 import portalocker
 
 from codechecker_common.logger import get_logger
+from codechecker_common.source_line_cache import source_line_cache
 
 LOG = get_logger('system')
 
@@ -46,19 +48,11 @@ def get_line(file_name, line_no, errors='ignore'):
     which depends on the platform.
 
     Changing the encoding error handling can influence the hash content!
+
+    The lines are read from the source line cache, so the file is read only
+    once for the lines of the same file.
     """
-    try:
-        with io.open(file_name, mode='r',
-                     encoding='utf-8',
-                     errors=errors) as source_file:
-            for line in source_file:
-                line_no -= 1
-                if line_no == 0:
-                    return line
-            return u''
-    except IOError:
-        LOG.error("Failed to open file %s", file_name)
-        return u''
+    return source_line_cache.get_line(file_name, line_no, errors)
 
 
 def load_json_or_empty(path, default=None, kind=None, lock=False):
@@ -99,6 +93,39 @@ def load_json_or_empty(path, default=None, kind=None, lock=False):
     return ret
 
 
+# Content hashes of the already processed files in the current process.
+# Key: file path, value: (modification time, size, content hash) tuple.
+_file_hashes = {}
+
+
+def get_file_content_hash(file_path):
+    """
+    Return the content hash of the given file or None if the file can not be
+    read. The hashes are memoized in the current process as long as the
+    modification time and the size of the file do not change.
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+
+    cached = _file_hashes.get(file_path)
+    if cached and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+        return cached[2]
+
+    hasher = hashlib.sha256()
+    try:
+        with open(file_path, 'rb') as content:
+            for chunk in iter(lambda: content.read(1 << 16), b''):
+                hasher.update(chunk)
+    except IOError:
+        return None
+
+    content_hash = hasher.hexdigest()
+    _file_hashes[file_path] = (stat.st_mtime, stat.st_size, content_hash)
+    return content_hash
+
+
 def get_last_mod_time(file_path):
     """
     Return the last modification time of a file.
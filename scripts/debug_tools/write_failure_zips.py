@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# -------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -------------------------------------------------------------------------
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+import argparse
+import sys
+
+from codechecker_common.failure_store import FailureStore
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write the failure zips of '
+                                     'a report directory from its failure '
+                                     'store into its failed directory.')
+    parser.add_argument(
+        'report_dir',
+        help="The output directory of 'CodeChecker analyze'.")
+    parser.add_argument(
+        'zip_names',
+        nargs='*',
+        help="The names of the failure zips to be written, e.g. "
+             "main.c_4c7feffae4c2b887abcdc37a3c88b2e5.plist.zip. Every zip is "
+             "written by default.")
+    args = parser.parse_args()
+
+    failure_store = FailureStore(args.report_dir)
+    manifests = [manifest for manifest in failure_store.get_manifests()
+                 if not args.zip_names or
+                 FailureStore.get_zip_name(manifest) in args.zip_names]
+    if not manifests:
+        print("No failure zips were found.")
+        sys.exit(1)
+
+    for manifest in manifests:
+        print(failure_store.write_zip(manifest))
@@ -0,0 +1,116 @@
+# -----------------------------------------------------------------------------
+#                     The CodeChecker Infrastructure
+#   This file is distributed under the University of Illinois Open Source
+#   License. See LICENSE.TXT for details.
+# -----------------------------------------------------------------------------
+"""
+Compare the streaming plist reader with the generic plist parser.
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+
+import argparse
+import io
+import os
+import sys
+import time
+
+from codechecker_common.plist_parser import parse_plist
+from codechecker_common.plist_reader import PlistReader
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description='Benchmark of the plist readers.',
+        epilog='The plist files are read by both the generic plist parser '
+               '(lxml or plistlib) and the streaming plist reader. The '
+               'results are compared and the reading times are printed. Use '
+               'the plist files of a real analysis as input, e.g. the output '
+               'directory of CodeChecker analyze.',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('input',
+                        type=str,
+                        metavar='file/folder',
+                        nargs='+',
+                        help="The plist files and/or folders containing plist "
+                             "files.")
+    parser.add_argument('-r', '--repeat',
+                        type=int,
+                        default=3,
+                        help="Number of the measurements, the best time is "
+                             "printed.")
+
+    return parser.parse_args()
+
+
+def collect_plist_files(inputs):
+    plist_files = []
+    for input_path in inputs:
+        if os.path.isfile(input_path):
+            plist_files.append(input_path)
+            continue
+
+        for root, _, file_names in os.walk(input_path):
+            plist_files.extend(os.path.join(root, file_name)
+                               for file_name in file_names
+                               if file_name.endswith('.plist'))
+
+    return sorted(plist_files)
+
+
+def read_generic(plist_file):
+    with io.open(plist_file, 'r') as plist_file_obj:
+        return parse_plist(plist_file_obj)
+
+
+def read_streaming(plist_file):
+    return PlistReader(plist_file).read()
+
+
+def measure(read, plist_files, repeat):
+    """
+    Return the best time of reading every plist file.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.time()
+        for plist_file in plist_files:
+            read(plist_file)
+        duration = time.time() - start
+        best = duration if best is None else min(best, duration)
+
+    return best
+
+
+def main():
+    args = parse_arguments()
+
+    plist_files = collect_plist_files(args.input)
+    if not plist_files:
+        print("No plist files were found.")
+        sys.exit(1)
+
+    different = [plist_file for plist_file in plist_files
+                 if read_generic(plist_file) != read_streaming(plist_file)]
+    for plist_file in different:
+        print("The readers give different results for '{0}'."
+              .format(plist_file))
+
+    size = sum(os.path.getsize(plist_file) for plist_file in plist_files)
+    print("{0} plist file(s), {1:.1f} MiB".format(len(plist_files),
+                                                  size / (1 << 20)))
+
+    generic_time = measure(read_generic, plist_files, args.repeat)
+    streaming_time = measure(read_streaming, plist_files, args.repeat)
+
+    print("Generic plist parser:   {0:.3f} s".format(generic_time))
+    print("Streaming plist reader: {0:.3f} s".format(streaming_time))
+    print("Speedup: {0:.2f}x".format(generic_time / streaming_time))
+
+    sys.exit(1 if different else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,16 +9,43 @@ from __future__ import print_function
 from __future__ import division
 from __future__ import absolute_import
 import argparse
+import hashlib
 import io
 import json
+import multiprocessing
 import os
 import plistlib
 import shutil
+import tempfile
+import traceback
 
-from collections import defaultdict
+from collections import defaultdict, deque
 from string import Template
 from xml.parsers.expat import ExpatError
 
+# The streaming plist reader of CodeChecker is used if this tool is a part of
+# a CodeChecker package.
+try:
+    from codechecker_common.plist_reader import ParseError, PlistReader, \
+        UnsupportedPlistError
+except ImportError:
+    PlistReader = None
+
+
+def read_plist(file_path):
+    """
+    Read the given plist file. The plistlib library is used if the streaming
+    plist reader is not available or it can not read the plist file.
+    """
+    if PlistReader:
+        try:
+            return PlistReader(file_path).read()
+        except (UnsupportedPlistError, ParseError):
+            # The error of an invalid plist file is reported by plistlib.
+            pass
+
+    return plistlib.readPlist(file_path)
+
 
 def get_last_mod_time(file_path):
     """
@@ -77,10 +104,18 @@ def twodim_to_table(lines, separate_head=True, separate_footer=False):
 class HtmlBuilder(object):
     """
     Helper class to create html file from a report data.
+
+    By default the html files contain every CSS and JavaScript dependency and
+    the content of the source files of the reports. With shared assets the
+    dependencies are written into the assets directory of the output folder
+    once and every source file is written into the sources directory once
+    by its content hash. The source files are loaded by the viewer when they
+    are shown.
     """
-    def __init__(self, layout_dir, severity_map=None):
+    def __init__(self, layout_dir, severity_map=None, shared_assets=False):
         self._severity_map = severity_map if severity_map else {}
         self.layout_dir = layout_dir
+        self.shared_assets = shared_assets
         self.generated_html_reports = {}
 
         css_dir = os.path.join(self.layout_dir, 'css')
@@ -108,8 +143,9 @@ class HtmlBuilder(object):
         }
 
         # Get the HTML layout file content.
+        layout_file = 'layout_shared.html' if shared_assets else 'layout.html'
         self._layout = Template(get_file_content(
-            os.path.join(self.layout_dir, 'layout.html')))
+            os.path.join(self.layout_dir, layout_file)))
 
         self._index = Template(get_file_content(
             os.path.join(self.layout_dir, 'index.html')))
@@ -127,6 +163,14 @@ class HtmlBuilder(object):
         """
         Create html file with the given report data to the output path.
         """
+        self.add_reports(output_path, report_data)
+        self.write_page(output_path, report_data)
+
+    def add_reports(self, output_path, report_data):
+        """
+        Add severity levels to the given reports and register them for the
+        index and statistics pages of the html file at the output path.
+        """
         # Add severity levels for reports.
         for report in report_data['reports']:
             checker = report['checkerName']
@@ -134,6 +178,65 @@ class HtmlBuilder(object):
 
         self.generated_html_reports[output_path] = report_data['reports']
 
+    def write_assets(self, output_dir):
+        """
+        Copy the CSS and JavaScript dependencies of the html files into the
+        assets directory of the output folder.
+        """
+        assets_dir = os.path.join(output_dir, 'assets')
+        if not os.path.exists(assets_dir):
+            os.makedirs(assets_dir)
+
+        for tag_file in self._layout_tag_files.values():
+            shutil.copy(tag_file, assets_dir)
+
+    @staticmethod
+    def write_source(output_dir, content):
+        """
+        Write the given source file content into the sources directory of the
+        output folder if it is not written yet. Returns the content hash of
+        the source file.
+        """
+        content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+        sources_dir = os.path.join(output_dir, 'sources')
+        source_path = os.path.join(sources_dir, content_hash + '.js')
+        if os.path.exists(source_path):
+            return content_hash
+
+        try:
+            if not os.path.isdir(sources_dir):
+                os.makedirs(sources_dir)
+        except OSError:
+            # The directory may be created by another worker.
+            pass
+
+        # Rename the written file so the parallel workers never see
+        # half-written source files.
+        fd, tmp_path = tempfile.mkstemp(dir=sources_dir)
+        with io.open(fd, 'w', encoding='UTF-8') as source_file:
+            source_file.write(u'BugViewer.addSource({0}, {1});\n'.format(
+                json.dumps(content_hash), json.dumps(content)))
+        os.rename(tmp_path, source_path)
+
+        return content_hash
+
+    def write_page(self, output_path, report_data):
+        """
+        Write the html file of the given report data to the output path. The
+        content of the source files is read if it is not in the report data.
+        """
+        for file_data in report_data['files'].values():
+            if 'content' not in file_data:
+                with io.open(file_data.pop('source_file'), 'r',
+                             encoding='UTF-8',
+                             errors='ignore') as source_data:
+                    file_data['content'] = source_data.read()
+
+            if self.shared_assets:
+                file_data['hash'] = self.write_source(
+                    os.path.dirname(output_path), file_data.pop('content'))
+
         substitute_data = self._tag_contents
         substitute_data.update({'report_data': json.dumps(report_data)})
 
@@ -262,10 +365,13 @@ class HtmlBuilder(object):
 
 
 def get_report_data_from_plist(plist, skip_report_handler=None,
-                               trim_path_prefixes_handler=None):
+                               trim_path_prefixes_handler=None,
+                               load_sources=True):
     """
     Returns a dictionary with the source file contents and the reports parsed
-    from the plist.
+    from the plist. If load_sources is False, the source files are not read,
+    the file entries contain the path of the source files in the
+    'source_file' key instead of the content.
     """
     files = plist['files']
     reports = []
@@ -278,6 +384,14 @@ def get_report_data_from_plist(plist, skip_report_handler=None,
         """
         if file_id not in file_sources:
             file_path = files[file_id]
+            if not load_sources:
+                file_sources[file_id] = {
+                    'id': file_id,
+                    'path': trim_path_prefixes_handler(file_path)
+                    if trim_path_prefixes_handler else file_path,
+                    'source_file': file_path}
+                return
+
             with io.open(file_path, 'r', encoding='UTF-8',
                          errors='ignore') as source_data:
                 # trim path prefixes after file loading
@@ -347,11 +461,40 @@ def get_report_data_from_plist(plist, skip_report_handler=None,
             'reports': reports}
 
 
+# Html builder of the page writer processes.
+worker_html_builder = None
+
+
+def init_worker(layout_dir, shared_assets):
+    """
+    Initialize the html builder of a page writer process.
+    """
+    global worker_html_builder
+    worker_html_builder = HtmlBuilder(layout_dir,
+                                      shared_assets=shared_assets)
+
+
+def write_page(params):
+    """
+    Write the html file of the given report data in a page writer process.
+    """
+    output_path, report_data = params
+    try:
+        worker_html_builder.write_page(output_path, report_data)
+        return None
+    except Exception:
+        return traceback.format_exc()
+
+
 def plist_to_html(file_path, output_path, html_builder,
-                  skip_report_handler=None, trim_path_prefixes_handler=None):
+                  skip_report_handler=None, trim_path_prefixes_handler=None,
+                  page_writer=None):
     """
     Prints the results in the given file to HTML file.
 
+    If a page writer is given, it is called with the path and the report
+    data of the html file instead of writing the html file.
+
     Returns the skipped plist files because of source
     file content change.
     """
@@ -363,11 +506,12 @@ def plist_to_html(file_path, output_path, html_builder,
 
     print("\nParsing input file '" + file_path + "'")
     try:
-        plist = plistlib.readPlist(file_path)
+        plist = read_plist(file_path)
 
         report_data = get_report_data_from_plist(plist,
                                                  skip_report_handler,
-                                                 trim_path_prefixes_handler)
+                                                 trim_path_prefixes_handler,
+                                                 page_writer is None)
 
         plist_mtime = get_last_mod_time(file_path)
 
@@ -388,9 +532,13 @@ def plist_to_html(file_path, output_path, html_builder,
 
         html_filename = os.path.basename(file_path) + '.html'
         html_output_path = os.path.join(output_path, html_filename)
-        html_builder.create(html_output_path, report_data)
+        if page_writer:
+            html_builder.add_reports(html_output_path, report_data)
+            page_writer(html_output_path, report_data)
+        else:
+            html_builder.create(html_output_path, report_data)
+            print('Html file was generated: {0}'.format(html_output_path))
 
-        print('Html file was generated: {0}'.format(html_output_path))
         return None, changed_source
 
     except ExpatError as err:
@@ -410,7 +558,15 @@ def plist_to_html(file_path, output_path, html_builder,
 
 
 def parse(input_path, output_path, layout_dir, skip_report_handler=None,
-          html_builder=None, trim_path_prefixes_handler=None):
+          html_builder=None, trim_path_prefixes_handler=None, jobs=1):
+    """
+    Create html files from the plist files of the input path. The plist
+    files are read in this process in order, because the report skip
+    handler may depend on the previously processed reports. With multiple
+    jobs the html files are written on a process pool. Only a few pages per
+    process are written ahead of the reading, so the memory usage does not
+    grow with the number of the plist files.
+    """
     files = []
     input_path = os.path.abspath(input_path)
     output_dir = os.path.abspath(output_path)
@@ -440,16 +596,69 @@ def parse(input_path, output_path, layout_dir, skip_report_handler=None,
     if not html_builder:
         html_builder = HtmlBuilder(layout_dir)
 
-    for file_path in files:
-        sr, changed_source = plist_to_html(file_path,
-                                           output_path,
-                                           html_builder,
-                                           skip_report_handler,
-                                           trim_path_prefixes_handler)
-        if changed_source:
-            changed_source_files = changed_source_files.union(changed_source)
-        if sr:
-            skipped_report.add(sr)
+    if html_builder.shared_assets:
+        html_builder.write_assets(output_dir)
+
+    pool = None
+    page_writer = None
+    pending_pages = deque()
+
+    def report_page():
+        """
+        Wait for the oldest pending page and report its result.
+        """
+        html_output_path, result = pending_pages.popleft()
+        error = result.get()
+        if error:
+            print('Failed to write html file: ' + html_output_path, error)
+            html_builder.generated_html_reports.pop(html_output_path, None)
+        else:
+            print('Html file was generated: {0}'.format(html_output_path))
+
+    if jobs > 1 and len(files) > 1:
+        pool = multiprocessing.Pool(jobs, initializer=init_worker,
+                                    initargs=(html_builder.layout_dir,
+                                              html_builder.shared_assets))
+
+        def page_writer(html_output_path, report_data):
+            # Keep every worker busy, but do not read the next plist files
+            # while the window of the pending pages is full.
+            while len(pending_pages) >= jobs * 2:
+                report_page()
+
+            pending_pages.append((html_output_path, pool.apply_async(
+                write_page, ((html_output_path, report_data),))))
+
+            # Report the pages which are already written.
+            while pending_pages and pending_pages[0][1].ready():
+                report_page()
+
+    try:
+        for file_path in files:
+            sr, changed_source = plist_to_html(file_path,
+                                               output_path,
+                                               html_builder,
+                                               skip_report_handler,
+                                               trim_path_prefixes_handler,
+                                               page_writer)
+            if changed_source:
+                changed_source_files = \
+                    changed_source_files.union(changed_source)
+            if sr:
+                skipped_report.add(sr)
+
+        while pending_pages:
+            report_page()
+
+        if pool:
+            pool.close()
+    except Exception:
+        if pool:
+            pool.terminate()
+        raise
+    finally:
+        if pool:
+            pool.join()
 
     return changed_source_files
 
@@ -476,6 +685,24 @@ def __add_arguments_to_parser(parser):
                         help="Directory which contains dependency HTML, CSS "
                              "and JavaScript files.")
 
+    parser.add_argument('--shared-assets',
+                        dest="shared_assets",
+                        action='store_true',
+                        default=False,
+                        help="Write the CSS and JavaScript files and the "
+                             "source files of the reports into the output "
+                             "folder only once instead of embedding them "
+                             "into every HTML file. The source files are "
+                             "loaded by the viewer when they are shown.")
+
+    parser.add_argument('-j', '--jobs',
+                        type=int,
+                        dest="jobs",
+                        required=False,
+                        default=1,
+                        help="Number of processes which write the HTML "
+                             "files.")
+
 
 def main():
     """
@@ -497,10 +724,11 @@ def main():
     # Source files which modification time changed since the last analysis.
     changed_source_files = set()
 
-    html_builder = HtmlBuilder(args.layout_dir)
+    html_builder = HtmlBuilder(args.layout_dir,
+                               shared_assets=args.shared_assets)
     for input_path in args.input:
         changed_files = parse(input_path, args.output_dir, args.layout_dir,
-                              None, html_builder)
+                              None, html_builder, jobs=args.jobs)
         changed_source_files.union(changed_files)
 
     html_builder.create_index_html(args.output_dir)
@@ -10,8 +10,11 @@ var BugViewer = {
   _lineWidgets : [],
   _navigationMenuItems : [],
   _sourceFileData : null,
+  _pendingSourceFile : null,
   _currentReport : null,
   _lastBugEvent  : null,
+  _sources : {},
+  _sourceCallbacks : {},
 
   init : function (files, reports) {
     this._files = files;
@@ -144,12 +147,19 @@ var BugViewer = {
   },
 
   setCurrentBugEvent : function (event, idx) {
+    var that = this;
+
     this._currentBugEvent = event;
-    this.setSourceFileData(this._files[event.location.file]);
-    this.drawBugPath();
+    this.setSourceFileData(this._files[event.location.file], function () {
+      // An other bug event may have been selected while the source file was
+      // loading.
+      if (that._currentBugEvent !== event) return;
+
+      that.drawBugPath();
 
-    this.jumpTo(event.location.line, 0);
-    this.highlightBugEvent(event, idx);
+      that.jumpTo(event.location.line, 0);
+      that.highlightBugEvent(event, idx);
+    });
   },
 
   highlightBugEvent : function (event, idx) {
@@ -165,15 +175,62 @@ var BugViewer = {
     this._checkerName.innerHTML = checkerName;
   },
 
-  setSourceFileData : function (file) {
+  setSourceFileData : function (file, callback) {
+    var that = this;
+
     if (this._sourceFileData && file.id === this._sourceFileData.id) {
+      this._pendingSourceFile = null;
+      callback();
       return;
     }
 
-    this._sourceFileData = file;
-    this._filepath.innerHTML = file.path;
-    this._codeMirror.doc.setValue(file.content);
-    this._refresh();
+    this._pendingSourceFile = file;
+    this.loadSource(file, function (content) {
+      if (that._pendingSourceFile !== file) return;
+
+      that._pendingSourceFile = null;
+      that._sourceFileData = file;
+      that._filepath.innerHTML = file.path;
+      that._codeMirror.doc.setValue(content);
+      that._refresh();
+      callback();
+    });
+  },
+
+  // The source files are embedded into the page or they are shared by the
+  // pages and loaded from the sources directory by their content hash.
+  loadSource : function (file, callback) {
+    if (file.content !== undefined) {
+      callback(file.content);
+      return;
+    }
+
+    if (this._sources[file.hash] !== undefined) {
+      callback(this._sources[file.hash]);
+      return;
+    }
+
+    if (this._sourceCallbacks[file.hash]) {
+      this._sourceCallbacks[file.hash].push(callback);
+      return;
+    }
+
+    this._sourceCallbacks[file.hash] = [callback];
+
+    // Script elements can be loaded from the file system too.
+    var script = document.createElement('script');
+    script.type = 'text/javascript';
+    script.src = 'sources/' + file.hash + '.js';
+    document.head.appendChild(script);
+  },
+
+  // Called by the loaded source files.
+  addSource : function (hash, content) {
+    this._sources[hash] = content;
+
+    var callbacks = this._sourceCallbacks[hash] || [];
+    delete this._sourceCallbacks[hash];
+    callbacks.forEach(function (callback) { callback(content); });
   },
 
   _refresh : function () {
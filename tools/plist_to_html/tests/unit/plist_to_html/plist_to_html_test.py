@@ -141,3 +141,64 @@ class PlistToHtmlTest(unittest.TestCase):
         self.__test_html_builder('notes')
         self.__test_html_builder('macros')
         self.__test_html_builder('simple')
+
+    def test_html_builder_shared_assets(self):
+        """
+        Test building html files with shared assets on multiple processes.
+        """
+        input_dir = os.path.join(self.test_workspace, 'test_files', 'shared')
+        os.mkdir(input_dir)
+
+        # The same source file is referenced by two plist files.
+        for proj in ['notes', 'macros', 'simple']:
+            plist_file = os.path.join(self.test_workspace, 'test_files',
+                                      proj, proj + '.plist')
+            shutil.copy(plist_file, input_dir)
+        shutil.copy(os.path.join(input_dir, 'simple.plist'),
+                    os.path.join(input_dir, 'simple_copy.plist'))
+
+        output_dir = os.path.join(input_dir, 'html')
+        html_builder = PlistToHtml.HtmlBuilder(self.layout_dir,
+                                               shared_assets=True)
+        PlistToHtml.parse(input_dir, output_dir, self.layout_dir,
+                          html_builder=html_builder, jobs=2)
+
+        self.assertEqual(len(html_builder.generated_html_reports), 4)
+        for html_file in html_builder.generated_html_reports:
+            with open(html_file, 'r') as html:
+                content = html.read()
+            self.assertIn('assets/codemirror.min.js', content)
+            self.assertIn('"hash": ', content)
+            self.assertNotIn('"content": ', content)
+
+        self.assertTrue(os.path.exists(
+            os.path.join(output_dir, 'assets', 'bugviewer.js')))
+
+        sources = os.listdir(os.path.join(output_dir, 'sources'))
+        self.assertEqual(len(sources), 3)
+        for source in sources:
+            with open(os.path.join(output_dir, 'sources', source), 'r') as f:
+                self.assertTrue(f.read().startswith('BugViewer.addSource('))
+
+    def test_html_builder_page_window(self):
+        """
+        Test that every page is written if there are more plist files than
+        pages in flight.
+        """
+        input_dir = os.path.join(self.test_workspace, 'test_files', 'window')
+        os.mkdir(input_dir)
+
+        plist_file = os.path.join(self.test_workspace, 'test_files',
+                                  'simple', 'simple.plist')
+        for i in range(12):
+            shutil.copy(plist_file,
+                        os.path.join(input_dir, 'simple_{0}.plist'.format(i)))
+
+        output_dir = os.path.join(input_dir, 'html')
+        html_builder = PlistToHtml.HtmlBuilder(self.layout_dir)
+        PlistToHtml.parse(input_dir, output_dir, self.layout_dir,
+                          html_builder=html_builder, jobs=2)
+
+        self.assertEqual(len(html_builder.generated_html_reports), 12)
+        for html_file in html_builder.generated_html_reports:
+            self.assertTrue(os.path.exists(html_file))
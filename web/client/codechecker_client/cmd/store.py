@@ -17,6 +17,7 @@ import errno
 import hashlib
 import json
 import os
+import shutil
 import sys
 import tempfile
 import zipfile
@@ -30,6 +31,7 @@ from codechecker_client import client as libclient
 from codechecker_common import logger
 from codechecker_common import util
 from codechecker_common import plist_parser
+from codechecker_common.failure_store import FailureStore
 from codechecker_common.output_formatters import twodim_to_str
 from codechecker_common.source_code_comment_handler import \
     SourceCodeCommentHandler
@@ -363,17 +365,49 @@ def should_be_zipped(input_file, input_files):
                 and 'compiler_info.json' not in input_files))
 
 
-def get_analysis_statistics(inputs, limits):
+def get_failure_zips(input_path, zip_dir):
+    """
+    Yields the failure zips of the given report directory with their names
+    in the analysis statistics zip: the zips in the failed directory and the
+    zips written from the failure store of the analysis into the given
+    directory on demand.
+
+    The zips written on demand are named as if they were in the failed
+    directory, so their names do not depend on the temporary directory.
+    """
+    failed_dir = os.path.join(input_path, 'failed')
+    _, _, files = next(os.walk(failed_dir), ([], [], []))
+    for f in files:
+        failure_zip = os.path.join(failed_dir, f)
+        yield failure_zip, failure_zip
+
+    failure_store = FailureStore(input_path)
+    manifests = [manifest for manifest in failure_store.get_manifests()
+                 if FailureStore.get_zip_name(manifest) not in files]
+    if manifests:
+        # The zips of the report directories may have the same name.
+        input_zip_dir = tempfile.mkdtemp(dir=zip_dir)
+        for manifest in manifests:
+            yield (failure_store.write_zip(manifest, input_zip_dir),
+                   os.path.join(failed_dir,
+                                FailureStore.get_zip_name(manifest)))
+
+
+def get_analysis_statistics(inputs, limits, zip_dir):
     """
     Collects analysis statistics information and returns them.
 
-    This function will return the path of failed zips and the following files:
+    This function will return the paths and the archive names of the failed
+    zips and the following files:
       - compile_cmd.json
       - either
         - compiler_info.json, or
         - compiler_includes.json and compiler_target.json
       - metadata.json
 
+    The failed zips recorded in the failure store of the analysis are written
+    into the given directory.
+
     If the input directory doesn't contain any failed zip this function will
     return and empty list.
     """
@@ -386,11 +420,10 @@ def get_analysis_statistics(inputs, limits):
             raise OSError(errno.ENOENT,
                           "Input path does not exist", input_path)
 
-        dirs = []
         if os.path.isfile(input_path):
             files = [input_path]
         else:
-            _, dirs, files = next(os.walk(input_path), ([], [], []))
+            _, _, files = next(os.walk(input_path), ([], [], []))
 
         for inp_f in files:
             if inp_f == 'compile_cmd.json':
@@ -404,32 +437,29 @@ def get_analysis_statistics(inputs, limits):
                 else:
                     LOG.debug("Copying file '%s' to analyzer statistics "
                               "ZIP...", compilation_db)
-                    statistics_files.append(compilation_db)
+                    statistics_files.append((compilation_db, compilation_db))
             elif should_be_zipped(inp_f, files):
                 analyzer_file = os.path.join(input_path, inp_f)
-                statistics_files.append(analyzer_file)
-        for inp_dir in dirs:
-            if inp_dir == 'failed':
-                failure_zip_limit = limits.get(StoreLimitKind.FAILURE_ZIP_SIZE)
-
-                failed_dir = os.path.join(input_path, inp_dir)
-                _, _, files = next(os.walk(failed_dir), ([], [], []))
-                failed_files_size = 0
-                for f in files:
-                    failure_zip = os.path.join(failed_dir, f)
-                    failure_zip_size = os.stat(failure_zip).st_size
-                    failed_files_size += failure_zip_size
-
-                    if failed_files_size > failure_zip_limit:
-                        LOG.debug("We reached the limit of maximum uploadable "
-                                  "failure zip size (max: %s).",
-                                  sizeof_fmt(failure_zip_limit))
-                        break
-                    else:
-                        LOG.debug("Copying failure zip file '%s' to analyzer "
-                                  "statistics ZIP...", failure_zip)
-                        statistics_files.append(failure_zip)
-                        has_failed_zip = True
+                statistics_files.append((analyzer_file, analyzer_file))
+        if os.path.isdir(input_path):
+            failure_zip_limit = limits.get(StoreLimitKind.FAILURE_ZIP_SIZE)
+
+            failed_files_size = 0
+            for failure_zip, archive_name in \
+                    get_failure_zips(input_path, zip_dir):
+                failure_zip_size = os.stat(failure_zip).st_size
+                failed_files_size += failure_zip_size
+
+                if failed_files_size > failure_zip_limit:
+                    LOG.debug("We reached the limit of maximum uploadable "
+                              "failure zip size (max: %s).",
+                              sizeof_fmt(failure_zip_limit))
+                    break
+                else:
+                    LOG.debug("Copying failure zip file '%s' to analyzer "
+                              "statistics ZIP...", failure_zip)
+                    statistics_files.append((failure_zip, archive_name))
+                    has_failed_zip = True
 
         return statistics_files if has_failed_zip else []
 
@@ -441,9 +471,13 @@ def storing_analysis_statistics(client, inputs, run_name):
     _, zip_file = tempfile.mkstemp('.zip')
     LOG.debug("Will write failed store ZIP to '%s'...", zip_file)
 
+    # Directory of the failed zips written from the failure stores.
+    failure_zip_dir = tempfile.mkdtemp()
+
     try:
         limits = client.getAnalysisStatisticsLimits()
-        statistics_files = get_analysis_statistics(inputs, limits)
+        statistics_files = get_analysis_statistics(inputs, limits,
+                                                   failure_zip_dir)
 
         if not statistics_files:
             LOG.debug("No analyzer statistics information can be found in the "
@@ -452,8 +486,8 @@ def storing_analysis_statistics(client, inputs, run_name):
 
         # Write statistics files to the ZIP file.
         with zipfile.ZipFile(zip_file, 'a', allowZip64=True) as zipf:
-            for stat_file in statistics_files:
-                zipf.write(stat_file)
+            for stat_file, archive_name in statistics_files:
+                zipf.write(stat_file, archive_name)
 
         # Compressing .zip file
         with open(zip_file, 'rb') as source:
@@ -476,6 +510,7 @@ def storing_analysis_statistics(client, inputs, run_name):
 
     finally:
         os.remove(zip_file)
+        shutil.rmtree(failure_zip_dir, ignore_errors=True)
 
 
 def main(args):
@@ -28,6 +28,7 @@ from codeCheckerDBAccess_v6 import constants, ttypes
 
 from codechecker_common import logger
 from codechecker_common import plist_parser
+from codechecker_common import util
 from codechecker_common.output_formatters import twodim_to_str
 from codechecker_common.report import Report, get_report_path_hash
 from codechecker_common.source_code_comment_handler import \
@@ -513,15 +514,6 @@ def handle_diff_results(args):
                     LOG.error(ex)
         return all_reports
 
-    def get_line_from_file(filename, lineno):
-        with open(filename, 'r') as f:
-            i = 1
-            for line in f:
-                if i == lineno:
-                    return line
-                i += 1
-        return ""
-
     def get_diff_base_results(client, baseids, base_hashes, suppressed_hashes):
         report_filter = ttypes.ReportFilter()
         add_filter_conditions(client, report_filter, args)
@@ -1016,9 +1008,11 @@ def handle_diff_results(args):
                 check_name = report.main['check_name']
                 sev = context.severity_map.get(check_name)
                 check_msg = report.main['description']
-                source_line =\
-                    get_line_from_file(report.main['location']['file_name'],
-                                       bug_line)
+                # The lines of the source files stored on the server are
+                # utf-8 encoded bytes too.
+                source_line = \
+                    util.get_line(report.main['location']['file_name'],
+                                  bug_line).encode('utf-8')
             else:
                 # report is of ReportData type coming from CodeChecker server.
                 bug_line = report.line
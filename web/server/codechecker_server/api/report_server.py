@@ -38,6 +38,7 @@ from codechecker_common.source_code_comment_handler import \
 from codechecker_common import util
 from codechecker_common.logger import get_logger
 from codechecker_common.report import get_report_path_hash
+from codechecker_common.source_line_cache import source_line_cache
 
 from codechecker_server.profiler import timeit
 
@@ -2572,6 +2573,7 @@ class ThriftRequestHandler(object):
             ThriftRequestHandler.__store_run_lock(session, name, user)
 
         wrong_src_code_comments = []
+        zip_dir = None
         try:
             with TemporaryDirectory() as zip_dir:
                 unzip(b64zip, zip_dir)
@@ -2681,6 +2683,10 @@ class ThriftRequestHandler(object):
             with DBSession(self.__Session) as session:
                 ThriftRequestHandler.__free_run_lock(session, name)
 
+            # The source files of the removed directory are not kept mapped.
+            if zip_dir:
+                source_line_cache.forget(zip_dir)
+
             if wrong_src_code_comments:
                 raise codechecker_api_shared.ttypes.RequestFailed(
                     codechecker_api_shared.ttypes.ErrorCode.SOURCE_FILE,
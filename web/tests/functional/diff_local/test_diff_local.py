@@ -14,10 +14,14 @@ from __future__ import print_function
 from __future__ import division
 from __future__ import absolute_import
 
+import io
 import json
 import os
+import plistlib
 import re
+import shutil
 import subprocess
+import tempfile
 import unittest
 
 from libtest import env
@@ -164,3 +168,49 @@ class DiffLocal(unittest.TestCase):
         print(high_low_unresolved_results)
 
         # FIXME check json output for the returned severity levels.
+
+    def test_non_ascii_source_line(self):
+        """Print the new reports of a source line with non-ASCII characters.
+
+        The local reports are printed with their source lines in the
+        plaintext and the table formats.
+        """
+        test_dir = tempfile.mkdtemp(dir=os.environ['TEST_WORKSPACE'])
+        try:
+            source_file = os.path.join(test_dir, 'main.c')
+            with io.open(source_file, 'w', encoding='utf-8') as source:
+                source.write(u'int main() { return 1 / 0; } // \xe1rv\xedz\n')
+
+            base_reports = os.path.join(test_dir, 'base')
+            new_reports = os.path.join(test_dir, 'new')
+            os.mkdir(base_reports)
+            os.mkdir(new_reports)
+
+            location = {'line': 1, 'col': 23, 'file': 0}
+            plistlib.writePlist({
+                'files': [source_file],
+                'diagnostics': [{
+                    'category': 'Logic error',
+                    'check_name': 'core.DivideZero',
+                    'description': 'Division by zero',
+                    'issue_hash_content_of_line_in_context':
+                        '79cc349883cacbd7d2a4301ddb79bc68',
+                    'location': location,
+                    'path': [{'kind': 'event',
+                              'depth': 0,
+                              'location': location,
+                              'message': 'Division by zero'}],
+                    'type': 'Division by zero'}]},
+                os.path.join(new_reports, 'main.c.plist'))
+
+            for output_format in ['plaintext', 'table']:
+                diff_cmd = [self._codechecker_cmd, 'cmd', 'diff',
+                            '-b', base_reports,
+                            '-n', new_reports,
+                            '--new', '-o', output_format]
+                print(diff_cmd)
+                out = subprocess.check_output(diff_cmd)
+                print(out)
+                self.assertIn(u'\xe1rv\xedz', out.decode('utf-8'))
+        finally:
+            shutil.rmtree(test_dir)